@@ -1,16 +1,55 @@
-from flask import Flask
+import runtime  # noqa: F401  (first: monkey-patches the standard library under ASYNC_MODE=gevent)
+from flask import Flask, Response
 from flask_socketio import SocketIO
 from flask_cors import CORS
 from config import Config
-from routes import register_socketio_handlers
+from routes import register_recording_routes, register_socketio_handlers
+from routes.socketio_handlers import interim_translator, translation_service
+from services.frame_relay import frame_relay
+from services.stream_controller import stream_controller
+from services.screen_composite import screen_composites
+from services.frame_cache import frame_cache
+from services.peer_links import peer_links
+from services.admission import admission
+from services.translation_cache import translation_cache
+from services.recording_uploads import recording_uploads
+from services.room_service import room_service
+from monitoring import configure_logging, get_logger, registry
 import os
 import warnings
 
 # Suppress werkzeug production warning
 warnings.filterwarnings('ignore', message='.*Werkzeug.*production.*')
 
+log = get_logger(__name__)
+
+def register_gauges():
+    """Gauges read from the services' own counters at scrape time"""
+    registry.gauge('rooms_active', 'Rooms with at least one user', lambda: room_service.get_stats()['rooms'])
+    registry.gauge('users_connected', 'Users in a room', lambda: room_service.get_stats()['users'])
+    registry.gauge('relay_receivers', 'Frame relay subscribers', lambda: len(frame_relay.get_stats()['receivers']))
+    registry.gauge('p2p_links', 'Direct peer connections frames are not relayed over',
+                   lambda: peer_links.get_stats()['links'])
+    registry.gauge('scheduling_lag_seconds', 'How late a timer on this node wakes up (smoothed)',
+                   lambda: admission.lag)
+    registry.gauge('load_shed_level', '0 normal, 1 shedding frames, 2 also translations and connections',
+                   admission.load_level)
+    registry.gauge('frame_cache_bytes', 'Bytes held by the last-frame cache', lambda: frame_cache.get_stats()['bytes'])
+    registry.gauge('screen_composite_bytes', 'Bytes held by screen share composites',
+                   lambda: screen_composites.get_stats()['bytes'])
+    registry.gauge('translation_cache_entries', 'Translation cache entries',
+                   lambda: translation_cache.get_stats()['entries'])
+    registry.gauge('translation_cache_hit_ratio', 'Translation cache hit rate',
+                   lambda: translation_cache.get_stats()['hitRate'])
+    registry.gauge('recording_uploads_active', 'Chunked recording uploads in progress',
+                   lambda: recording_uploads.get_stats()['active'])
+    if translation_service.batcher is not None:
+        registry.gauge('translation_batch_queued', 'Translations waiting for a batch',
+                       lambda: translation_service.batcher.get_stats()['queued'])
+
 def create_app():
     """Application factory pattern for Flask app"""
+    configure_logging()
     app = Flask(__name__)
     app.config.from_object(Config)
 
@@ -27,7 +66,8 @@ def create_app():
     socketio = SocketIO(
         app,
         cors_allowed_origins=cors_origins,
-        async_mode='threading',
+        async_mode=Config.ASYNC_MODE,
+        message_queue=Config.SOCKETIO_MESSAGE_QUEUE or None,
         logger=Config.DEBUG,
         engineio_logger=Config.DEBUG
     )
@@ -35,6 +75,11 @@ def create_app():
     # Register Socket.IO event handlers
     register_socketio_handlers(socketio)
 
+    # Register HTTP routes (recording playback)
+    register_recording_routes(app)
+
+    register_gauges()
+
     @app.route('/')
     def index():
         return {
@@ -47,16 +92,37 @@ def create_app():
     def health():
         return {"status": "healthy"}
 
+    @app.route('/relay/stats')
+    def relay_stats():
+        stats = frame_relay.get_stats()
+        stats['streamControl'] = stream_controller.get_stats()
+        stats['screenComposites'] = screen_composites.get_stats()
+        stats['frameCache'] = frame_cache.get_stats()
+        stats['peerLinks'] = peer_links.get_stats()
+        return stats
+
+    @app.route('/translation/stats')
+    def translation_stats():
+        stats = {'cache': translation_cache.get_stats(), 'interim': interim_translator.get_stats()}
+        if translation_service.batcher is not None:
+            stats['batcher'] = translation_service.batcher.get_stats()
+        return stats
+
+    @app.route('/metrics')
+    def metrics():
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
     return app, socketio
 
+def serve(app, socketio, host=Config.SERVER_HOST, port=Config.SERVER_PORT):
+    """Run the server in the configured ASYNC_MODE (blocks)"""
+    log.info("server_starting", host=host, port=port, mode=Config.ASYNC_MODE)
+    if Config.ASYNC_MODE == 'gevent':
+        # gevent's WSGI server, websockets included; no reloader
+        socketio.run(app, host=host, port=port, log_output=Config.DEBUG)
+    else:
+        socketio.run(app, host=host, port=port, debug=Config.DEBUG, allow_unsafe_werkzeug=True)
+
 if __name__ == '__main__':
     app, socketio = create_app()
-    print("🚀 LiveTranslate server starting...")
-    print(f"📡 Backend running on {Config.SERVER_HOST}:{Config.SERVER_PORT}")
-    socketio.run(
-        app,
-        host=Config.SERVER_HOST,
-        port=Config.SERVER_PORT,
-        debug=Config.DEBUG,
-        allow_unsafe_werkzeug=True
-    )
+    serve(app, socketio)
@@ -1,3 +1,4 @@
+import json
 import os
 from dotenv import load_dotenv
 
@@ -14,13 +15,177 @@ class Config:
     GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
     GEMINI_MODEL_NAME = 'gemini-2.0-flash'
 
+    # Translation Backend: 'gemini', 'mock' (offline, deterministic) or
+    # 'phrasebook' (local common phrases, misses go to PHRASEBOOK_FALLBACK)
+    TRANSLATION_BACKEND = os.getenv('TRANSLATION_BACKEND', 'gemini')
+    PHRASEBOOK_FALLBACK = os.getenv('PHRASEBOOK_FALLBACK', 'gemini')
+    PHRASEBOOK_PATH = os.getenv('PHRASEBOOK_PATH', '')
+    MOCK_TRANSLATION_LATENCY_MS = float(os.getenv('MOCK_TRANSLATION_LATENCY_MS', 50))
+    MOCK_TRANSLATION_ERROR_RATE = float(os.getenv('MOCK_TRANSLATION_ERROR_RATE', 0.0))
+
     # Gemini Generation Config
     GENERATION_CONFIG = {
         "temperature": 0.0,
         "max_output_tokens": 50,
     }
+    # max_output_tokens above is the minimum; longer inputs get a larger budget up to this
+    MAX_OUTPUT_TOKENS = int(os.getenv('MAX_OUTPUT_TOKENS', 1024))
+
+    # Stream long utterances as translation-partial events before the final result
+    TRANSLATION_STREAMING = os.getenv('TRANSLATION_STREAMING', 'True').lower() == 'true'
+    TRANSLATION_STREAM_MIN_CHARS = int(os.getenv('TRANSLATION_STREAM_MIN_CHARS', 80))
+
+    # Speculatively translate interim transcripts (audio-interim) while the speaker talks:
+    # at most one speculation per speaker per debounce window, none for very short text
+    INTERIM_TRANSLATION = os.getenv('INTERIM_TRANSLATION', 'True').lower() == 'true'
+    INTERIM_DEBOUNCE_MS = float(os.getenv('INTERIM_DEBOUNCE_MS', 400))
+    INTERIM_MIN_CHARS = int(os.getenv('INTERIM_MIN_CHARS', 12))
+
+    # Translation Pipeline Configuration
+    # Concurrent translation calls; further requests wait in a bounded queue
+    TRANSLATION_WORKERS = int(os.getenv('TRANSLATION_WORKERS', 8))
+    TRANSLATION_QUEUE_LIMIT = int(os.getenv('TRANSLATION_QUEUE_LIMIT', 64))
+
+    # Micro-batch Gemini calls across rooms: flush after the window or N items
+    TRANSLATION_BATCHING = os.getenv('TRANSLATION_BATCHING', 'False').lower() == 'true'
+    TRANSLATION_BATCH_WINDOW_MS = float(os.getenv('TRANSLATION_BATCH_WINDOW_MS', 30))
+    TRANSLATION_BATCH_MAX_ITEMS = int(os.getenv('TRANSLATION_BATCH_MAX_ITEMS', 16))
+
+    # Translate each utterance into every room language in one request and
+    # deliver each listener only their own language
+    TRANSLATION_FAN_OUT = os.getenv('TRANSLATION_FAN_OUT', 'True').lower() == 'true'
+
+    # Translation Cache Configuration
+    TRANSLATION_CACHE_SIZE = int(os.getenv('TRANSLATION_CACHE_SIZE', 10000))
+    TRANSLATION_CACHE_MAX_BYTES = int(os.getenv('TRANSLATION_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+    TRANSLATION_CACHE_TTL = int(os.getenv('TRANSLATION_CACHE_TTL', 7 * 24 * 3600))
+    # Path to a SQLite file to persist the cache across restarts (empty = memory only)
+    TRANSLATION_CACHE_DB = os.getenv('TRANSLATION_CACHE_DB', '')
+    # Row cap for the on-disk cache; expired and oldest rows are swept every 1000 writes
+    TRANSLATION_CACHE_DB_MAX_ROWS = int(os.getenv('TRANSLATION_CACHE_DB_MAX_ROWS', 100000))
+
+    # Room State Configuration
+    MAX_ROOM_USERS = 4
+    # 'memory' (single process) or 'redis' (shared across processes/nodes)
+    ROOM_STORE = os.getenv('ROOM_STORE', 'memory').lower()
+    REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+    REDIS_KEY_PREFIX = os.getenv('REDIS_KEY_PREFIX', 'livetranslate')
+    # Seconds a node reuses a room's socket ids for frame fan-out before re-reading Redis
+    REDIS_PEER_CACHE_TTL = float(os.getenv('REDIS_PEER_CACHE_TTL', 1.0))
+    # Seconds without a heartbeat before a node counts as dead and its users are removed
+    REDIS_NODE_TTL = int(os.getenv('REDIS_NODE_TTL', 30))
+    # Socket.IO message queue (e.g. redis://...) so emits reach clients on other nodes
+    SOCKETIO_MESSAGE_QUEUE = os.getenv('SOCKETIO_MESSAGE_QUEUE', '')
+
+    # Database Configuration
+    DATABASE_PATH = os.getenv('DATABASE_PATH', os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'database', 'recordings.db'))
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 8))
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', 128))
+    DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', 5000))
+    # Most inserts committed together in one group-commit transaction
+    DB_WRITE_BATCH_MAX = int(os.getenv('DB_WRITE_BATCH_MAX', 64))
+    # Recording audio lives on disk, named by content hash; SQLite keeps metadata only
+    BLOB_STORE_PATH = os.getenv('BLOB_STORE_PATH', os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), 'database', 'blobs'))
+    # Served by GET /recordings/<id>/audio (useVoiceRecording records webm)
+    RECORDING_MIME_TYPE = os.getenv('RECORDING_MIME_TYPE', 'audio/webm')
+    RECORDING_CACHE_MAX_AGE = int(os.getenv('RECORDING_CACHE_MAX_AGE', 86400))
+    # get-recordings page size (clients may ask for up to RECORDINGS_PAGE_MAX)
+    RECORDINGS_PAGE_SIZE = int(os.getenv('RECORDINGS_PAGE_SIZE', 50))
+    RECORDINGS_PAGE_MAX = int(os.getenv('RECORDINGS_PAGE_MAX', 200))
+    # Translate new recordings into every room language in the background
+    RECORDING_PRETRANSLATE = os.getenv('RECORDING_PRETRANSLATE', 'False').lower() == 'true'
+    # Chunked recording uploads (recording-chunk / recording-commit)
+    RECORDING_MAX_BYTES = int(os.getenv('RECORDING_MAX_BYTES', 25 * 1024 * 1024))
+    RECORDING_CHUNK_MAX_BYTES = int(os.getenv('RECORDING_CHUNK_MAX_BYTES', 256 * 1024))
+    RECORDING_MAX_UPLOADS_PER_USER = int(os.getenv('RECORDING_MAX_UPLOADS_PER_USER', 2))
+    # Seconds an unfinished upload is kept for the client to resume
+    RECORDING_UPLOAD_TTL = float(os.getenv('RECORDING_UPLOAD_TTL', 600))
 
     # Server Configuration
     SERVER_HOST = os.getenv('HOST', '0.0.0.0')
     SERVER_PORT = int(os.getenv('PORT', 5000))
     DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
+    # 'threading' (Werkzeug dev server, a thread per connection) or 'gevent' (production:
+    # greenlets on gevent's WSGI server, needs the gevent package)
+    ASYNC_MODE = os.getenv('ASYNC_MODE', 'threading').lower()
+
+    # Logging: level and how many hot-path events share one log line
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', 10))
+
+    # Frame Relay Configuration
+    # Frames a receiver may have unacknowledged before newer ones replace queued ones
+    RELAY_MAX_IN_FLIGHT = int(os.getenv('RELAY_MAX_IN_FLIGHT', 2))
+    # Seconds without an ack before in-flight frames are considered lost
+    RELAY_ACK_TIMEOUT = float(os.getenv('RELAY_ACK_TIMEOUT', 1.0))
+    # Tiled screen share: changed tiles cached per sharer before a keyframe is requested
+    SCREEN_COMPOSITE_MAX_BYTES = int(os.getenv('SCREEN_COMPOSITE_MAX_BYTES', 4 * 1024 * 1024))
+    SCREEN_MAX_TILES_PER_FRAME = int(os.getenv('SCREEN_MAX_TILES_PER_FRAME', 256))
+    # Newest video frame per user, sent with joined-room so peers render immediately
+    FRAME_CACHE_MAX_BYTES = int(os.getenv('FRAME_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    FRAME_CACHE_MAX_FRAME_BYTES = int(os.getenv('FRAME_CACHE_MAX_FRAME_BYTES', 256 * 1024))
+    FRAME_CACHE_TTL = float(os.getenv('FRAME_CACHE_TTL', 10))
+
+    # Media path for new rooms: 'relay' (every frame through the server) or 'p2p' (opt-in:
+    # peers negotiate direct WebRTC connections over the signal event; frames are relayed
+    # only to peers they can't reach). The first user to join a room may choose (the
+    # client's VITE_MEDIA_MODE); the room keeps it until it empties
+    MEDIA_MODE = os.getenv('MEDIA_MODE', 'relay').lower()
+    # RTCPeerConnection iceServers (JSON) - add a TURN server for peers behind strict NATs
+    ICE_SERVERS = json.loads(os.getenv('ICE_SERVERS', '[{"urls": "stun:stun.l.google.com:19302"}]'))
+
+    # Adaptive Stream Control (stream-control messages to frame senders)
+    STREAM_CONTROL = os.getenv('STREAM_CONTROL', 'True').lower() == 'true'
+    # Outbound frame bandwidth this node aims to stay under, split between active streams
+    STREAM_NODE_BUDGET_KBPS = float(os.getenv('STREAM_NODE_BUDGET_KBPS', 20000))
+    STREAM_CONTROL_INTERVAL = float(os.getenv('STREAM_CONTROL_INTERVAL', 2.0))
+    # Receivers acking slower than this push their senders down
+    STREAM_LAG_TARGET_MS = float(os.getenv('STREAM_LAG_TARGET_MS', 300))
+    # (min, max) per stream type - the max matches what clients send by default
+    STREAM_LIMITS = {
+        'video-frame': {'fps': (2, 10), 'width': (160, 320), 'quality': (0.3, 0.6)},
+        'screen-frame': {'fps': (1, 10), 'width': (480, 640), 'quality': (0.4, 0.7)}
+    }
+
+    # Admission Control (per connection, per event)
+    RATE_LIMITING = os.getenv('RATE_LIMITING', 'True').lower() == 'true'
+    # event -> (events per second, burst) token bucket per socket; '*' covers unlisted events.
+    # RATE_LIMITS (JSON, e.g. {"audio-chunk": [4, 20]}) overrides entries
+    RATE_LIMITS = {
+        'video-frame': (15, 30),
+        'screen-frame': (15, 30),
+        'screen-tiles': (15, 30),
+        'audio-interim': (10, 20),
+        'audio-chunk': (2, 10),
+        'translate-recording': (1, 5),
+        'save-recording': (0.2, 2),
+        'recording-chunk': (100, 200),
+        'recording-commit': (0.5, 3),
+        'get-recordings': (2, 10),
+        'signal': (50, 200),
+        '*': (5, 20),
+        **json.loads(os.getenv('RATE_LIMITS', '{}'))
+    }
+    # event -> most bytes of text and binary data one event may carry; '*' covers unlisted events
+    PAYLOAD_LIMITS = {
+        'video-frame': 256 * 1024,
+        'screen-frame': 512 * 1024,
+        'screen-tiles': 512 * 1024,
+        'audio-interim': 8 * 1024,
+        'audio-chunk': 8 * 1024,
+        # Bounded by the Socket.IO message size (1 MB) anyway - larger recordings use recording-chunk
+        'save-recording': 1024 * 1024,
+        'recording-chunk': RECORDING_CHUNK_MAX_BYTES + 4096,
+        'signal': 64 * 1024,
+        '*': 16 * 1024,
+        **json.loads(os.getenv('PAYLOAD_LIMITS', '{}'))
+    }
+    # Overload shedding: scheduling lag on this node (how late a timer wakes) at which frames
+    # and interim transcripts are dropped; at 4x, translations, recordings and new
+    # connections are refused too. Signaling and room control are never shed
+    OVERLOAD_LAG_MS = float(os.getenv('OVERLOAD_LAG_MS', 50))
+    OVERLOAD_PROBE_INTERVAL = float(os.getenv('OVERLOAD_PROBE_INTERVAL', 0.1))
+    # Socket.IO connections per node (0 = unlimited)
+    MAX_CONNECTIONS = int(os.getenv('MAX_CONNECTIONS', 0))
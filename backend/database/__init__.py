@@ -1,3 +1,5 @@
-from .models import Recording, Room, init_db
+from .models import Recording, RecordingTranslation, Room, init_db
+from .connection import db_pool, write_queue
+from .blob_store import blob_store
 
-__all__ = ['Recording', 'Room', 'init_db']
+__all__ = ['Recording', 'RecordingTranslation', 'Room', 'init_db', 'db_pool', 'write_queue', 'blob_store']
@@ -0,0 +1,126 @@
+from typing import Callable, Dict, Optional
+from config import Config
+from runtime import blocking
+import hashlib
+import os
+import tempfile
+import threading
+
+
+class BlobStore:
+    """
+    Content-addressed audio storage on the filesystem.
+
+    Blobs are named by the SHA-256 of their content and sharded as
+    <root>/<h[:2]>/<h[2:4]>/<h>, so identical uploads are stored once.
+    Writes go to a temp file and are renamed into place, so readers never
+    see a partial blob. Playback serves the file at path() directly (Range
+    requests included) instead of loading the recording into memory.
+
+    put() and adopt() claim the blob until release() - called once the row
+    referencing it is committed - so delete_unreferenced() can't unlink a
+    blob that a save in progress has just found already stored.
+    """
+
+    def __init__(self, root: str = Config.BLOB_STORE_PATH):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+        # digest -> saves in progress that will reference it
+        self._claims: Dict[str, int] = {}
+        self._claims_lock = threading.Lock()
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self.path(digest))
+
+    def size(self, digest: str) -> int:
+        return os.path.getsize(self.path(digest))
+
+    @blocking
+    def put(self, data: bytes) -> str:
+        """Store bytes and return their content hash"""
+        digest = hashlib.sha256(data).hexdigest()
+        self.claim(digest)
+        try:
+            if not self.exists(digest):
+                self._write(digest, lambda f: f.write(data))
+        except Exception:
+            self.release(digest)
+            raise
+        return digest
+
+    def staging_dir(self) -> str:
+        """Directory for in-progress files - on the same filesystem, so adopt() is a rename"""
+        path = os.path.join(self.root, '.staging')
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @blocking
+    def adopt(self, tmp_path: str, digest: str) -> str:
+        """Move a fully written file whose hash is already known into the store"""
+        self.claim(digest)
+        try:
+            if self.exists(digest):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(self.path(digest)), exist_ok=True)
+                os.replace(tmp_path, self.path(digest))
+        except Exception:
+            self.release(digest)
+            raise
+        return digest
+
+    def _write(self, digest: str, writer):
+        target = self.path(digest)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                writer(tmp)
+            os.replace(tmp_path, target)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def read(self, digest: str) -> Optional[bytes]:
+        """Read a whole blob"""
+        try:
+            with open(self.path(digest), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def claim(self, digest: str):
+        with self._claims_lock:
+            self._claims[digest] = self._claims.get(digest, 0) + 1
+
+    def release(self, digest: str):
+        """The save that claimed digest has committed its row (or given up)"""
+        with self._claims_lock:
+            left = self._claims.get(digest, 0) - 1
+            if left > 0:
+                self._claims[digest] = left
+            else:
+                self._claims.pop(digest, None)
+
+    def delete_unreferenced(self, digest: str, referenced: Callable[[], bool]) -> bool:
+        """Delete a blob unless a save has claimed it or referenced() finds a row using it"""
+        with self._claims_lock:
+            # Claims are released after the commit, so referenced() sees every released save's row
+            if self._claims.get(digest) or referenced():
+                return False
+            return self.delete(digest)
+
+    @blocking
+    def delete(self, digest: str) -> bool:
+        try:
+            os.remove(self.path(digest))
+            return True
+        except FileNotFoundError:
+            return False
+
+
+blob_store = BlobStore()
@@ -0,0 +1,167 @@
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+from config import Config
+from monitoring.metrics import db_seconds
+import queue
+import sqlite3
+import threading
+import time
+
+
+def _configure(conn: sqlite3.Connection):
+    """Per-connection settings: WAL lets readers run alongside the writer"""
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute(f'PRAGMA busy_timeout={Config.DB_BUSY_TIMEOUT_MS}')
+    conn.row_factory = sqlite3.Row
+
+
+class ConnectionPool:
+    """
+    Fixed-size pool of SQLite connections shared by all handler threads.
+
+    Connections are reused, so each one keeps its prepared statement cache
+    (cached_statements) warm instead of re-parsing SQL on every call.
+    """
+
+    def __init__(self, db_path: str, size: int = Config.DB_POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def open(self) -> sqlite3.Connection:
+        """Open a new configured connection (not managed by the pool)"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               cached_statements=Config.DB_STATEMENT_CACHE_SIZE)
+        _configure(conn)
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection; commits on success, rolls back on error"""
+        conn = None
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._created < self.size:
+                    self._created += 1
+                    conn = self.open()
+            if conn is None:
+                conn = self._idle.get()
+
+        start = time.perf_counter()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+            db_seconds.observe(time.perf_counter() - start, 'pool')
+
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._created = 0
+
+
+class WriteQueue:
+    """
+    Group-commits inserts from concurrent callers.
+
+    Concurrent save-recording events each used to pay for their own
+    connection, transaction and fsync. Here a caller queues its statement and
+    takes the writer lock; whoever holds the lock commits every statement
+    waiting in the queue (up to DB_WRITE_BATCH_MAX) in one transaction, so
+    callers that arrive while a commit is running are written together in
+    the next one. Each caller gets its own row id back.
+    """
+
+    def __init__(self, pool: ConnectionPool, max_batch: int = Config.DB_WRITE_BATCH_MAX):
+        self.pool = pool
+        self.max_batch = max_batch
+        # (sql, params, future)
+        self._queue: "queue.Queue[Tuple[str, tuple, Future]]" = queue.Queue()
+        self._writer_lock = threading.Lock()
+        # The writer owns a dedicated connection so busy readers can't starve it
+        self._conn: Optional[sqlite3.Connection] = None
+        self.batches = 0
+        self.writes = 0
+
+    def execute(self, sql: str, params: tuple) -> int:
+        """Queue a write and wait until it is committed - returns its lastrowid"""
+        future: Future = Future()
+        start = time.perf_counter()
+        self._queue.put((sql, params, future))
+
+        while not future.done():
+            with self._writer_lock:
+                # Another caller may have committed our statement while we waited
+                if not future.done():
+                    self._lead(self._drain())
+
+        db_seconds.observe(time.perf_counter() - start, 'write')
+        return future.result()
+
+    def _drain(self) -> List[Tuple[str, tuple, Future]]:
+        batch = []
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _lead(self, batch: List[Tuple[str, tuple, Future]]):
+        error: Exception = sqlite3.OperationalError('write was not committed')
+        try:
+            self._commit(batch)
+        except Exception as e:
+            # The writer connection couldn't be opened or used - reopen it next time
+            error = e
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        finally:
+            # Nobody else will commit what we drained: fail it rather than leave its callers waiting
+            for _, _, waiting in batch:
+                if not waiting.done():
+                    waiting.set_exception(error)
+
+    def _commit(self, batch: List[Tuple[str, tuple, Future]]):
+        if not batch:
+            return
+        if self._conn is None:
+            self._conn = self.pool.open()
+
+        results = []
+        try:
+            with self._conn:
+                for sql, params, _ in batch:
+                    results.append(self._conn.execute(sql, params).lastrowid)
+        except Exception as e:
+            # One bad row must not fail the others - retry them one at a time
+            if len(batch) > 1:
+                for item in batch:
+                    self._commit([item])
+            else:
+                batch[0][2].set_exception(e)
+            return
+
+        self.batches += 1
+        self.writes += len(batch)
+        for (_, _, future), row_id in zip(batch, results):
+            future.set_result(row_id)
+
+
+db_pool = ConnectionPool(Config.DATABASE_PATH)
+write_queue = WriteQueue(db_pool)
@@ -0,0 +1,73 @@
+"""
+Move inline audio_data out of the recordings table into the blob store.
+
+Run from the backend directory:
+
+    python -m database.migrate_blobs [--batch-size 100] [--vacuum]
+
+Rows are migrated in small batches, one blob in memory at a time, so it is
+safe to run against a live database and to re-run after an interruption.
+"""
+import argparse
+from .blob_store import blob_store
+from .connection import db_pool
+from .models import init_db
+
+
+def migrate(batch_size: int = 100) -> int:
+    """Move every row that still has inline audio - returns the number migrated"""
+    init_db()
+    migrated = 0
+
+    while True:
+        claimed = []
+        with db_pool.connection() as conn:
+            ids = [row['id'] for row in conn.execute(
+                'SELECT id FROM recordings WHERE audio_hash IS NULL LIMIT ?', (batch_size,))]
+            if not ids:
+                break
+
+            for recording_id in ids:
+                audio_data = conn.execute(
+                    'SELECT audio_data FROM recordings WHERE id = ?', (recording_id,)).fetchone()[0] or b''
+                audio_hash = blob_store.put(audio_data)
+                conn.execute('''
+                    UPDATE recordings SET audio_hash = ?, audio_size = ?, audio_data = X''
+                    WHERE id = ?
+                ''', (audio_hash, len(audio_data), recording_id))
+                claimed.append(audio_hash)
+
+        for audio_hash in claimed:
+            blob_store.release(audio_hash)
+
+        migrated += len(ids)
+        print(f"📦 Migrated {migrated} recordings to the blob store")
+
+    return migrated
+
+
+def vacuum():
+    """Reclaim the space freed by the moved blobs"""
+    conn = db_pool.open()
+    try:
+        conn.execute('VACUUM')
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--vacuum', action='store_true', help='VACUUM the database afterwards')
+    args = parser.parse_args()
+
+    migrated = migrate(args.batch_size)
+    print(f"✅ {migrated} recordings migrated to {blob_store.root}")
+
+    if args.vacuum:
+        vacuum()
+        print("✅ Database vacuumed")
+
+
+if __name__ == '__main__':
+    main()
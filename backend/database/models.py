@@ -2,151 +2,274 @@ import sqlite3
 import json
 from datetime import datetime
 from typing import List, Optional, Dict
-import os
+from config import Config
+from runtime import blocking
+from .blob_store import blob_store
+from .connection import db_pool, write_queue
 
-DB_PATH = os.path.join(os.path.dirname(__file__), 'recordings.db')
+DB_PATH = Config.DATABASE_PATH
 
 def init_db():
     """Initialize database with required tables"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS recordings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            room_id TEXT NOT NULL,
-            user_id TEXT NOT NULL,
-            audio_data BLOB NOT NULL,
-            original_text TEXT,
-            translated_text TEXT,
-            source_language TEXT DEFAULT 'en',
-            target_language TEXT NOT NULL,
-            duration REAL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS rooms (
-            id TEXT PRIMARY KEY,
-            name TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            active BOOLEAN DEFAULT 1
-        )
-    ''')
-
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_room_recordings
-        ON recordings(room_id, created_at DESC)
-    ''')
-
-    conn.commit()
-    conn.close()
-
-class Recording:
-    @staticmethod
-    def save(room_id: str, user_id: str, audio_data: bytes,
-             original_text: str, translated_text: str,
-             target_language: str, duration: float = 0.0) -> int:
-        """Save a voice recording with translation"""
-        conn = sqlite3.connect(DB_PATH)
+    with db_pool.connection() as conn:
         cursor = conn.cursor()
 
         cursor.execute('''
-            INSERT INTO recordings
-            (room_id, user_id, audio_data, original_text, translated_text, target_language, duration)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (room_id, user_id, audio_data, original_text, translated_text, target_language, duration))
+            CREATE TABLE IF NOT EXISTS recordings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                room_id TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                -- Legacy inline audio; new rows keep it empty and use audio_hash
+                audio_data BLOB NOT NULL,
+                audio_hash TEXT,
+                audio_size INTEGER,
+                original_text TEXT,
+                translated_text TEXT,
+                source_language TEXT DEFAULT 'en',
+                target_language TEXT NOT NULL,
+                duration REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
 
-        recording_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return recording_id
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS rooms (
+                id TEXT PRIMARY KEY,
+                name TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                active BOOLEAN DEFAULT 1
+            )
+        ''')
 
-    @staticmethod
-    def get_by_room(room_id: str, limit: int = 50) -> List[Dict]:
-        """Get all recordings for a room"""
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS recording_translations (
+                recording_id INTEGER NOT NULL,
+                language TEXT NOT NULL,
+                translated_text TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (recording_id, language)
+            )
+        ''')
+
+        # Databases created before the blob store lack the metadata columns
+        columns = {row['name'] for row in cursor.execute('PRAGMA table_info(recordings)')}
+        if 'audio_hash' not in columns:
+            cursor.execute('ALTER TABLE recordings ADD COLUMN audio_hash TEXT')
+        if 'audio_size' not in columns:
+            cursor.execute('ALTER TABLE recordings ADD COLUMN audio_size INTEGER')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_room_recordings
+            ON recordings(room_id, created_at DESC)
+        ''')
 
         cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_recording_audio_hash
+            ON recordings(audio_hash)
+        ''')
+
+class Recording:
+    @staticmethod
+    @blocking
+    def save_blob(room_id: str, user_id: str, audio_hash: str, audio_size: int,
+                  original_text: str, translated_text: str,
+                  target_language: str, duration: float = 0.0) -> int:
+        """Save a recording whose audio is already in the blob store (releases put/adopt's claim)"""
+        try:
+            return write_queue.execute('''
+                INSERT INTO recordings
+                (room_id, user_id, audio_data, audio_hash, audio_size,
+                 original_text, translated_text, target_language, duration)
+                VALUES (?, ?, X'', ?, ?, ?, ?, ?, ?)
+            ''', (room_id, user_id, audio_hash, audio_size,
+                  original_text, translated_text, target_language, duration))
+        finally:
+            blob_store.release(audio_hash)
+
+    @staticmethod
+    @blocking
+    def get_by_room(room_id: str, limit: int = 50, cursor: Optional[str] = None) -> List[Dict]:
+        """
+        Get a page of recordings for a room, newest first.
+
+        Pass the cursor returned by next_cursor() to get the next (older) page.
+        Paging is by (created_at, id) so it walks idx_room_recordings instead
+        of using OFFSET, and rows saved meanwhile don't shift the pages.
+        """
+        query = '''
             SELECT id, room_id, user_id, original_text, translated_text,
                    target_language, duration, created_at
             FROM recordings
             WHERE room_id = ?
-            ORDER BY created_at DESC
-            LIMIT ?
-        ''', (room_id, limit))
+        '''
+        params = [room_id]
+        if cursor:
+            created_at, recording_id = Recording._parse_cursor(cursor)
+            query += ' AND (created_at, id) < (?, ?)'
+            params += [created_at, recording_id]
+        query += ' ORDER BY created_at DESC, id DESC LIMIT ?'
+        params.append(limit)
 
-        rows = cursor.fetchall()
-        conn.close()
+        with db_pool.connection() as conn:
+            rows = conn.execute(query, params).fetchall()
 
         return [dict(row) for row in rows]
 
     @staticmethod
-    def get_audio(recording_id: int) -> Optional[bytes]:
-        """Get audio data for a recording"""
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+    @blocking
+    def get_since(room_id: str, since_id: int, limit: int = 50) -> List[Dict]:
+        """
+        Get recordings added to a room after since_id, oldest first.
+        Raises ValueError if since_id isn't a recording in this room.
+        """
+        with db_pool.connection() as conn:
+            since = conn.execute('SELECT created_at FROM recordings WHERE id = ? AND room_id = ?',
+                                 (since_id, room_id)).fetchone()
+            if since is None:
+                raise ValueError(f"unknown sinceId {since_id} for room {room_id}")
 
-        cursor.execute('SELECT audio_data FROM recordings WHERE id = ?', (recording_id,))
-        row = cursor.fetchone()
-        conn.close()
+            rows = conn.execute('''
+                SELECT id, room_id, user_id, original_text, translated_text,
+                       target_language, duration, created_at
+                FROM recordings
+                WHERE room_id = ? AND created_at >= ? AND id > ?
+                ORDER BY created_at, id
+                LIMIT ?
+            ''', (room_id, since['created_at'], since_id, limit)).fetchall()
 
-        return row[0] if row else None
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def next_cursor(recordings: List[Dict], limit: int) -> Optional[str]:
+        """Cursor for the page after this one, or None if this was the last page"""
+        if len(recordings) < limit:
+            return None
+        last = recordings[-1]
+        return f"{last['created_at']}|{last['id']}"
+
+    @staticmethod
+    def _parse_cursor(cursor: str) -> tuple:
+        """Split a nextCursor back up - raises ValueError if it isn't one"""
+        if not isinstance(cursor, str):
+            raise ValueError(f"invalid cursor: {cursor!r}")
+        created_at, _, recording_id = cursor.rpartition('|')
+        return created_at, int(recording_id)
+
+    @staticmethod
+    @blocking
+    def get(recording_id: int) -> Optional[Dict]:
+        """Get a recording's metadata"""
+        with db_pool.connection() as conn:
+            row = conn.execute('''
+                SELECT id, room_id, user_id, original_text, translated_text,
+                       target_language, duration, created_at
+                FROM recordings WHERE id = ?
+            ''', (recording_id,)).fetchone()
+
+        return dict(row) if row else None
 
     @staticmethod
+    @blocking
+    def get_audio_info(recording_id: int) -> Optional[Dict]:
+        """Get audio metadata (hash, size, created_at) without reading the audio"""
+        with db_pool.connection() as conn:
+            row = conn.execute('''
+                SELECT audio_hash, audio_size, created_at FROM recordings WHERE id = ?
+            ''', (recording_id,)).fetchone()
+
+        return dict(row) if row and row['audio_hash'] else None
+
+    @staticmethod
+    @blocking
+    def get_audio(recording_id: int) -> Optional[bytes]:
+        """Get audio data for a recording (rows not yet migrated still read inline)"""
+        with db_pool.connection() as conn:
+            row = conn.execute('''
+                SELECT audio_hash, CASE WHEN audio_hash IS NULL THEN audio_data END AS audio_data
+                FROM recordings WHERE id = ?
+            ''', (recording_id,)).fetchone()
+
+        if not row:
+            return None
+        if row['audio_hash']:
+            return blob_store.read(row['audio_hash'])
+        return row['audio_data']
+
+    @staticmethod
+    @blocking
     def delete(recording_id: int) -> bool:
-        """Delete a recording"""
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM recordings WHERE id = ?', (recording_id,))
-        deleted = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        """Delete a recording, and its audio blob once no other recording shares it"""
+        with db_pool.connection() as conn:
+            row = conn.execute('SELECT audio_hash FROM recordings WHERE id = ?', (recording_id,)).fetchone()
+            deleted = conn.execute('DELETE FROM recordings WHERE id = ?', (recording_id,)).rowcount > 0
+            conn.execute('DELETE FROM recording_translations WHERE recording_id = ?', (recording_id,))
+
+        audio_hash = row['audio_hash'] if row else None
+        if deleted and audio_hash:
+            # Checked after our commit, against saves committed or in progress meanwhile
+            blob_store.delete_unreferenced(audio_hash, lambda: Recording._blob_in_use(audio_hash))
         return deleted
 
+    @staticmethod
+    def _blob_in_use(audio_hash: str) -> bool:
+        with db_pool.connection() as conn:
+            return conn.execute('SELECT 1 FROM recordings WHERE audio_hash = ? LIMIT 1',
+                                (audio_hash,)).fetchone() is not None
+
+class RecordingTranslation:
+    """Translations of a recording's original text, one row per language"""
+
+    @staticmethod
+    @blocking
+    def get(recording_id: int, language: str) -> Optional[str]:
+        """Get a stored translation, or None if this language hasn't been translated yet"""
+        with db_pool.connection() as conn:
+            row = conn.execute('''
+                SELECT translated_text FROM recording_translations
+                WHERE recording_id = ? AND language = ?
+            ''', (recording_id, language)).fetchone()
+
+        return row[0] if row else None
+
+    @staticmethod
+    @blocking
+    def save(recording_id: int, language: str, translated_text: str):
+        """Store a translation (group-committed; an existing row is replaced)"""
+        write_queue.execute('''
+            INSERT OR REPLACE INTO recording_translations (recording_id, language, translated_text)
+            VALUES (?, ?, ?)
+        ''', (recording_id, language, translated_text))
+
 class Room:
     @staticmethod
+    @blocking
     def create(room_id: str, name: str = None) -> bool:
         """Create a new room"""
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
         try:
-            cursor.execute('''
+            write_queue.execute('''
                 INSERT INTO rooms (id, name) VALUES (?, ?)
             ''', (room_id, name or f"Room {room_id}"))
-            conn.commit()
             success = True
         except sqlite3.IntegrityError:
             success = False
 
-        conn.close()
         return success
 
     @staticmethod
+    @blocking
     def get(room_id: str) -> Optional[Dict]:
         """Get room details"""
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute('SELECT * FROM rooms WHERE id = ?', (room_id,))
-        row = cursor.fetchone()
-        conn.close()
+        with db_pool.connection() as conn:
+            row = conn.execute('SELECT * FROM rooms WHERE id = ?', (room_id,)).fetchone()
 
         return dict(row) if row else None
 
     @staticmethod
+    @blocking
     def deactivate(room_id: str):
         """Mark room as inactive"""
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute('UPDATE rooms SET active = 0 WHERE id = ?', (room_id,))
-        conn.commit()
-        conn.close()
+        with db_pool.connection() as conn:
+            conn.execute('UPDATE rooms SET active = 0 WHERE id = ?', (room_id,))
 
 # Initialize database on import
 init_db()
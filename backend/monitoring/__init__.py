@@ -0,0 +1,4 @@
+from .log import configure_logging, get_logger
+from .metrics import registry
+
+__all__ = ['configure_logging', 'get_logger', 'registry']
@@ -0,0 +1,93 @@
+from typing import Dict
+from config import Config
+import logging
+import sys
+import threading
+
+
+class _KeyValueFormatter(logging.Formatter):
+    """Renders `time level logger event key=value ...` - one line, easy to grep and parse"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, 'fields', None) or {}
+        parts = [self.formatTime(record), record.levelname.lower(), record.name, record.getMessage()]
+        parts += [f'{key}={_quote(value)}' for key, value in fields.items()]
+        line = ' '.join(parts)
+        if record.exc_info:
+            line += '\n' + self.formatException(record.exc_info)
+        return line
+
+
+def _quote(value) -> str:
+    text = str(value)
+    if not text or any(c in text for c in ' ="\n'):
+        return '"' + text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+    return text
+
+
+class StructuredLogger:
+    """
+    Leveled key=value logging with optional sampling.
+
+    Hot paths (per utterance, per upload chunk) log through sampled(), which
+    writes 1 in LOG_SAMPLE_EVERY calls per event name, so a busy node doesn't
+    spend its time formatting and writing log lines. Messages below the
+    configured level are dropped before any formatting happens.
+    """
+
+    def __init__(self, name: str, sample_every: int = Config.LOG_SAMPLE_EVERY):
+        self.logger = logging.getLogger(name)
+        self.sample_every = max(1, sample_every)
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    # event is positional-only so callers can pass event=... as a field
+    def _log(self, level: int, event: str, fields: Dict, exc_info=None):
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, event, extra={'fields': fields}, exc_info=exc_info)
+
+    def debug(self, event: str, /, **fields):
+        self._log(logging.DEBUG, event, fields)
+
+    def info(self, event: str, /, **fields):
+        self._log(logging.INFO, event, fields)
+
+    def warning(self, event: str, /, **fields):
+        self._log(logging.WARNING, event, fields)
+
+    def error(self, event: str, /, exc_info=None, **fields):
+        self._log(logging.ERROR, event, fields, exc_info)
+
+    def sampled(self, event: str, /, level: int = logging.INFO, **fields):
+        """Log 1 in sample_every occurrences of event (the first one always)"""
+        if not self.logger.isEnabledFor(level):
+            return
+        with self._lock:
+            count = self._counts.get(event, 0)
+            self._counts[event] = count + 1
+        if count % self.sample_every == 0:
+            self._log(level, event, dict(fields, sampled=self.sample_every) if self.sample_every > 1 else fields)
+
+
+_configured = False
+
+
+def configure_logging(level: str = Config.LOG_LEVEL):
+    """Install the key=value handler on the root logger (once)"""
+    global _configured
+    if _configured:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(_KeyValueFormatter())
+    handler.setLevel(level.upper())
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+    # werkzeug sets INFO on its own logger (and adds a handler) unless it's already set
+    logging.getLogger('werkzeug').setLevel(level.upper())
+    _configured = True
+
+
+def get_logger(name: str) -> StructuredLogger:
+    configure_logging()
+    return StructuredLogger(name)
@@ -0,0 +1,214 @@
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+import threading
+import time
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative counts are computed on read)"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = list(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    self._counts[i] += 1
+                    break
+            else:
+                self._counts[-1] += 1
+            self.count += 1
+            self.total += value
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            cumulative, running = {}, 0
+            for upper, count in zip(self.buckets + ['+Inf'], self._counts):
+                running += count
+                cumulative[str(upper)] = running
+            return {
+                'buckets': cumulative,
+                'count': self.count,
+                'sum': round(self.total, 4),
+                'avg': round(self.total / self.count, 4) if self.count else 0.0
+            }
+
+
+LATENCY_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.kind}']
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def remove(self, *label_values):
+        """Drop a label set (e.g. a room that no longer exists)"""
+        with self._lock:
+            self._values.pop(label_values, None)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f'{self.name}{_format_labels(self.label_names, values)} {value}'
+                                for values, value in items]
+
+
+class Gauge(_Metric):
+    """Value read from a callback at scrape time - returns a number or {label tuple: number}"""
+    kind = 'gauge'
+
+    def __init__(self, name: str, help_text: str, read: Callable, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self.read = read
+
+    def render(self) -> List[str]:
+        value = self.read()
+        if not isinstance(value, dict):
+            value = {(): value}
+        return self.header() + [f'{self.name}{_format_labels(self.label_names, values)} {number}'
+                                for values, number in value.items()]
+
+
+class LabeledHistogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = list(buckets)
+        self._histograms: Dict[Tuple[str, ...], Histogram] = {}
+
+    def labels(self, *label_values) -> Histogram:
+        histogram = self._histograms.get(label_values)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(label_values, Histogram(self.buckets))
+        return histogram
+
+    def observe(self, value: float, *label_values):
+        self.labels(*label_values).observe(value)
+
+    @contextmanager
+    def time(self, *label_values) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        with self._lock:
+            items = list(self._histograms.items())
+        for values, histogram in items:
+            snapshot = histogram.snapshot()
+            for upper, count in snapshot['buckets'].items():
+                labels = _format_labels(self.label_names, values, f'le="{upper}"')
+                lines.append(f'{self.name}_bucket{labels} {count}')
+            labels = _format_labels(self.label_names, values)
+            lines.append(f'{self.name}_sum{labels} {histogram.total}')
+            lines.append(f'{self.name}_count{labels} {histogram.count}')
+        return lines
+
+
+class Registry:
+    """All metrics of this process, rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, read: Callable, labels: Sequence[str] = ()) -> Gauge:
+        """Register (or replace) a gauge read at scrape time"""
+        gauge = Gauge(name, help_text, read, labels)
+        with self._lock:
+            self._metrics[name] = gauge
+        return gauge
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> LabeledHistogram:
+        return self.register(LabeledHistogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception:
+                # One broken gauge callback must not take down the whole scrape
+                continue
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+# Socket.IO handlers
+events_total = registry.counter('socketio_events_total', 'Socket.IO events received', ['event'])
+handler_errors_total = registry.counter('socketio_handler_errors_total', 'Socket.IO handlers that raised', ['event'])
+handler_seconds = registry.histogram('socketio_handler_seconds', 'Socket.IO handler latency', ['event'])
+events_throttled_total = registry.counter('socketio_events_throttled_total',
+                                          'Socket.IO events and connections refused by admission control',
+                                          ['event', 'reason'])
+
+# Frame relay
+frames_in_total = registry.counter('frames_received_total', 'Video/screen frames received from senders', ['event'])
+frames_relayed_total = registry.counter('frames_relayed_total', 'Frames sent to receivers', ['event'])
+frames_dropped_total = registry.counter('frames_dropped_total', 'Stale frames replaced before sending', ['event'])
+room_bytes_in_total = registry.counter('room_frame_bytes_in_total', 'Frame bytes received per room', ['room'])
+room_bytes_out_total = registry.counter('room_frame_bytes_out_total', 'Frame bytes relayed per room', ['room'])
+
+# Translation
+translation_seconds = registry.histogram('translation_seconds', 'Translation backend call latency', ['backend', 'call'])
+translation_requests_total = registry.counter('translation_requests_total', 'Translation backend calls',
+                                              ['backend', 'call', 'outcome'])
+interim_translations_total = registry.counter('interim_translations_total',
+                                              'Speculative translations of interim transcripts', ['outcome'])
+
+# Database
+db_seconds = registry.histogram('db_query_seconds', 'Time holding a pooled connection or waiting on a group commit',
+                                ['op'])
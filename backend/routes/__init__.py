@@ -1,3 +1,4 @@
 from .socketio_handlers import register_socketio_handlers
+from .recording_routes import register_recording_routes
 
-__all__ = ['register_socketio_handlers']
+__all__ = ['register_socketio_handlers', 'register_recording_routes']
@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+from flask import abort, send_file
+from config import Config
+from database import Recording, blob_store
+import io
+
+
+def register_recording_routes(app):
+    """Register HTTP routes for recording playback"""
+
+    @app.route('/recordings/<int:recording_id>/audio')
+    def recording_audio(recording_id):
+        """
+        Stream a recording's audio.
+
+        send_file answers Range requests with 206 partial content and
+        If-None-Match/If-Modified-Since with 304, and streams the blob file in
+        small chunks, so memory per request stays constant however long the
+        recording is. Blobs are content-addressed, so the hash is a strong ETag.
+        """
+        info = Recording.get_audio_info(recording_id)
+
+        if info is None:
+            # Rows not yet moved by migrate_blobs still hold their audio inline
+            audio_data = Recording.get_audio(recording_id)
+            if not audio_data:
+                abort(404)
+            return send_file(io.BytesIO(audio_data), mimetype=Config.RECORDING_MIME_TYPE,
+                             conditional=True, etag=False)
+
+        if not blob_store.exists(info['audio_hash']):
+            abort(404)
+
+        last_modified = None
+        if info['created_at']:
+            # SQLite CURRENT_TIMESTAMP is UTC
+            last_modified = datetime.strptime(info['created_at'], '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+
+        return send_file(
+            blob_store.path(info['audio_hash']),
+            mimetype=Config.RECORDING_MIME_TYPE,
+            conditional=True,
+            etag=info['audio_hash'],
+            last_modified=last_modified,
+            max_age=Config.RECORDING_CACHE_MAX_AGE
+        )
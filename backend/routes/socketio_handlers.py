@@ -1,60 +1,170 @@
-from flask_socketio import emit, join_room, leave_room
+from flask_socketio import ConnectionRefusedError, emit, join_room, leave_room
 from flask import request
+from config import Config
 from services import TranslationService
 from services.room_service import room_service
-from database import Recording, Room
+from services.frame_relay import frame_relay
+from services.stream_controller import stream_controller
+from services.screen_composite import screen_composites
+from services.frame_cache import frame_cache
+from services.peer_links import peer_links
+from services.admission import admission
+from services.translation_pipeline import TranslationPipeline
+from services.interim_translator import InterimTranslator
+from services.recording_uploads import UploadError, recording_uploads
+from database import Recording, RecordingTranslation, Room, blob_store
+from monitoring.log import get_logger
+from monitoring import metrics
 import base64
+import functools
+import logging
+import inspect
+import time
+
+log = get_logger(__name__)
 
 translation_service = TranslationService()
+translation_pipeline = TranslationPipeline(translation_service)
+interim_translator = InterimTranslator(translation_pipeline)
+
+# A rejected event from these leaves the screen share's tiles without their base
+SCREEN_EVENTS = frozenset({'screen-frame', 'screen-tiles'})
+
+def instrument(event, handler):
+    """Count an event, run it past admission control and time its handler"""
+    # Flask-SocketIO passes extra args (e.g. auth on connect) only if the handler takes them
+    accepts = len(inspect.signature(handler).parameters)
+
+    @functools.wraps(handler)
+    def wrapper(*args):
+        metrics.events_total.inc(event)
+        rejected = admission.check(request.sid, event, args[0] if args else None)
+        if rejected:
+            metrics.events_throttled_total.inc(event, rejected)
+            log.sampled("event_rejected", level=logging.WARNING, handler=event, sid=request.sid, reason=rejected)
+            if event in SCREEN_EVENTS:
+                # Tiles are deltas against the last frame the sharer encoded - once one is
+                # lost, receivers stay stale until a keyframe, so ask for one now
+                data = args[0] if args and isinstance(args[0], dict) else {}
+                emit('screen-keyframe-request', {'userId': data.get('userId')})
+            # Seen only by emits with an ack (e.g. recording-chunk, which retries on overload)
+            return {'error': rejected}
+        start = time.perf_counter()
+        try:
+            return handler(*args[:accepts])
+        except ConnectionRefusedError:
+            raise
+        except Exception:
+            metrics.handler_errors_total.inc(event)
+            log.error("handler_failed", exc_info=True, handler=event)
+            raise
+        finally:
+            metrics.handler_seconds.observe(time.perf_counter() - start, event)
+
+    return wrapper
+
+def record_frame(event, room_id, frame, receivers):
+    """Frame counters and per-room bytes in/out"""
+    size = stream_controller.frame_size(frame)
+    metrics.frames_in_total.inc(event)
+    metrics.room_bytes_in_total.inc(room_id, amount=size)
+    metrics.room_bytes_out_total.inc(room_id, amount=size * len(receivers))
+
+def forget_room_metrics(room_id):
+    """Drop per-room series once the room is empty"""
+    if not room_service.get_room_users(room_id):
+        metrics.room_bytes_in_total.remove(room_id)
+        metrics.room_bytes_out_total.remove(room_id)
+
+def listener_targets(room_id, user_id, target_lang):
+    """Caption language -> where to emit it (each listener's sid with fan-out, else the room)"""
+    if not Config.TRANSLATION_FAN_OUT:
+        return {target_lang: [room_id]}
+    targets_by_lang = {}
+    for uid, udata in list(room_service.get_room_users(room_id).items()):
+        listener_lang = target_lang if uid == user_id else (udata['language'] or target_lang)
+        targets_by_lang.setdefault(listener_lang, []).append(udata['sid'])
+    return targets_by_lang
+
+def owns_upload(user_id, room_id=None):
+    """Whether this socket joined as user_id (and into room_id) - uploads are keyed by user id"""
+    sid_room, sid_user = room_service.get_user_by_sid(request.sid)
+    return bool(user_id) and sid_user == user_id and (room_id is None or sid_room == room_id)
 
 def register_socketio_handlers(socketio):
     """Register all Socket.IO event handlers"""
 
-    @socketio.on('connect')
+    def on(event):
+        """socketio.on, with every handler counted and timed"""
+        def decorator(handler):
+            return socketio.on(event)(instrument(event, handler))
+        return decorator
+
+    @on('connect')
     def handle_connect():
         """Handle client connection"""
-        print(f"🔌 Client connected: {request.sid}")
+        refused = admission.connect(request.sid)
+        if refused:
+            metrics.events_throttled_total.inc('connect', refused)
+            log.sampled("connection_refused", level=logging.WARNING, reason=refused)
+            raise ConnectionRefusedError(refused)
+        log.debug("client_connected", sid=request.sid)
         emit('connected', {'sid': request.sid})
 
-    @socketio.on('disconnect')
+    @on('disconnect')
     def handle_disconnect():
         """Handle client disconnection"""
+        frame_relay.remove_subscriber(request.sid)
+        peer_links.remove(request.sid)
+        admission.forget(request.sid)
+        # Uploads outlive the socket (resumed after a reconnect); abandoned ones go here
+        recording_uploads.expire()
         room_id, user_id = room_service.get_user_by_sid(request.sid)
         if room_id and user_id:
             room_service.leave_room(room_id, user_id)
+            frame_relay.discard_source(user_id)
+            stream_controller.forget(user_id)
+            screen_composites.remove(user_id)
+            frame_cache.remove(room_id, user_id)
+            interim_translator.discard(room_id, user_id)
             emit('user-left', {'userId': user_id}, room=room_id, skip_sid=request.sid)
-            print(f"🔌 User {user_id} left room {room_id}")
+            forget_room_metrics(room_id)
+            log.info("user_disconnected", room=room_id, user=user_id)
 
-    @socketio.on('create-room')
+    @on('create-room')
     def handle_create_room(data):
         """Create a new room"""
         room_id = room_service.create_room(data.get('roomId'))
         Room.create(room_id)
         emit('room-created', {'roomId': room_id})
-        print(f"🏠 Room created: {room_id}")
+        log.info("room_created", room=room_id)
 
-    @socketio.on('join-room')
+    @on('join-room')
     def handle_join_room(data):
         """Handle user joining a room"""
         room_id = data.get('roomId', '').strip()
         user_id = data.get('userId', '').strip()
         name = data.get('name', 'Anonymous')
         language = data.get('language', 'Spanish')
+        # Only counts for the first user in; everyone else gets the room's mode
+        media = data.get('media') if data.get('media') in ('p2p', 'relay') else None
 
         # Validate inputs
         if not room_id or not user_id:
             emit('error', {'message': 'Invalid room or user ID'})
             return
 
-        success = room_service.join_room(room_id, user_id, request.sid, name, language)
+        success = room_service.join_room(room_id, user_id, request.sid, name, language, media)
 
         if not success:
             emit('room-full', {'roomId': room_id})
             return
 
         join_room(room_id)
+        users = room_service.get_room_users(room_id)
 
-        # Notify user of successful join
+        # Notify user of successful join, with the peers' latest frames so
+        # their video and screen shares render right away
         emit('joined-room', {
             'roomId': room_id,
             'userId': user_id,
@@ -64,7 +174,12 @@ def register_socketio_handlers(socketio):
                 'language': udata['language'],
                 'streamActive': udata['stream_active'],
                 'screenShareActive': udata['screen_share_active']
-            } for uid, udata in room_service.get_room_users(room_id).items()]
+            } for uid, udata in users.items()],
+            'frames': frame_cache.get_room(room_id, exclude_user=user_id),
+            'screens': [snapshot for snapshot in (
+                screen_composites.snapshot(uid) for uid, udata in users.items()
+                if uid != user_id and udata['screen_share_active']) if snapshot],
+            'media': {'mode': room_service.get_media_mode(room_id), 'iceServers': Config.ICE_SERVERS}
         })
 
         # Notify others in room
@@ -74,63 +189,103 @@ def register_socketio_handlers(socketio):
             'language': language
         }, room=room_id, skip_sid=request.sid)
 
-        print(f"👤 User {user_id} joined room {room_id}")
+        log.info("user_joined", room=room_id, user=user_id, language=language)
 
-    @socketio.on('leave-room')
+    @on('leave-room')
     def handle_leave_room(data):
         """Handle user leaving room"""
         room_id = data.get('roomId')
         user_id = data.get('userId')
 
         room_service.leave_room(room_id, user_id)
+        frame_relay.discard_source(user_id)
+        peer_links.remove(request.sid)
+        stream_controller.forget(user_id)
+        screen_composites.remove(user_id)
+        frame_cache.remove(room_id, user_id)
+        interim_translator.discard(room_id, user_id)
         leave_room(room_id)
 
         emit('user-left', {'userId': user_id}, room=room_id)
-        print(f"👋 User {user_id} left room {room_id}")
+        forget_room_metrics(room_id)
+        log.info("user_left", room=room_id, user=user_id)
 
-    @socketio.on('video-frame')
+    @on('video-frame')
     def handle_video_frame(data):
         """Relay video frames to all users in room"""
         room_id = data.get('roomId')
         user_id = data.get('userId')
-        frame_data = data.get('frame')
 
         room_service.set_stream_status(room_id, user_id, True)
 
-        # Broadcast to all others in room
-        emit('video-frame', {
-            'userId': user_id,
-            'frame': frame_data
-        }, room=room_id, skip_sid=request.sid)
-
-    @socketio.on('screen-frame')
+        # Relay to the others in the room without a direct connection to the sender,
+        # dropping stale frames for slow receivers
+        receiver_sids = peer_links.relay_sids(
+            request.sid, room_service.get_peer_sids(room_id, exclude_sid=request.sid))
+        payload = frame_relay.relay(socketio, 'video-frame', user_id, data, receiver_sids)
+        record_frame('video-frame', room_id, data.get('frame'), receiver_sids)
+        frame_cache.put(room_id, user_id, payload)
+        if Config.STREAM_CONTROL:
+            stream_controller.observe(socketio, 'video-frame', user_id, request.sid, data.get('frame'), receiver_sids)
+
+    @on('screen-frame')
     def handle_screen_frame(data):
         """Relay screen share frames to all users in room"""
         room_id = data.get('roomId')
         user_id = data.get('userId')
-        frame_data = data.get('frame')
 
         room_service.set_screen_share_status(room_id, user_id, True)
 
-        # Broadcast to all others in room
-        emit('screen-frame', {
-            'userId': user_id,
-            'frame': frame_data
-        }, room=room_id, skip_sid=request.sid)
+        # Relay to the others in the room without a direct connection to the sender,
+        # dropping stale frames for slow receivers
+        receiver_sids = peer_links.relay_sids(
+            request.sid, room_service.get_peer_sids(room_id, exclude_sid=request.sid))
+        payload = frame_relay.relay(socketio, 'screen-frame', user_id, data, receiver_sids)
+        record_frame('screen-frame', room_id, data.get('frame'), receiver_sids)
+        # Every full frame is a keyframe for late joiners
+        screen_composites.set_keyframe(user_id, payload)
+        if Config.STREAM_CONTROL:
+            stream_controller.observe(socketio, 'screen-frame', user_id, request.sid, data.get('frame'), receiver_sids)
+
+    @on('screen-tiles')
+    def handle_screen_tiles(data):
+        """Relay the changed tiles of a screen share frame (sent between keyframes)"""
+        room_id = data.get('roomId')
+        user_id = data.get('userId')
+
+        tiles = screen_composites.valid_tiles(data.get('tiles'))
+        if tiles is None:
+            return
+
+        room_service.set_screen_share_status(room_id, user_id, True)
 
-    @socketio.on('stop-screen-share')
+        receiver_sids = peer_links.relay_sids(
+            request.sid, room_service.get_peer_sids(room_id, exclude_sid=request.sid))
+        frame_relay.relay(socketio, 'screen-tiles', user_id, data, receiver_sids)
+        record_frame('screen-tiles', room_id, tiles, receiver_sids)
+        if not screen_composites.apply_tiles(user_id, tiles):
+            emit('screen-keyframe-request', {'userId': user_id})
+        if Config.STREAM_CONTROL:
+            # Tiles and keyframes are one stream for rate control
+            stream_controller.observe(socketio, 'screen-frame', user_id, request.sid, tiles, receiver_sids)
+
+    @on('stop-screen-share')
     def handle_stop_screen_share(data):
         """Handle stopping screen share"""
         room_id = data.get('roomId')
         user_id = data.get('userId')
 
         room_service.set_screen_share_status(room_id, user_id, False)
+        frame_relay.discard_source(user_id, 'screen-frame')
+        frame_relay.discard_source(user_id, 'screen-tiles')
+        stream_controller.forget(user_id, 'screen-frame')
+        screen_composites.remove(user_id)
 
         emit('screen-share-stopped', {
             'userId': user_id
         }, room=room_id, include_self=True)
 
-    @socketio.on('audio-chunk')
+    @on('audio-chunk')
     def handle_audio(data):
         """Handle audio transcription and translation (live mode)"""
         room_id = data.get('roomId')
@@ -142,37 +297,210 @@ def register_socketio_handlers(socketio):
         if not text:
             return
 
-        print(f"🎤 Room {room_id} - {user_id}: {text} | Target: {target_lang}")
+        log.sampled("utterance", room=room_id, user=user_id, chars=len(text), target=target_lang)
+
+        # Translations already made from this speaker's interim transcript of the same text
+        speculated = interim_translator.take(room_id, user_id, text)
+
+        # Bidirectional: also translate back to English if source was target lang
+        reverse_lang = 'English' if source_lang != 'en' else None
+
+        if Config.TRANSLATION_STREAMING and len(text) >= Config.TRANSLATION_STREAM_MIN_CHARS:
+            # Long utterance: stream partial captions to each language group as tokens arrive
+            targets_by_lang = listener_targets(room_id, user_id, target_lang)
+
+            reverse_future = translation_pipeline.submit(text, reverse_lang) if reverse_lang else None
+
+            def stream_to(language, targets):
+                def send_partial(partial):
+                    for target in targets:
+                        socketio.emit('translation-partial', {
+                            'userId': user_id,
+                            'original': text,
+                            'translated': partial,
+                            'sourceLang': source_lang,
+                            'targetLang': language
+                        }, to=target)
+
+                def send_final(translated_text):
+                    def emit_result(reverse_translation):
+                        for target in targets:
+                            socketio.emit('translation-result', {
+                                'userId': user_id,
+                                'original': text,
+                                'translated': translated_text or "...",
+                                'sourceLang': source_lang,
+                                'targetLang': language,
+                                'reverseTranslation': reverse_translation
+                            }, to=target)
+
+                    if not translated_text or reverse_future is None:
+                        emit_result(None)
+                    elif reverse_future.done():
+                        emit_result(reverse_future.result())
+                    else:
+                        # Don't hold the caption back: send it now and again with the
+                        # reverse translation once that finishes
+                        emit_result(None)
+
+                        def send_reverse(future):
+                            if not future.cancelled() and future.exception() is None and future.result():
+                                emit_result(future.result())
+
+                        reverse_future.add_done_callback(send_reverse)
+
+                translation_pipeline.translate_stream(text, language, send_partial, send_final,
+                                                      speculation=speculated.get(language))
+
+            for language, targets in targets_by_lang.items():
+                stream_to(language, targets)
+            return
+
+        if Config.TRANSLATION_FAN_OUT:
+            # One request covers every listener's language; each listener gets their own
+            listeners = {uid: (udata['sid'], udata['language'])
+                         for uid, udata in list(room_service.get_room_users(room_id).items())}
+            # Only languages someone receives - the speaker's own language isn't one unless a listener has it
+            languages = [target_lang] + [language for uid, (_, language) in listeners.items()
+                                         if uid != user_id and language]
+            if reverse_lang:
+                languages.append(reverse_lang)
+            languages = list(dict.fromkeys(languages))
+
+            def send_fan_out(results):
+                reverse_translation = results.get(reverse_lang) if reverse_lang else None
+                for uid, (sid, language) in listeners.items():
+                    listener_lang = target_lang if uid == user_id else (language or target_lang)
+                    translated_text = results.get(listener_lang)
+                    payload = {
+                        'userId': user_id,
+                        'original': text,
+                        'translated': translated_text or "...",
+                        'sourceLang': source_lang,
+                        'targetLang': listener_lang
+                    }
+                    if translated_text:
+                        payload['reverseTranslation'] = reverse_translation
+                    socketio.emit('translation-result', payload, to=sid)
+
+            translation_pipeline.translate_fan_out(text, languages, send_fan_out, reuse=speculated)
+            return
+
+        # Translate on the worker pool; forward and reverse run concurrently
+        def send_result(translated_text, reverse_translation):
+            if translated_text:
+                socketio.emit('translation-result', {
+                    'userId': user_id,
+                    'original': text,
+                    'translated': translated_text,
+                    'sourceLang': source_lang,
+                    'targetLang': target_lang,
+                    'reverseTranslation': reverse_translation
+                }, room=room_id)
+            else:
+                socketio.emit('translation-result', {
+                    'userId': user_id,
+                    'original': text,
+                    'translated': "...",
+                    'sourceLang': source_lang,
+                    'targetLang': target_lang
+                }, room=room_id)
+
+        translation_pipeline.translate_bidirectional(text, target_lang, reverse_lang, send_result,
+                                                     forward=speculated.get(target_lang))
+
+    @on('audio-interim')
+    def handle_audio_interim(data):
+        """Speculatively translate a growing interim transcript (the final text follows as audio-chunk)"""
+        if not Config.INTERIM_TRANSLATION:
+            return
+
+        room_id = data.get('roomId')
+        user_id = data.get('userId')
+        text = (data.get('text') or '').strip()
+        source_lang = data.get('sourceLang', 'en')
+        target_lang = data.get('targetLang', 'Spanish')
+
+        if not text or not room_id or not user_id:
+            return
+
+        targets_by_lang = listener_targets(room_id, user_id, target_lang)
+
+        def send_interim(spoken, language, translated_text):
+            for target in targets_by_lang.get(language, ()):
+                socketio.emit('translation-partial', {
+                    'userId': user_id,
+                    'original': spoken,
+                    'translated': translated_text,
+                    'sourceLang': source_lang,
+                    'targetLang': language,
+                    'interim': True
+                }, to=target)
+
+        interim_translator.update(room_id, user_id, text, targets_by_lang, send_interim)
+
+    def pretranslate_recording(recording_id, room_id, original_text, done_language):
+        """Translate a new recording into the other room languages in the background"""
+        languages = [lang for lang in room_service.get_room_languages(room_id) if lang != done_language]
+        if not languages:
+            return
 
-        # Translate to target language
-        translated_text = translation_service.translate(text, target_lang)
+        def store(translations):
+            for language, translated_text in translations.items():
+                if translated_text:
+                    RecordingTranslation.save(recording_id, language, translated_text)
 
-        if translated_text:
-            # Bidirectional: also translate back to English if source was target lang
-            reverse_translation = None
-            if source_lang != 'en':
-                reverse_translation = translation_service.translate(text, 'English')
+        translation_pipeline.translate_fan_out(original_text, languages, store)
 
-            emit('translation-result', {
+    def finish_recording(room_id, user_id, original_text, target_language, duration, store_audio):
+        """Translate a recording, put its audio in the blob store and save it"""
+        # Translate
+        translated_text = translation_service.translate(original_text, target_language)
+
+        if not translated_text:
+            log.warning("recording_translation_failed", room=room_id, target=target_language)
+            emit('recording-error', {'message': 'Translation failed'})
+            return
+
+        # Save to database
+        try:
+            audio_hash, audio_size = store_audio()
+            recording_id = Recording.save_blob(
+                room_id=room_id,
+                user_id=user_id,
+                audio_hash=audio_hash,
+                audio_size=audio_size,
+                original_text=original_text,
+                translated_text=translated_text,
+                target_language=target_language,
+                duration=duration
+            )
+
+            # Everyone in the room gets the new recording, so nobody re-polls the list
+            emit('recording-saved', {
+                'recordingId': recording_id,
                 'userId': user_id,
-                'original': text,
+                'original': original_text,
                 'translated': translated_text,
-                'sourceLang': source_lang,
-                'targetLang': target_lang,
-                'reverseTranslation': reverse_translation
-            }, room=room_id)
-        else:
-            emit('translation-result', {
-                'userId': user_id,
-                'original': text,
-                'translated': "...",
-                'sourceLang': source_lang,
-                'targetLang': target_lang
+                'targetLanguage': target_language,
+                'duration': duration
             }, room=room_id)
 
-    @socketio.on('save-recording')
+            log.info("recording_saved", room=room_id, recording=recording_id, bytes=audio_size)
+
+            RecordingTranslation.save(recording_id, target_language, translated_text)
+            if Config.RECORDING_PRETRANSLATE:
+                pretranslate_recording(recording_id, room_id, original_text, target_language)
+        except UploadError as e:
+            log.warning("recording_upload_rejected", room=room_id, error=e)
+            emit('recording-error', {'message': str(e)})
+        except Exception as e:
+            log.error("recording_save_failed", room=room_id, error=e)
+            emit('recording-error', {'message': f'Failed to save: {str(e)}'})
+
+    @on('save-recording')
     def handle_save_recording(data):
-        """Save audio recording with translation"""
+        """Save audio recording with translation (single message - see recording-chunk for large files)"""
         room_id = data.get('roomId')
         user_id = data.get('userId')
         audio_blob = data.get('audioBlob')  # base64 encoded
@@ -180,79 +508,145 @@ def register_socketio_handlers(socketio):
         target_language = data.get('targetLanguage', 'Spanish')
         duration = data.get('duration', 0.0)
 
-        print(f"📝 Save recording request - Room: {room_id}, Text: '{original_text}', Lang: {target_language}")
-
         # Validate inputs
         if not original_text:
-            print("❌ No original text provided")
             emit('recording-error', {'message': 'No text to translate'})
             return
 
         if not audio_blob:
-            print("❌ No audio data provided")
             emit('recording-error', {'message': 'No audio data'})
             return
 
+        if len(audio_blob) * 3 // 4 > Config.RECORDING_MAX_BYTES:
+            emit('recording-error', {'message': 'Recording too large'})
+            return
+
         # Decode base64 audio
         try:
             audio_data = base64.b64decode(audio_blob)
-            print(f"✓ Audio decoded: {len(audio_data)} bytes")
         except Exception as e:
-            print(f"❌ Audio decode error: {e}")
+            log.warning("recording_decode_failed", room=room_id, error=e)
             emit('recording-error', {'message': 'Invalid audio data'})
             return
 
-        # Translate
-        print(f"🔄 Translating to {target_language}...")
-        translated_text = translation_service.translate(original_text, target_language)
+        finish_recording(room_id, user_id, original_text, target_language, duration,
+                         lambda: (blob_store.put(audio_data), len(audio_data)))
 
-        if not translated_text:
-            print("❌ Translation failed")
-            emit('recording-error', {'message': 'Translation failed'})
-            return
+    @on('recording-chunk')
+    def handle_recording_chunk(data):
+        """
+        Append one binary chunk to an upload. The ack carries the number of
+        bytes the server has, so after a reconnect the client resumes from there.
+        """
+        upload_id = data.get('uploadId')
+        user_id = data.get('userId')
+        chunk = data.get('chunk') or b''
 
-        print(f"✓ Translated: '{translated_text}'")
+        if not isinstance(chunk, (bytes, bytearray)):
+            return {'uploadId': upload_id, 'error': 'Chunks must be binary'}
+        if not owns_upload(user_id):
+            return {'uploadId': upload_id, 'error': 'Not your upload'}
 
-        # Save to database
         try:
-            recording_id = Recording.save(
-                room_id=room_id,
-                user_id=user_id,
-                audio_data=audio_data,
-                original_text=original_text,
-                translated_text=translated_text,
-                target_language=target_language,
-                duration=duration
-            )
+            received = recording_uploads.append(user_id, upload_id, int(data.get('offset', 0)), bytes(chunk))
+        except (UploadError, ValueError) as e:
+            log.sampled("recording_chunk_rejected", level=logging.WARNING, user=user_id, error=e)
+            return {'uploadId': upload_id, 'error': str(e)}
 
-            emit('recording-saved', {
-                'recordingId': recording_id,
-                'original': original_text,
-                'translated': translated_text,
-                'targetLanguage': target_language
-            })
+        return {'uploadId': upload_id, 'received': received}
 
-            print(f"💾 Recording saved: {recording_id}")
-        except Exception as e:
-            print(f"❌ Database error: {e}")
-            emit('recording-error', {'message': f'Failed to save: {str(e)}'})
+    @on('recording-commit')
+    def handle_recording_commit(data):
+        """Finish a chunked upload - translation and persistence start here"""
+        room_id = data.get('roomId')
+        user_id = data.get('userId')
+        upload_id = data.get('uploadId')
+        size = data.get('size')
+        original_text = data.get('originalText', '').strip()
+        target_language = data.get('targetLanguage', 'Spanish')
+        duration = data.get('duration', 0.0)
 
-    @socketio.on('get-recordings')
+        if not original_text:
+            emit('recording-error', {'message': 'No text to translate'})
+            return
+
+        if not owns_upload(user_id, room_id):
+            emit('recording-error', {'message': 'Not your upload', 'uploadId': upload_id})
+            return
+
+        # Check the upload before spending a translation on it
+        received = recording_uploads.status(user_id, upload_id)
+        if not received or (size is not None and received != size):
+            log.info("recording_upload_incomplete", user=user_id, received=received, size=size)
+            emit('recording-error', {'message': 'Upload incomplete', 'uploadId': upload_id, 'received': received})
+            return
+
+        finish_recording(room_id, user_id, original_text, target_language, duration,
+                         lambda: recording_uploads.commit(user_id, upload_id, size))
+
+    @on('get-recordings')
     def handle_get_recordings(data):
-        """Get all recordings for a room"""
+        """
+        Get recordings for a room, newest first, one page at a time.
+        Pass nextCursor back as cursor for older pages, or sinceId (the newest
+        id the client has) to get only recordings added after it.
+        """
+        if not isinstance(data, dict) or not data.get('roomId'):
+            emit('recording-error', {'message': 'Invalid recordings request'})
+            return
+
         room_id = data.get('roomId')
-        recordings = Recording.get_by_room(room_id)
+        since_id = data.get('sinceId')
+        cursor = data.get('cursor')
+        try:
+            limit = max(1, min(int(data.get('limit') or Config.RECORDINGS_PAGE_SIZE), Config.RECORDINGS_PAGE_MAX))
+            if since_id is not None:
+                since_id = int(since_id)
+                recordings = Recording.get_since(room_id, since_id, limit)
+            else:
+                recordings = Recording.get_by_room(room_id, limit, cursor)
+        except (TypeError, ValueError, OverflowError):
+            # Malformed limit or cursor, a sinceId not in this room (out-of-range ids overflow SQLite's INTEGER)
+            emit('recording-error', {'message': 'Invalid recordings request'})
+            return
 
-        emit('recordings-list', {'recordings': recordings})
+        if since_id is not None:
+            emit('recordings-list', {
+                'recordings': recordings,
+                'sinceId': since_id,
+                # More than one page arrived meanwhile - ask again from the last id
+                'hasMore': len(recordings) == limit
+            })
+            return
+
+        emit('recordings-list', {
+            'recordings': recordings,
+            'cursor': cursor,
+            'nextCursor': Recording.next_cursor(recordings, limit)
+        })
 
-    @socketio.on('translate-recording')
+    @on('translate-recording')
     def handle_translate_recording(data):
-        """Translate an existing recording to a new language"""
+        """Translate an existing recording to a new language (stored, so each language is translated once)"""
         recording_id = data.get('recordingId')
         new_target_lang = data.get('targetLanguage')
-        original_text = data.get('originalText')
 
-        translated_text = translation_service.translate(original_text, new_target_lang)
+        translated_text = RecordingTranslation.get(recording_id, new_target_lang)
+
+        if translated_text is None:
+            # Translate the stored original, not whatever text the client sent
+            recording = Recording.get(recording_id)
+            if recording is None:
+                emit('recording-error', {'message': 'Recording not found'})
+                return
+
+            if recording['target_language'] == new_target_lang:
+                # Saved before recording_translations existed
+                translated_text = recording['translated_text']
+            else:
+                translated_text = translation_service.translate(recording['original_text'], new_target_lang)
+            if translated_text:
+                RecordingTranslation.save(recording_id, new_target_lang, translated_text)
 
         emit('recording-translated', {
             'recordingId': recording_id,
@@ -260,7 +654,7 @@ def register_socketio_handlers(socketio):
             'translated': translated_text
         })
 
-    @socketio.on('update-language')
+    @on('update-language')
     def handle_update_language(data):
         """Update user's preferred language"""
         room_id = data.get('roomId')
@@ -274,14 +668,28 @@ def register_socketio_handlers(socketio):
             'language': language
         }, room=room_id, include_self=True)
 
-    @socketio.on('signal')
+    @on('signal')
     def handle_signal(data):
-        """Handle WebRTC signaling for initial connection setup"""
-        room_id = data.get('roomId')
-        target_user = data.get('targetUser')
-        signal_data = data.get('signal')
+        """Forward WebRTC signaling (description or ICE candidate) to the one peer it is for"""
+        # Sender and room come from the socket, so signals can't be sent as someone else
+        room_id, user_id = room_service.get_user_by_sid(request.sid)
+        target_sid = room_service.get_user_sid(room_id, data.get('targetUser')) if room_id else None
+        if not target_sid:
+            return
 
         emit('signal', {
-            'fromUser': data.get('fromUser'),
-            'signal': signal_data
-        }, room=room_id, skip_sid=request.sid)
+            'fromUser': user_id,
+            'signal': data.get('signal')
+        }, to=target_sid)
+
+    @on('p2p-status')
+    def handle_p2p_status(data):
+        """A direct connection to a peer came up or went down - relay frames to them only while it's down"""
+        room_id, user_id = room_service.get_user_by_sid(request.sid)
+        peer_sid = room_service.get_user_sid(room_id, data.get('peerId')) if room_id else None
+        if not peer_sid:
+            return
+
+        connected = bool(data.get('connected'))
+        peer_links.set(request.sid, peer_sid, connected)
+        log.info("p2p_link", room=room_id, user=user_id, peer=data.get('peerId'), connected=connected)
@@ -0,0 +1,43 @@
+"""
+Concurrency runtime selected by Config.ASYNC_MODE.
+
+'threading' - Werkzeug's development server, one OS thread per connection.
+'gevent'    - cooperative greenlets on gevent's WSGI server; thousands of
+              sockets per process. The standard library is monkey-patched
+              when this module is imported, so it must be imported before
+              anything else (app.py does it first).
+
+Under gevent, network I/O (Socket.IO, Redis, Gemini over REST) yields to
+other greenlets on its own, but sqlite and large file writes would stall
+every connection on the node; those run on gevent's native thread pool
+through @blocking.
+"""
+from config import Config
+import functools
+
+GEVENT = Config.ASYNC_MODE == 'gevent'
+
+if GEVENT:
+    from gevent import monkey
+    monkey.patch_all()
+
+
+def run_blocking(fn, *args, **kwargs):
+    """Call fn off the event loop under gevent (directly otherwise)"""
+    if not GEVENT:
+        return fn(*args, **kwargs)
+    import gevent
+    # Nested calls from a pool thread run inline (gevent handles that case)
+    return gevent.get_hub().threadpool.apply(fn, args, kwargs)
+
+
+def blocking(fn):
+    """Decorator for functions that block the whole process (sqlite, disk)"""
+    if not GEVENT:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        return run_blocking(fn, *args, **kwargs)
+
+    return wrapper
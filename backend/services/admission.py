@@ -0,0 +1,174 @@
+from typing import Any, Dict, Optional
+from config import Config
+from monitoring.log import get_logger
+import random
+import threading
+import time
+
+log = get_logger(__name__)
+
+# Shed once the node falls behind (load level 1): high volume, and the next one replaces it.
+# A growing share of them is dropped as the lag grows, all of them at load level 2
+# (a dropped screen-frame or screen-tiles makes instrument() ask the sharer for a keyframe)
+SHED_FIRST = frozenset({'video-frame', 'screen-frame', 'screen-tiles', 'audio-interim'})
+# Shed at load level 2: translation and recording work (clients retry or re-request)
+SHED_SECOND = frozenset({'audio-chunk', 'translate-recording', 'save-recording', 'recording-chunk',
+                         'get-recordings'})
+# Always admitted - needed to clean up, and can't be retried by the client
+EXEMPT = frozenset({'connect', 'disconnect'})
+
+
+def payload_size(data: Any) -> int:
+    """Bytes of text and binary data in an event's argument (nested dicts/lists included)"""
+    size = 0
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (str, bytes, bytearray)):
+            size += len(item)
+        elif isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        else:
+            size += 8
+    return size
+
+
+class _Bucket:
+    __slots__ = ('tokens', 'updated')
+
+    def __init__(self, burst: float, now: float):
+        self.tokens = burst
+        self.updated = now
+
+
+class Admission:
+    """
+    Decides whether an incoming Socket.IO event is handled at all.
+
+    Each socket gets a token bucket per event (RATE_LIMITS: rate per second
+    and burst), so one client flooding video-frame or audio-chunk can't take
+    the relay or the translation backend from everyone else. Events bigger
+    than their PAYLOAD_LIMITS entry are rejected before any work is done.
+
+    When the node itself falls behind, low-priority events are shed before
+    anything else: a probe thread measures how late it wakes up (scheduling
+    lag - the GIL under threading, the event loop under gevent). Past
+    OVERLOAD_LAG_MS a share of frames and interim transcripts is dropped,
+    growing with the lag until all are at four times that, where
+    translations, recordings and new connections are refused too. Signaling
+    and room control always get through.
+
+    check() returns None to admit an event, or why it was rejected:
+    'overload', 'too_large' or 'rate_limited'.
+    """
+
+    def __init__(self, rate_limits: Dict = Config.RATE_LIMITS,
+                 payload_limits: Dict[str, int] = Config.PAYLOAD_LIMITS,
+                 overload_lag_ms: float = Config.OVERLOAD_LAG_MS,
+                 probe_interval: float = Config.OVERLOAD_PROBE_INTERVAL,
+                 max_connections: int = Config.MAX_CONNECTIONS,
+                 enabled: bool = Config.RATE_LIMITING):
+        self.rate_limits = {event: (float(rate), float(burst)) for event, (rate, burst) in rate_limits.items()}
+        self.payload_limits = payload_limits
+        self.overload_lag = overload_lag_ms / 1000.0
+        self.probe_interval = probe_interval
+        self.max_connections = max_connections
+        self.enabled = enabled
+        # sid -> event -> bucket
+        self._buckets: Dict[str, Dict[str, _Bucket]] = {}
+        self._lock = threading.Lock()
+        # Smoothed scheduling lag in seconds
+        self.lag = 0.0
+        self._probe: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def load_level(self) -> int:
+        """0 = normal, 1 = shedding frames, 2 = shedding translations and connections too"""
+        if self.lag >= 4 * self.overload_lag:
+            return 2
+        return 1 if self.lag >= self.overload_lag else 0
+
+    def connect(self, sid: str) -> Optional[str]:
+        """Admit a new connection, or say why it is refused"""
+        self._ensure_started()
+        if not self.enabled:
+            return None
+        with self._lock:
+            if self.max_connections and len(self._buckets) >= self.max_connections:
+                return 'too_many_connections'
+            if self.load_level() >= 2:
+                return 'overload'
+            self._buckets[sid] = {}
+        return None
+
+    def check(self, sid: str, event: str, data: Any) -> Optional[str]:
+        """Admit one event, or say why it is rejected"""
+        if not self.enabled or event in EXEMPT:
+            return None
+
+        if event in SHED_FIRST and self.lag >= self.overload_lag:
+            # 0% at OVERLOAD_LAG_MS up to 100% at level 2, so frames thin out instead of stopping
+            if random.random() < (self.lag - self.overload_lag) / (3 * self.overload_lag):
+                return 'overload'
+        elif event in SHED_SECOND and self.load_level() >= 2:
+            return 'overload'
+
+        max_bytes = self.payload_limits.get(event, self.payload_limits.get('*'))
+        if max_bytes and payload_size(data) > max_bytes:
+            return 'too_large'
+
+        rate, burst = self.rate_limits.get(event, self.rate_limits['*'])
+        now = time.monotonic()
+        with self._lock:
+            buckets = self._buckets.setdefault(sid, {})
+            bucket = buckets.get(event)
+            if bucket is None:
+                bucket = buckets[event] = _Bucket(burst, now)
+            bucket.tokens = min(burst, bucket.tokens + (now - bucket.updated) * rate)
+            bucket.updated = now
+            if bucket.tokens < 1:
+                return 'rate_limited'
+            bucket.tokens -= 1
+        return None
+
+    def forget(self, sid: str):
+        """Drop a socket's buckets (disconnected)"""
+        with self._lock:
+            self._buckets.pop(sid, None)
+
+    def _ensure_started(self):
+        if self._probe is not None:
+            return
+        with self._start_lock:
+            if self._probe is None:
+                self._probe = threading.Thread(target=self._run_probe, name='overload-probe', daemon=True)
+                self._probe.start()
+
+    def _run_probe(self):
+        previous_level = 0
+        while True:
+            start = time.monotonic()
+            time.sleep(self.probe_interval)
+            lag = max(0.0, time.monotonic() - start - self.probe_interval)
+            # Rise fast, recover over a few probes, so one late wake-up doesn't flap the level
+            self.lag = lag if lag > self.lag else self.lag * 0.7 + lag * 0.3
+
+            level = self.load_level()
+            if level != previous_level:
+                log.warning("load_level_changed", level=level, lag_ms=round(self.lag * 1000, 1))
+                previous_level = level
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            connections = len(self._buckets)
+        return {
+            'connections': connections,
+            'lagMs': round(self.lag * 1000, 1),
+            'loadLevel': self.load_level()
+        }
+
+
+admission = Admission()
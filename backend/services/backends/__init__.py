@@ -0,0 +1,23 @@
+from config import Config
+from .base import TranslationBackend
+from .mock import MockBackend
+from .phrasebook import PhrasebookBackend
+
+
+def create_backend(name: str = Config.TRANSLATION_BACKEND) -> TranslationBackend:
+    """Build the translation backend selected in Config"""
+    name = (name or 'gemini').lower()
+
+    if name == 'gemini':
+        from .gemini import GeminiBackend
+        return GeminiBackend()
+    if name == 'mock':
+        return MockBackend()
+    if name == 'phrasebook':
+        fallback = Config.PHRASEBOOK_FALLBACK.lower()
+        return PhrasebookBackend(fallback=None if fallback == 'none' else create_backend(fallback))
+
+    raise ValueError(f"Unknown translation backend: {name}")
+
+
+__all__ = ['TranslationBackend', 'MockBackend', 'PhrasebookBackend', 'create_backend']
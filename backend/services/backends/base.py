@@ -0,0 +1,29 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class TranslationBackend:
+    """
+    Interface every translation engine implements.
+
+    Backends raise on failure; TranslationService catches, logs and turns
+    errors into None results. Only translate is required - the batched and
+    streaming variants fall back to it by default.
+    """
+
+    name = 'base'
+
+    def translate(self, text: str, target_language: str) -> str:
+        """Translate one text into one language"""
+        raise NotImplementedError
+
+    def translate_many(self, text: str, target_languages: List[str]) -> Dict[str, str]:
+        """Translate one text into several languages"""
+        return {lang: self.translate(text, lang) for lang in target_languages}
+
+    def translate_batch(self, items: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """Translate independent (text, target_language) items, results in order"""
+        return [self.translate(text, lang) for text, lang in items]
+
+    def translate_stream(self, text: str, target_language: str) -> Iterator[str]:
+        """Yield the translation in pieces as they become available"""
+        yield self.translate(text, target_language)
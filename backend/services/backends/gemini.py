@@ -0,0 +1,150 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+import json
+from config import Config
+from .base import TranslationBackend
+
+
+class GeminiBackend(TranslationBackend):
+    """Translation through the Gemini API (google.generativeai)"""
+
+    name = 'gemini'
+
+    def __init__(self):
+        # Imported here so the mock/phrasebook backends work without the SDK installed
+        import google.generativeai as genai
+
+        # gRPC doesn't cooperate with gevent's patched sockets; REST does
+        transport = 'rest' if Config.ASYNC_MODE == 'gevent' else None
+        genai.configure(api_key=Config.GOOGLE_API_KEY, transport=transport)
+        self.model = genai.GenerativeModel(
+            model_name=Config.GEMINI_MODEL_NAME,
+            generation_config=Config.GENERATION_CONFIG
+        )
+
+    def translate(self, text: str, target_language: str) -> str:
+        prompt = self._build_translation_prompt(text, target_language)
+        generation_config = {
+            **Config.GENERATION_CONFIG,
+            "max_output_tokens": self._max_output_tokens(text),
+        }
+
+        response = self.model.generate_content(prompt, generation_config=generation_config)
+        return response.text.strip()
+
+    def translate_many(self, text: str, target_languages: List[str]) -> Dict[str, str]:
+        prompt = self._build_multi_translation_prompt(text, target_languages)
+        generation_config = {
+            **Config.GENERATION_CONFIG,
+            "max_output_tokens": min(Config.MAX_OUTPUT_TOKENS,
+                                     self._max_output_tokens(text) * len(target_languages)),
+            "response_mime_type": "application/json",
+        }
+
+        response = self.model.generate_content(prompt, generation_config=generation_config)
+        return self._parse_json_translations(response.text)
+
+    def translate_batch(self, items: List[Tuple[str, str]]) -> List[Optional[str]]:
+        prompt = self._build_batch_prompt(items)
+        generation_config = {
+            **Config.GENERATION_CONFIG,
+            "max_output_tokens": min(Config.MAX_OUTPUT_TOKENS,
+                                     sum(self._max_output_tokens(text) for text, _ in items)),
+            "response_mime_type": "application/json",
+        }
+
+        response = self.model.generate_content(prompt, generation_config=generation_config)
+        translations = self._parse_json_translations(response.text)
+        return [translations.get(str(i)) or None for i in range(1, len(items) + 1)]
+
+    def translate_stream(self, text: str, target_language: str) -> Iterator[str]:
+        prompt = self._build_translation_prompt(text, target_language)
+        generation_config = {
+            **Config.GENERATION_CONFIG,
+            "max_output_tokens": self._max_output_tokens(text),
+        }
+
+        response = self.model.generate_content(prompt, generation_config=generation_config, stream=True)
+        for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+    @staticmethod
+    def _max_output_tokens(text: str) -> int:
+        """
+        Output budget that grows with the input instead of a fixed cap
+        (~4 characters per token, and translations can run twice as long)
+        """
+        base = Config.GENERATION_CONFIG["max_output_tokens"]
+        return min(Config.MAX_OUTPUT_TOKENS, max(base, len(text) // 2))
+
+    @staticmethod
+    def _parse_json_translations(raw: str) -> Dict[str, str]:
+        """Parse the model's JSON object, tolerating a ```json fence around it"""
+        raw = raw.strip()
+        if raw.startswith('```'):
+            raw = raw.strip('`')
+            raw = raw[raw.find('{'):]
+        data = json.loads(raw)
+        if not isinstance(data, dict):
+            return {}
+        return {str(lang): str(value).strip() for lang, value in data.items() if value}
+
+    def _build_translation_prompt(self, text: str, target_language: str) -> str:
+        """
+        Build an optimized few-shot prompt for translation
+
+        The prompt uses examples to guide the model to:
+        - Return ONLY the translation
+        - Avoid explanations or notes
+        - Be concise and fast
+        """
+        return f"""Task: Translate to {target_language}.
+Rule: Return ONLY the translated text. No notes, no explanations.
+
+Examples:
+Input: Hello there
+Output: Hola
+Input: How are you doing?
+Output: ¿Cómo estás?
+Input: Good morning
+Output: Buenos días
+
+Input: {text}
+Output:"""
+
+    def _build_multi_translation_prompt(self, text: str, target_languages: list) -> str:
+        """
+        Build a prompt asking for every target language at once as a JSON object
+        keyed by the exact language names we pass in
+        """
+        languages = ", ".join(target_languages)
+        return f"""Task: Translate the input into each of these languages: {languages}.
+Rule: Return ONLY a JSON object mapping each language name to its translation. No notes, no explanations.
+
+Examples:
+Input: Good morning
+Output: {{"Spanish": "Buenos días", "French": "Bonjour"}}
+Input: How are you doing?
+Output: {{"German": "Wie geht es dir?", "Italian": "Come stai?"}}
+
+Input: {text}
+Output:"""
+
+    def _build_batch_prompt(self, items: List[Tuple[str, str]]) -> str:
+        """
+        Build a prompt for several independent translations, each with its own
+        target language, answered as a JSON object keyed by item number
+        """
+        inputs = json.dumps([
+            {"id": str(i), "language": language, "text": text}
+            for i, (text, language) in enumerate(items, start=1)
+        ], ensure_ascii=False)
+        return f"""Task: Translate each input text into the language given for it.
+Rule: Return ONLY a JSON object mapping each input id to its translation. No notes, no explanations.
+
+Examples:
+Inputs: [{{"id": "1", "language": "Spanish", "text": "Good morning"}}, {{"id": "2", "language": "French", "text": "Thank you"}}]
+Output: {{"1": "Buenos días", "2": "Merci"}}
+
+Inputs: {inputs}
+Output:"""
@@ -0,0 +1,59 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+import random
+import threading
+import time
+from config import Config
+from .base import TranslationBackend
+
+
+class MockBackend(TranslationBackend):
+    """
+    Deterministic offline backend for load tests and local development.
+
+    Every translation is "[<language>] <text>". Each call (single, batched or
+    streamed) costs one simulated round trip of latency_ms, and error_rate of
+    calls fail with a RuntimeError, drawn from a seeded RNG so runs repeat.
+    """
+
+    name = 'mock'
+
+    def __init__(self, latency_ms: float = Config.MOCK_TRANSLATION_LATENCY_MS,
+                 error_rate: float = Config.MOCK_TRANSLATION_ERROR_RATE,
+                 seed: int = 0):
+        self.latency = latency_ms / 1000.0
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _round_trip(self):
+        with self._lock:
+            self.calls += 1
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise RuntimeError("Injected mock translation failure")
+
+    @staticmethod
+    def _render(text: str, target_language: str) -> str:
+        return f"[{target_language}] {text}"
+
+    def translate(self, text: str, target_language: str) -> str:
+        self._round_trip()
+        return self._render(text, target_language)
+
+    def translate_many(self, text: str, target_languages: List[str]) -> Dict[str, str]:
+        self._round_trip()
+        return {lang: self._render(text, lang) for lang in target_languages}
+
+    def translate_batch(self, items: List[Tuple[str, str]]) -> List[Optional[str]]:
+        self._round_trip()
+        return [self._render(text, lang) for text, lang in items]
+
+    def translate_stream(self, text: str, target_language: str) -> Iterator[str]:
+        self._round_trip()
+        words = self._render(text, target_language).split(' ')
+        for i, word in enumerate(words):
+            yield word if i == 0 else ' ' + word
@@ -0,0 +1,131 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+import json
+import string
+from config import Config
+from .base import TranslationBackend
+
+# English phrase -> {language name: translation}
+PHRASES = {
+    "hello": {
+        "Spanish": "Hola", "French": "Bonjour", "German": "Hallo", "Hindi": "नमस्ते",
+        "Chinese": "你好", "Japanese": "こんにちは", "Korean": "안녕하세요", "Arabic": "مرحبا",
+        "Portuguese": "Olá", "Russian": "Привет", "Italian": "Ciao", "Turkish": "Merhaba",
+    },
+    "thank you": {
+        "Spanish": "Gracias", "French": "Merci", "German": "Danke", "Hindi": "धन्यवाद",
+        "Chinese": "谢谢", "Japanese": "ありがとう", "Korean": "감사합니다", "Arabic": "شكرا",
+        "Portuguese": "Obrigado", "Russian": "Спасибо", "Italian": "Grazie", "Turkish": "Teşekkürler",
+    },
+    "good morning": {
+        "Spanish": "Buenos días", "French": "Bonjour", "German": "Guten Morgen", "Hindi": "सुप्रभात",
+        "Chinese": "早上好", "Japanese": "おはようございます", "Korean": "좋은 아침입니다", "Arabic": "صباح الخير",
+        "Portuguese": "Bom dia", "Russian": "Доброе утро", "Italian": "Buongiorno", "Turkish": "Günaydın",
+    },
+    "goodbye": {
+        "Spanish": "Adiós", "French": "Au revoir", "German": "Auf Wiedersehen", "Hindi": "अलविदा",
+        "Chinese": "再见", "Japanese": "さようなら", "Korean": "안녕히 가세요", "Arabic": "مع السلامة",
+        "Portuguese": "Adeus", "Russian": "До свидания", "Italian": "Arrivederci", "Turkish": "Hoşça kal",
+    },
+    "yes": {
+        "Spanish": "Sí", "French": "Oui", "German": "Ja", "Hindi": "हाँ",
+        "Chinese": "是", "Japanese": "はい", "Korean": "네", "Arabic": "نعم",
+        "Portuguese": "Sim", "Russian": "Да", "Italian": "Sì", "Turkish": "Evet",
+    },
+    "no": {
+        "Spanish": "No", "French": "Non", "German": "Nein", "Hindi": "नहीं",
+        "Chinese": "不", "Japanese": "いいえ", "Korean": "아니요", "Arabic": "لا",
+        "Portuguese": "Não", "Russian": "Нет", "Italian": "No", "Turkish": "Hayır",
+    },
+    "how are you": {
+        "Spanish": "¿Cómo estás?", "French": "Comment ça va ?", "German": "Wie geht es dir?",
+        "Hindi": "आप कैसे हैं?", "Chinese": "你好吗？", "Japanese": "お元気ですか？",
+        "Korean": "어떻게 지내세요?", "Arabic": "كيف حالك؟", "Portuguese": "Como você está?",
+        "Russian": "Как дела?", "Italian": "Come stai?", "Turkish": "Nasılsın?",
+    },
+    "can you hear me": {
+        "Spanish": "¿Me escuchas?", "French": "Tu m'entends ?", "German": "Hörst du mich?",
+        "Hindi": "क्या आप मुझे सुन सकते हैं?", "Chinese": "你能听到我吗？", "Japanese": "聞こえますか？",
+        "Korean": "제 말 들리세요?", "Arabic": "هل تسمعني؟", "Portuguese": "Você consegue me ouvir?",
+        "Russian": "Ты меня слышишь?", "Italian": "Mi senti?", "Turkish": "Beni duyabiliyor musun?",
+    },
+}
+
+
+class PhrasebookBackend(TranslationBackend):
+    """
+    Serves common phrases from a local phrasebook with no network round trip.
+
+    Anything not in the phrasebook goes to the fallback backend; without a
+    fallback, misses raise LookupError. Extra phrases can be loaded from a
+    JSON file with the same shape as PHRASES (PHRASEBOOK_PATH).
+    """
+
+    name = 'phrasebook'
+
+    def __init__(self, fallback: Optional[TranslationBackend] = None,
+                 path: Optional[str] = Config.PHRASEBOOK_PATH):
+        self.fallback = fallback
+        self.phrases: Dict[str, Dict[str, str]] = {
+            self._normalize(phrase): dict(translations) for phrase, translations in PHRASES.items()
+        }
+        if path:
+            with open(path, encoding='utf-8') as f:
+                for phrase, translations in json.load(f).items():
+                    self.phrases.setdefault(self._normalize(phrase), {}).update(translations)
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        text = text.translate(str.maketrans('', '', string.punctuation + '¿¡'))
+        return ' '.join(text.split()).casefold()
+
+    def lookup(self, text: str, target_language: str) -> Optional[str]:
+        translated_text = self.phrases.get(self._normalize(text), {}).get(target_language)
+        if translated_text is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return translated_text
+
+    def _require_fallback(self, text: str) -> TranslationBackend:
+        if self.fallback is None:
+            raise LookupError(f"Phrase not in phrasebook: {text!r}")
+        return self.fallback
+
+    def translate(self, text: str, target_language: str) -> str:
+        translated_text = self.lookup(text, target_language)
+        if translated_text is not None:
+            return translated_text
+        return self._require_fallback(text).translate(text, target_language)
+
+    def translate_many(self, text: str, target_languages: List[str]) -> Dict[str, str]:
+        results, missing = {}, []
+        for lang in target_languages:
+            translated_text = self.lookup(text, lang)
+            if translated_text is None:
+                missing.append(lang)
+            else:
+                results[lang] = translated_text
+
+        if missing:
+            results.update(self._require_fallback(text).translate_many(text, missing))
+        return results
+
+    def translate_batch(self, items: List[Tuple[str, str]]) -> List[Optional[str]]:
+        results = [self.lookup(text, lang) for text, lang in items]
+        missing = [i for i, translated_text in enumerate(results) if translated_text is None]
+
+        if missing and self.fallback is not None:
+            fallback_results = self.fallback.translate_batch([items[i] for i in missing])
+            for i, translated_text in zip(missing, fallback_results):
+                results[i] = translated_text
+        return results
+
+    def translate_stream(self, text: str, target_language: str) -> Iterator[str]:
+        translated_text = self.lookup(text, target_language)
+        if translated_text is not None:
+            yield translated_text
+            return
+        yield from self._require_fallback(text).translate_stream(text, target_language)
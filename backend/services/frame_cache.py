@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+from config import Config
+import threading
+import time
+
+
+class LastFrameCache:
+    """
+    Newest video frame of every streaming user, per room.
+
+    A user joining a room gets these with joined-room, so peers' tiles render
+    immediately instead of staying black until each peer's next frame. The
+    cached payload is the same object the relay sends (nothing is copied).
+
+    Memory is capped: frames over FRAME_CACHE_MAX_FRAME_BYTES aren't cached,
+    and once the total passes FRAME_CACHE_MAX_BYTES the least recently updated
+    entries are evicted. Entries go when the user leaves, and frames older
+    than FRAME_CACHE_TTL are not sent (the stream has probably stopped).
+    """
+
+    def __init__(self, max_bytes: int = Config.FRAME_CACHE_MAX_BYTES,
+                 max_frame_bytes: int = Config.FRAME_CACHE_MAX_FRAME_BYTES,
+                 ttl: float = Config.FRAME_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.max_frame_bytes = max_frame_bytes
+        self.ttl = ttl
+        # room_id -> user_id -> (payload, size, stored_at), so a join only looks at its own room
+        self._rooms: Dict[str, Dict[str, Tuple[Dict, int, float]]] = {}
+        # (room_id, user_id) in least recently updated order, for eviction
+        self._order: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def put(self, room_id: str, user_id: str, payload: Dict):
+        """Remember the newest frame a user sent to a room"""
+        frame = payload.get('frame')
+        size = len(frame) if frame is not None else 0
+        key = (room_id, user_id)
+
+        with self._lock:
+            self._pop(room_id, user_id)
+
+            if not size or size > self.max_frame_bytes:
+                return
+
+            self._rooms.setdefault(room_id, {})[user_id] = (payload, size, time.monotonic())
+            self._order[key] = None
+            self._bytes += size
+
+            while self._bytes > self.max_bytes and self._order:
+                (evicted_room, evicted_user), _ = self._order.popitem(last=False)
+                self._pop(evicted_room, evicted_user)
+                self.evictions += 1
+
+    def get_room(self, room_id: str, exclude_user: str = None) -> List[Dict]:
+        """Fresh cached frames for a room, except exclude_user's own"""
+        cutoff = time.monotonic() - self.ttl
+        with self._lock:
+            return [payload for uid, (payload, _, stored_at) in self._rooms.get(room_id, {}).items()
+                    if uid != exclude_user and stored_at >= cutoff]
+
+    def remove(self, room_id: str, user_id: str):
+        """Forget a user's frame (left the room or stopped streaming)"""
+        with self._lock:
+            self._pop(room_id, user_id)
+
+    def _pop(self, room_id: str, user_id: str):
+        # Caller holds the lock
+        frames = self._rooms.get(room_id)
+        previous = frames.pop(user_id, None) if frames else None
+        if previous is None:
+            return
+        if not frames:
+            del self._rooms[room_id]
+        self._order.pop((room_id, user_id), None)
+        self._bytes -= previous[1]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'frames': len(self._order),
+                'bytes': self._bytes,
+                'maxBytes': self.max_bytes,
+                'evictions': self.evictions
+            }
+
+
+frame_cache = LastFrameCache()
@@ -0,0 +1,205 @@
+from typing import Dict, List, Tuple, Any, Optional
+from config import Config
+from monitoring.metrics import frames_dropped_total, frames_relayed_total
+import threading
+import time
+
+
+class _Subscriber:
+    """Outbound frame state for a single receiving socket"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.last_send = 0.0
+        # (event, source user_id) -> newest payload waiting to be sent
+        self.pending: Dict[Tuple[str, str], Dict] = {}
+        self.sent = 0
+        self.dropped = 0
+        # Smoothed send -> ack time in seconds (delivery lag to this receiver)
+        self.ack_latency = 0.0
+
+
+class FrameRelay:
+    """
+    Builds and delivers the payloads relayed for video-frame and screen-frame events.
+
+    Clients either send a base64 JPEG data URL (legacy) or raw JPEG bytes as a
+    Socket.IO binary attachment together with a small header (userId, seq, ts).
+    Binary frames are forwarded as the very same bytes object, so the server
+    never decodes, re-encodes or copies the image data.
+
+    Each receiver acknowledges the frames it gets. Once a receiver has
+    RELAY_MAX_IN_FLIGHT unacknowledged frames, only the newest frame per source
+    user is kept for it and older ones are dropped, so a slow link never grows
+    an unbounded queue on the server.
+    """
+
+    def __init__(self, max_in_flight: int = Config.RELAY_MAX_IN_FLIGHT,
+                 ack_timeout: float = Config.RELAY_ACK_TIMEOUT):
+        self.max_in_flight = max_in_flight
+        self.ack_timeout = ack_timeout
+        self._subscribers: Dict[str, _Subscriber] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_binary(frame: Any) -> bool:
+        """Check whether a frame arrived as a binary attachment"""
+        return isinstance(frame, (bytes, bytearray))
+
+    def build_payload(self, user_id: str, data: Dict) -> Dict:
+        """Build the outbound frame payload for a single incoming frame"""
+        frame = data.get('frame')
+        payload = {
+            'userId': user_id,
+            'frame': frame
+        }
+
+        # Binary frames carry a fixed header for ordering and latency checks
+        if self.is_binary(frame) or 'tiles' in data:
+            payload['seq'] = data.get('seq', 0)
+            payload['ts'] = data.get('ts', 0)
+
+        # Screen-share deltas: only the tiles that changed since the last frame
+        if 'tiles' in data:
+            payload['tiles'] = data['tiles']
+            payload['tileSize'] = data.get('tileSize')
+            payload['width'] = data.get('width')
+            payload['height'] = data.get('height')
+
+        return payload
+
+    def relay(self, socketio, event: str, user_id: str, data: Dict, receiver_sids: List[str]) -> Dict:
+        """Send a frame to every receiver, respecting each receiver's backpressure - returns the payload"""
+        payload = self.build_payload(user_id, data)
+        for sid in receiver_sids:
+            outgoing = self._offer(sid, event, user_id, payload)
+            if outgoing is not None:
+                self._send(socketio, sid, *outgoing)
+        return payload
+
+    def _offer(self, sid: str, event: str, user_id: str,
+               payload: Dict) -> Optional[Tuple[str, Dict, float]]:
+        """Queue a frame for a receiver - returns (event, payload, send time) to send now, if any"""
+        now = time.monotonic()
+        with self._lock:
+            subscriber = self._subscribers.setdefault(sid, _Subscriber())
+
+            # Acks went missing (lost packets or a client that never acks)
+            if subscriber.in_flight and now - subscriber.last_send > self.ack_timeout:
+                subscriber.in_flight = 0
+
+            if subscriber.in_flight >= self.max_in_flight:
+                key = (event, user_id)
+                if 'tiles' in payload:
+                    # Deltas can't be dropped - fold them into the waiting one instead
+                    waiting = subscriber.pending.get(key)
+                    if waiting is not None:
+                        payload = merge_tiles(waiting, payload)
+                        subscriber.dropped += 1
+                        frames_dropped_total.inc(event)
+                elif key in subscriber.pending:
+                    subscriber.dropped += 1
+                    frames_dropped_total.inc(event)
+
+                # A keyframe makes any waiting deltas from the same sharer obsolete
+                if event == 'screen-frame':
+                    subscriber.pending.pop(('screen-tiles', user_id), None)
+                subscriber.pending[key] = payload
+                return None
+
+            # Whatever is still queued for this stream (e.g. left over from an ack timeout)
+            # is older than this frame - sent after it, the stream would go backwards
+            key = (event, user_id)
+            waiting = subscriber.pending.pop(key, None)
+            if waiting is not None:
+                if 'tiles' in payload:
+                    payload = merge_tiles(waiting, payload)
+                else:
+                    subscriber.dropped += 1
+                    frames_dropped_total.inc(event)
+            if event == 'screen-frame':
+                subscriber.pending.pop(('screen-tiles', user_id), None)
+            elif event == 'screen-tiles' and ('screen-frame', user_id) in subscriber.pending:
+                # These tiles are drawn on the queued keyframe: send that first, the tiles next
+                subscriber.pending[key] = payload
+                event, payload = 'screen-frame', subscriber.pending.pop(('screen-frame', user_id))
+
+            subscriber.in_flight += 1
+            subscriber.sent += 1
+            subscriber.last_send = now
+            return event, payload, now
+
+    def _send(self, socketio, sid: str, event: str, payload: Dict, sent_at: float):
+        frames_relayed_total.inc(event)
+        socketio.emit(event, payload, to=sid,
+                      callback=lambda *args: self._on_ack(socketio, sid, sent_at))
+
+    def _on_ack(self, socketio, sid: str, sent_at: float):
+        """Receiver confirmed a frame - release its slot and send the next queued one"""
+        with self._lock:
+            subscriber = self._subscribers.get(sid)
+            if not subscriber:
+                return
+
+            latency = time.monotonic() - sent_at
+            subscriber.ack_latency = latency if not subscriber.ack_latency else \
+                0.8 * subscriber.ack_latency + 0.2 * latency
+            subscriber.in_flight = max(0, subscriber.in_flight - 1)
+            if not subscriber.pending:
+                return
+
+            key = next(iter(subscriber.pending))
+            payload = subscriber.pending.pop(key)
+            subscriber.in_flight += 1
+            subscriber.sent += 1
+            subscriber.last_send = sent_at = time.monotonic()
+
+        self._send(socketio, sid, key[0], payload, sent_at)
+
+    def discard_source(self, user_id: str, event: Optional[str] = None):
+        """Drop queued frames from a user (e.g. after they stop sharing or leave)"""
+        with self._lock:
+            for subscriber in self._subscribers.values():
+                for key in list(subscriber.pending):
+                    if key[1] == user_id and (event is None or key[0] == event):
+                        del subscriber.pending[key]
+
+    def get_delivery_lag(self, sids: List[str]) -> float:
+        """Worst smoothed ack latency (seconds) among the given receivers"""
+        with self._lock:
+            return max((self._subscribers[sid].ack_latency for sid in sids
+                        if sid in self._subscribers), default=0.0)
+
+    def remove_subscriber(self, sid: str):
+        """Forget all state for a disconnected receiver"""
+        with self._lock:
+            self._subscribers.pop(sid, None)
+
+    def get_stats(self) -> Dict:
+        """Per-receiver delivery and drop counters"""
+        with self._lock:
+            receivers = {
+                sid: {
+                    'sent': sub.sent,
+                    'dropped': sub.dropped,
+                    'inFlight': sub.in_flight,
+                    'pending': len(sub.pending),
+                    'ackLatencyMs': round(sub.ack_latency * 1000, 1)
+                } for sid, sub in self._subscribers.items()
+            }
+
+        return {
+            'receivers': receivers,
+            'totalSent': sum(r['sent'] for r in receivers.values()),
+            'totalDropped': sum(r['dropped'] for r in receivers.values())
+        }
+
+
+def merge_tiles(older: Dict, newer: Dict) -> Dict:
+    """Combine two screen-tiles payloads, newer tiles replacing older ones at the same position"""
+    tiles = {(tile['x'], tile['y']): tile for tile in older['tiles']}
+    tiles.update({(tile['x'], tile['y']): tile for tile in newer['tiles']})
+    return dict(newer, tiles=list(tiles.values()))
+
+
+frame_relay = FrameRelay()
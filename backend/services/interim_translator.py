@@ -0,0 +1,167 @@
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from config import Config
+from monitoring import metrics
+import re
+import threading
+
+
+def _normalize(text: str) -> str:
+    """Interim and final transcripts differ in case, spacing and punctuation"""
+    return ' '.join(re.sub(r'[^\w\s]', ' ', text).split()).casefold()
+
+
+class _Speaker:
+    def __init__(self):
+        self.text = ''          # newest interim transcript
+        self.speculated = ''    # text of the translations in flight / done
+        self.languages: Tuple[str, ...] = ()
+        self.on_result: Optional[Callable] = None
+        self.timer: Optional[threading.Timer] = None
+        self.generation = 0
+        self.futures: Dict[str, Future] = {}
+
+
+class InterimTranslator:
+    """
+    Speculative translation of interim (not yet final) speech transcripts.
+
+    audio-interim updates arrive several times a second while someone
+    speaks. They are debounced: at most one speculation per speaker every
+    INTERIM_DEBOUNCE_MS, with the newest transcript at that point, so the
+    last one runs shortly after the speaker pauses - usually on the text the
+    final transcript will have. Transcripts shorter than INTERIM_MIN_CHARS
+    aren't worth a call. A newer speculation supersedes the previous one -
+    queued translations are cancelled and late results are dropped.
+
+    When the final transcript arrives, take() hands back the speculative
+    translations if they were made from the same text, so the final result
+    goes out without another backend call (or waits on the one in flight).
+    """
+
+    def __init__(self, pipeline, debounce_ms: float = Config.INTERIM_DEBOUNCE_MS,
+                 min_chars: int = Config.INTERIM_MIN_CHARS):
+        self.pipeline = pipeline
+        self.debounce = debounce_ms / 1000
+        self.min_chars = min_chars
+        # (room_id, user_id) -> speaker state
+        self._speakers: Dict[Tuple[str, str], _Speaker] = {}
+        self._lock = threading.Lock()
+
+    def update(self, room_id: str, user_id: str, text: str, languages: Iterable[str],
+               on_result: Callable[[str, str, str], None]):
+        """
+        New interim transcript from a speaker. on_result(text, language,
+        translated) is called for each speculative translation still current
+        when it completes.
+        """
+        key = (room_id, user_id)
+        with self._lock:
+            speaker = self._speakers.setdefault(key, _Speaker())
+            speaker.text = text
+            speaker.languages = tuple(dict.fromkeys(languages))
+            speaker.on_result = on_result
+            if speaker.timer is None:
+                speaker.timer = threading.Timer(self.debounce, self._speculate, args=(key,))
+                speaker.timer.daemon = True
+                speaker.timer.start()
+
+    def _speculate(self, key: Tuple[str, str]):
+        with self._lock:
+            speaker = self._speakers.get(key)
+            if speaker is None:
+                return
+            speaker.timer = None
+            text = speaker.text
+            if len(text) < self.min_chars or _normalize(text) == _normalize(speaker.speculated):
+                return
+
+            superseded = speaker.futures
+            speaker.generation += 1
+            speaker.speculated = text
+            speaker.futures = {}
+            generation = speaker.generation
+            languages, on_result = speaker.languages, speaker.on_result
+
+        self._cancel(superseded)
+
+        futures = {}
+        for language in languages:
+            future = self.pipeline.submit(text, language)
+            if future is None:
+                break
+            metrics.interim_translations_total.inc('started')
+            futures[language] = future
+
+        with self._lock:
+            if self._speakers.get(key) is not speaker or speaker.generation != generation:
+                # Final transcript or a newer speculation won the race
+                current = False
+            else:
+                speaker.futures = futures
+                current = True
+        if not current:
+            self._cancel(futures)
+            return
+
+        for language, future in futures.items():
+            future.add_done_callback(
+                lambda f, language=language: self._done(key, speaker, generation, text, language, f, on_result))
+
+    def _done(self, key, speaker: _Speaker, generation: int, text: str, language: str,
+              future: Future, on_result: Callable):
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self._lock:
+            current = self._speakers.get(key) is speaker and speaker.generation == generation
+        translated = future.result()
+        if current and translated:
+            on_result(text, language, translated)
+
+    def take(self, room_id: str, user_id: str, final_text: str) -> Dict[str, Future]:
+        """
+        The final transcript arrived: return the speculative translations
+        (language -> future) if they were made from the same text, and
+        cancel everything else
+        """
+        with self._lock:
+            speaker = self._speakers.pop((room_id, user_id), None)
+        if speaker is None:
+            return {}
+        if speaker.timer is not None:
+            speaker.timer.cancel()
+
+        usable = {language: future for language, future in speaker.futures.items()
+                  if not future.cancelled()}
+        if usable and _normalize(speaker.speculated) == _normalize(final_text):
+            metrics.interim_translations_total.inc('reused', amount=len(usable))
+            return usable
+
+        self._cancel(speaker.futures)
+        return {}
+
+    def discard(self, room_id: str, user_id: str):
+        """Speaker left - drop pending speculation"""
+        with self._lock:
+            speaker = self._speakers.pop((room_id, user_id), None)
+        if speaker is not None:
+            if speaker.timer is not None:
+                speaker.timer.cancel()
+            self._cancel(speaker.futures)
+
+    @staticmethod
+    def _cancel(futures: Dict[str, Future]):
+        for future in futures.values():
+            if future.done():
+                continue
+            # Only queued work can be cancelled; a running call's result is ignored
+            outcome = 'cancelled' if future.cancel() else 'superseded'
+            metrics.interim_translations_total.inc(outcome)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'speakers': len(self._speakers),
+                'inFlight': sum(1 for speaker in self._speakers.values()
+                                for future in speaker.futures.values() if not future.done())
+            }
@@ -0,0 +1,59 @@
+from typing import Dict, Iterable, List, Set
+import threading
+
+
+class PeerLinks:
+    """
+    Direct WebRTC connections between peers in rooms with media mode 'p2p'.
+
+    Each sender reports (p2p-status) whether its peer connection to another
+    user is up. While it is, that user gets the sender's camera and screen
+    over the connection, so the relay leaves them out of the sender's frames;
+    when it drops (or the peer reconnects with a new socket) the relay picks
+    them up again. Links are kept by socket id, on the node the sender is
+    connected to - the same node that receives its frames.
+    """
+
+    def __init__(self):
+        # sender sid -> receiver sids reached over a direct connection
+        self._links: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def set(self, sid: str, peer_sid: str, connected: bool):
+        """Record that sid's direct connection to peer_sid came up or went down"""
+        with self._lock:
+            if connected:
+                self._links.setdefault(sid, set()).add(peer_sid)
+                return
+            peers = self._links.get(sid)
+            if peers is not None:
+                peers.discard(peer_sid)
+                if not peers:
+                    del self._links[sid]
+
+    def relay_sids(self, sid: str, receiver_sids: Iterable[str]) -> List[str]:
+        """The receivers that still need sid's frames through the server"""
+        with self._lock:
+            direct = self._links.get(sid)
+            if not direct:
+                return list(receiver_sids)
+            return [receiver for receiver in receiver_sids if receiver not in direct]
+
+    def remove(self, sid: str):
+        """Forget a socket's links, both ways (left the room or disconnected)"""
+        with self._lock:
+            self._links.pop(sid, None)
+            for sender in [sender for sender, peers in self._links.items() if sid in peers]:
+                self._links[sender].discard(sid)
+                if not self._links[sender]:
+                    del self._links[sender]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'senders': len(self._links),
+                'links': sum(len(peers) for peers in self._links.values())
+            }
+
+
+peer_links = PeerLinks()
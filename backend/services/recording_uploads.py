@@ -0,0 +1,142 @@
+from typing import Dict, Optional, Tuple
+from config import Config
+from database import blob_store
+import hashlib
+import os
+import threading
+import time
+
+
+class UploadError(Exception):
+    """Raised when a chunk or commit is rejected (message is sent to the client)"""
+
+
+class _Upload:
+    def __init__(self, upload_id: str, user_id: str, path: str):
+        self.upload_id = upload_id
+        self.user_id = user_id
+        self.path = path
+        self.received = 0
+        # Hashed as chunks arrive so commit doesn't re-read the file
+        self.hasher = hashlib.sha256()
+        self.last_activity = time.monotonic()
+        self.lock = threading.Lock()
+
+
+class RecordingUploads:
+    """
+    Chunked, resumable recording uploads.
+
+    Chunks are appended to a staging file in the blob store as they arrive,
+    so the server never holds more than one chunk of a recording in memory.
+    Uploads are keyed by (user_id, upload_id) rather than socket id, so a
+    client that reconnects can carry on from the offset the server reports.
+    Chunks must arrive in order - a chunk at the wrong offset is ignored and
+    the current offset is returned so the client can rewind. The handlers
+    only let the socket that joined as user_id touch that user's uploads.
+
+    Uploads idle for RECORDING_UPLOAD_TTL are dropped, with their staging
+    files, on every append and commit and when a socket disconnects.
+    """
+
+    def __init__(self, max_bytes: int = Config.RECORDING_MAX_BYTES,
+                 max_chunk_bytes: int = Config.RECORDING_CHUNK_MAX_BYTES,
+                 max_per_user: int = Config.RECORDING_MAX_UPLOADS_PER_USER,
+                 ttl: float = Config.RECORDING_UPLOAD_TTL):
+        self.max_bytes = max_bytes
+        self.max_chunk_bytes = max_chunk_bytes
+        self.max_per_user = max_per_user
+        self.ttl = ttl
+        self._uploads: Dict[Tuple[str, str], _Upload] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, user_id: str, upload_id: str) -> _Upload:
+        key = (user_id, upload_id)
+        with self._lock:
+            upload = self._uploads.get(key)
+            if upload is not None:
+                return upload
+
+            active = sum(1 for uid, _ in self._uploads if uid == user_id)
+            if active >= self.max_per_user:
+                raise UploadError('Too many uploads in progress')
+
+            path = os.path.join(blob_store.staging_dir(), hashlib.sha256(
+                f"{user_id}:{upload_id}".encode()).hexdigest())
+            open(path, 'wb').close()
+            upload = _Upload(upload_id, user_id, path)
+            self._uploads[key] = upload
+            return upload
+
+    def append(self, user_id: str, upload_id: str, offset: int, chunk: bytes) -> int:
+        """Append a chunk at offset - returns the number of bytes received so far"""
+        if not user_id or not upload_id:
+            raise UploadError('Missing upload id')
+        if len(chunk) > self.max_chunk_bytes:
+            raise UploadError('Chunk too large')
+
+        self.expire()
+        upload = self._get_or_create(user_id, upload_id)
+
+        with upload.lock:
+            upload.last_activity = time.monotonic()
+            # Duplicate or out-of-order chunk (e.g. resent after a reconnect)
+            if offset != upload.received or not chunk:
+                return upload.received
+
+            if upload.received + len(chunk) > self.max_bytes:
+                self.discard(user_id, upload_id)
+                raise UploadError('Recording too large')
+
+            with open(upload.path, 'ab') as f:
+                f.write(chunk)
+            upload.hasher.update(chunk)
+            upload.received += len(chunk)
+            return upload.received
+
+    def status(self, user_id: str, upload_id: str) -> int:
+        """Bytes received so far for an upload (0 if unknown)"""
+        upload = self._uploads.get((user_id, upload_id))
+        return upload.received if upload else 0
+
+    def commit(self, user_id: str, upload_id: str, size: Optional[int] = None) -> Tuple[str, int]:
+        """Move a finished upload into the blob store - returns (audio_hash, audio_size)"""
+        self.expire()
+        with self._lock:
+            upload = self._uploads.get((user_id, upload_id))
+        if upload is None:
+            raise UploadError('Unknown upload')
+
+        with upload.lock:
+            if upload.received == 0:
+                raise UploadError('No audio data')
+            if size is not None and size != upload.received:
+                raise UploadError(f'Upload incomplete: {upload.received} of {size} bytes')
+
+            with self._lock:
+                self._uploads.pop((user_id, upload_id), None)
+            return blob_store.adopt(upload.path, upload.hasher.hexdigest()), upload.received
+
+    def discard(self, user_id: str, upload_id: str):
+        with self._lock:
+            upload = self._uploads.pop((user_id, upload_id), None)
+        if upload is not None and os.path.exists(upload.path):
+            os.remove(upload.path)
+
+    def expire(self):
+        """Drop uploads nobody has touched for RECORDING_UPLOAD_TTL seconds"""
+        cutoff = time.monotonic() - self.ttl
+        with self._lock:
+            stale = [key for key, upload in self._uploads.items() if upload.last_activity < cutoff]
+        for user_id, upload_id in stale:
+            self.discard(user_id, upload_id)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'active': len(self._uploads),
+                'bytesPending': sum(upload.received for upload in self._uploads.values())
+            }
+
+
+recording_uploads = RecordingUploads()
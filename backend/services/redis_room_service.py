@@ -0,0 +1,343 @@
+from typing import Dict, List, Optional, Tuple
+from config import Config
+from monitoring.log import get_logger
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+
+log = get_logger(__name__)
+
+
+class RedisRoomService:
+    """
+    Room state kept in Redis so several worker processes or nodes can serve
+    the same room. Same interface as the in-memory RoomService.
+
+    Keys:
+        <prefix>:room:<room_id>  hash   user_id -> JSON user data
+        <prefix>:sid:<sid>       string JSON [room_id, user_id, node_id]
+        <prefix>:user:<user_id>  string room_id
+        <prefix>:media:<room_id> string media mode, set by the first user to join
+        <prefix>:stats:rooms     int    non-empty rooms  } kept by join/leave for get_stats
+        <prefix>:stats:users     int    users in rooms   }
+        <prefix>:nodes           set    ids of nodes that have had users
+        <prefix>:node:<node_id>  string heartbeat, expires after REDIS_NODE_TTL
+        <prefix>:node-sids:<node_id> set socket ids connected to that node
+
+    Membership changes use WATCH/MULTI so the user limit holds even when two
+    nodes admit users to the same room at the same time.
+
+    get_peer_sids runs for every relayed frame, so each node keeps a room's
+    socket ids for REDIS_PEER_CACHE_TTL seconds. Joins and leaves through
+    this node drop the entry at once; ones on other nodes show up when it
+    expires.
+
+    Sockets only leave cleanly if their node is alive to see the disconnect.
+    Each node refreshes its heartbeat key every REDIS_NODE_TTL / 3 seconds
+    and, on the same tick, removes the users of any node whose heartbeat has
+    expired, so a crashed node's users don't hold room slots forever.
+    """
+
+    def __init__(self, url: str = Config.REDIS_URL, client=None,
+                 prefix: str = Config.REDIS_KEY_PREFIX,
+                 peer_cache_ttl: float = Config.REDIS_PEER_CACHE_TTL,
+                 node_ttl: int = Config.REDIS_NODE_TTL):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("ROOM_STORE=redis requires the 'redis' package") from e
+            client = redis.Redis.from_url(url, decode_responses=True)
+
+        self.client = client
+        self.prefix = prefix
+        # Last flag value this node wrote, so per-frame status updates
+        # don't turn into a Redis round trip for every video frame
+        self._flags: Dict[Tuple[str, str, str], bool] = {}
+        self._flags_lock = threading.Lock()
+        # room_id -> (expires_at, user_id -> sid)
+        self.peer_cache_ttl = peer_cache_ttl
+        self._peers: Dict[str, Tuple[float, Dict[str, str]]] = {}
+        self._peers_lock = threading.Lock()
+        self.node_ttl = node_ttl
+        # Set when the first user joins through this process (after any fork)
+        self.node_id: Optional[str] = None
+        self._heartbeat: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def _room_key(self, room_id: str) -> str:
+        return f"{self.prefix}:room:{room_id}"
+
+    def _sid_key(self, sid: str) -> str:
+        return f"{self.prefix}:sid:{sid}"
+
+    def _user_key(self, user_id: str) -> str:
+        return f"{self.prefix}:user:{user_id}"
+
+    def _media_key(self, room_id: str) -> str:
+        return f"{self.prefix}:media:{room_id}"
+
+    def _stats_key(self, name: str) -> str:
+        return f"{self.prefix}:stats:{name}"
+
+    def _node_key(self, node_id: str) -> str:
+        return f"{self.prefix}:node:{node_id}"
+
+    def _node_sids_key(self, node_id: str) -> str:
+        return f"{self.prefix}:node-sids:{node_id}"
+
+    def _transaction(self, fn, *watch_keys):
+        """Run fn(pipe) under WATCH, retrying if another client changed the keys"""
+        from redis.exceptions import WatchError
+
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(*watch_keys)
+                    return fn(pipe)
+                except WatchError:
+                    continue
+
+    def _forget_flags(self, room_id: str, user_id: str):
+        with self._flags_lock:
+            for field in ('stream_active', 'screen_share_active'):
+                self._flags.pop((room_id, user_id, field), None)
+
+    def _forget_peers(self, room_id: str):
+        with self._peers_lock:
+            self._peers.pop(room_id, None)
+
+    def _room_sids(self, room_id: str) -> Dict[str, str]:
+        """user_id -> sid for a room, from the peer cache while it is fresh"""
+        now = time.monotonic()
+        with self._peers_lock:
+            cached = self._peers.get(room_id)
+            if cached is not None and cached[0] > now:
+                return cached[1]
+
+        sids = {user_id: user_data['sid'] for user_id, user_data in self.get_room_users(room_id).items()}
+        with self._peers_lock:
+            if sids:
+                self._peers[room_id] = (now + self.peer_cache_ttl, sids)
+            else:
+                self._peers.pop(room_id, None)
+        return sids
+
+    def _ensure_started(self):
+        if self._heartbeat is not None:
+            return
+        with self._start_lock:
+            if self._heartbeat is None:
+                self.node_id = f"{socket.gethostname()}-{os.getpid()}-{secrets.token_hex(3)}"
+                # Beat once before anyone joins, so other nodes never see us without a heartbeat
+                self.beat()
+                self._heartbeat = threading.Thread(target=self._run_heartbeat, name='room-heartbeat',
+                                                   daemon=True)
+                self._heartbeat.start()
+
+    def _run_heartbeat(self):
+        while True:
+            time.sleep(self.node_ttl / 3)
+            try:
+                self.beat()
+            except Exception as e:
+                log.error("room_heartbeat_failed", node=self.node_id, error=e)
+
+    def beat(self):
+        """Refresh this node's heartbeat and remove the users of nodes that stopped beating"""
+        self.client.set(self._node_key(self.node_id), 1, ex=self.node_ttl)
+        self.client.sadd(f"{self.prefix}:nodes", self.node_id)
+        for node_id in self.client.smembers(f"{self.prefix}:nodes"):
+            if node_id != self.node_id and not self.client.exists(self._node_key(node_id)):
+                self._remove_node(node_id)
+
+    def _remove_node(self, node_id: str):
+        sids_key = self._node_sids_key(node_id)
+        sids = self.client.smembers(sids_key)
+        for sid in sids:
+            entry = self.client.get(self._sid_key(sid))
+            if entry:
+                room_id, user_id = json.loads(entry)[:2]
+                self._leave(room_id, user_id, sid)
+        self.client.delete(sids_key)
+        self.client.srem(f"{self.prefix}:nodes", node_id)
+        log.warning("dead_node_removed", node=node_id, sockets=len(sids))
+
+    def create_room(self, room_id: str = None) -> str:
+        """Create a new room and return room_id (rooms exist once someone joins)"""
+        if not room_id:
+            room_id = secrets.token_urlsafe(8)
+        return room_id
+
+    def join_room(self, room_id: str, user_id: str, sid: str, name: str, language: str = 'Spanish',
+                  media: str = None) -> bool:
+        """Add user to room (media sets the room's media mode if it is empty)"""
+        # Validate room_id
+        if not room_id or room_id.strip() == '':
+            return False
+
+        room_key = self._room_key(room_id)
+        user_data = {
+            'sid': sid,
+            'name': name,
+            'stream_active': False,
+            'screen_share_active': False,
+            'language': language
+        }
+
+        self._ensure_started()
+
+        def join(pipe) -> bool:
+            existing = pipe.hget(room_key, user_id)
+            size = pipe.hlen(room_key)
+            previous_sid = json.loads(existing)['sid'] if existing is not None else None
+            previous_entry = pipe.get(self._sid_key(previous_sid)) if previous_sid not in (None, sid) else None
+
+            # Limit to MAX_ROOM_USERS users
+            if existing is None and size >= Config.MAX_ROOM_USERS:
+                pipe.unwatch()
+                return False
+
+            pipe.multi()
+            if not size:
+                pipe.set(self._media_key(room_id), media or Config.MEDIA_MODE)
+                pipe.incr(self._stats_key('rooms'))
+            if existing is None:
+                pipe.incr(self._stats_key('users'))
+            # Rejoin (e.g. after a reconnect) replaces the old socket id
+            if previous_sid not in (None, sid):
+                pipe.delete(self._sid_key(previous_sid))
+                self._untrack_sid(pipe, previous_sid, previous_entry)
+            pipe.hset(room_key, user_id, json.dumps(user_data))
+            pipe.set(self._sid_key(sid), json.dumps([room_id, user_id, self.node_id]))
+            pipe.sadd(self._node_sids_key(self.node_id), sid)
+            pipe.set(self._user_key(user_id), room_id)
+            pipe.execute()
+            return True
+
+        joined = self._transaction(join, room_key)
+        if joined:
+            self._forget_flags(room_id, user_id)
+            self._forget_peers(room_id)
+        return joined
+
+    def leave_room(self, room_id: str, user_id: str):
+        """Remove user from room"""
+        self._leave(room_id, user_id)
+
+    def _untrack_sid(self, pipe, sid: str, sid_entry: Optional[str]):
+        """Queue removing sid from its node's set (entries written before nodes were tracked have none)"""
+        entry = json.loads(sid_entry) if sid_entry else []
+        if len(entry) > 2:
+            pipe.srem(self._node_sids_key(entry[2]), sid)
+
+    def _leave(self, room_id: str, user_id: str, sid: str = None):
+        """Remove user from room - only while they are still on sid, if given"""
+        room_key = self._room_key(room_id)
+        user_key = self._user_key(user_id)
+
+        def leave(pipe):
+            existing = pipe.hget(room_key, user_id)
+            if existing is None or (sid is not None and json.loads(existing)['sid'] != sid):
+                pipe.unwatch()
+                return
+
+            user_sid = json.loads(existing)['sid']
+            sid_key = self._sid_key(user_sid)
+            sid_entry = pipe.get(sid_key)
+            current_room = pipe.get(user_key)
+            last = pipe.hlen(room_key) == 1
+
+            pipe.multi()
+            pipe.hdel(room_key, user_id)
+            pipe.decr(self._stats_key('users'))
+            if last:
+                pipe.delete(self._media_key(room_id))
+                pipe.decr(self._stats_key('rooms'))
+            if sid_entry and json.loads(sid_entry)[:2] == [room_id, user_id]:
+                pipe.delete(sid_key)
+                self._untrack_sid(pipe, user_sid, sid_entry)
+            if current_room == room_id:
+                pipe.delete(user_key)
+            pipe.execute()
+
+        self._transaction(leave, room_key, user_key)
+        self._forget_flags(room_id, user_id)
+        self._forget_peers(room_id)
+
+    def get_room_users(self, room_id: str) -> Dict:
+        """Get all users in a room (a snapshot, safe to iterate)"""
+        return {user_id: json.loads(raw)
+                for user_id, raw in self.client.hgetall(self._room_key(room_id)).items()}
+
+    def get_peer_sids(self, room_id: str, exclude_sid: str = None) -> List[str]:
+        """Get socket ids of everyone in a room except exclude_sid"""
+        return [sid for sid in self._room_sids(room_id).values() if sid != exclude_sid]
+
+    def get_user_sid(self, room_id: str, user_id: str) -> Optional[str]:
+        """Socket id of a user in a room (None if they aren't in it)"""
+        raw = self.client.hget(self._room_key(room_id), user_id)
+        return json.loads(raw)['sid'] if raw else None
+
+    def get_media_mode(self, room_id: str) -> str:
+        """'p2p' or 'relay'"""
+        return self.client.get(self._media_key(room_id)) or Config.MEDIA_MODE
+
+    def get_room_languages(self, room_id: str) -> List[str]:
+        """Get the distinct languages of everyone in a room"""
+        languages = [user_data['language'] for user_data in self.get_room_users(room_id).values()]
+        return list(dict.fromkeys(lang for lang in languages if lang))
+
+    def _update_user(self, room_id: str, user_id: str, field: str, value):
+        room_key = self._room_key(room_id)
+
+        def update(pipe):
+            existing = pipe.hget(room_key, user_id)
+            if existing is None:
+                pipe.unwatch()
+                return
+
+            user_data = json.loads(existing)
+            user_data[field] = value
+            pipe.multi()
+            pipe.hset(room_key, user_id, json.dumps(user_data))
+            pipe.execute()
+
+        self._transaction(update, room_key)
+
+    def _set_flag(self, room_id: str, user_id: str, field: str, active: bool):
+        key = (room_id, user_id, field)
+        with self._flags_lock:
+            if self._flags.get(key) == active:
+                return
+            self._flags[key] = active
+        self._update_user(room_id, user_id, field, active)
+
+    def update_user_language(self, room_id: str, user_id: str, language: str):
+        """Update user's preferred language"""
+        self._update_user(room_id, user_id, 'language', language)
+
+    def set_stream_status(self, room_id: str, user_id: str, active: bool):
+        """Update user's stream status"""
+        self._set_flag(room_id, user_id, 'stream_active', active)
+
+    def set_screen_share_status(self, room_id: str, user_id: str, active: bool):
+        """Update user's screen share status"""
+        self._set_flag(room_id, user_id, 'screen_share_active', active)
+
+    def get_user_by_sid(self, sid: str) -> tuple:
+        """Find user by socket id - returns (room_id, user_id)"""
+        entry = self.client.get(self._sid_key(sid))
+        return tuple(json.loads(entry)[:2]) if entry else (None, None)
+
+    def get_room_by_user(self, user_id: str) -> Optional[str]:
+        """Find the room a user is currently in"""
+        return self.client.get(self._user_key(user_id))
+
+    def get_stats(self) -> Dict:
+        """Number of rooms and connected users (across all nodes)"""
+        rooms, users = self.client.mget(self._stats_key('rooms'), self._stats_key('users'))
+        return {'rooms': max(0, int(rooms or 0)), 'users': max(0, int(users or 0))}
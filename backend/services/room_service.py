@@ -1,77 +1,149 @@
-from typing import Dict, Set
+from typing import Dict, List, Optional, Set, Tuple
 import secrets
+import threading
+from config import Config
 
 class RoomService:
     def __init__(self):
         # room_id -> {user_id: {sid, name, stream_active, screen_share_active, language}}
         self.rooms: Dict[str, Dict[str, Dict]] = {}
+        # Reverse indexes so lookups don't scan every room:
+        # sid -> (room_id, user_id) and user_id -> room_id
+        self._sid_index: Dict[str, Tuple[str, str]] = {}
+        self._user_index: Dict[str, str] = {}
+        # room_id -> media mode ('p2p' or 'relay'), chosen by the first user to join
+        self._media: Dict[str, str] = {}
+        # Socket.IO runs handlers on many threads (async_mode='threading')
+        self._lock = threading.RLock()
 
     def create_room(self, room_id: str = None) -> str:
         """Create a new room and return room_id"""
         if not room_id:
             room_id = secrets.token_urlsafe(8)
 
-        if room_id not in self.rooms:
-            self.rooms[room_id] = {}
+        with self._lock:
+            if room_id not in self.rooms:
+                self.rooms[room_id] = {}
 
         return room_id
 
-    def join_room(self, room_id: str, user_id: str, sid: str, name: str, language: str = 'Spanish') -> bool:
-        """Add user to room"""
+    def join_room(self, room_id: str, user_id: str, sid: str, name: str, language: str = 'Spanish',
+                  media: str = None) -> bool:
+        """Add user to room (media sets the room's media mode if it is empty)"""
         # Validate room_id
         if not room_id or room_id.strip() == '':
             return False
 
-        if room_id not in self.rooms:
-            self.create_room(room_id)
-
-        # Limit to 4 users
-        if len(self.rooms[room_id]) >= 4 and user_id not in self.rooms[room_id]:
-            return False
-
-        self.rooms[room_id][user_id] = {
-            'sid': sid,
-            'name': name,
-            'stream_active': False,
-            'screen_share_active': False,
-            'language': language
-        }
+        with self._lock:
+            if room_id not in self.rooms:
+                self.create_room(room_id)
+
+            users = self.rooms[room_id]
+
+            # Limit to MAX_ROOM_USERS users
+            if len(users) >= Config.MAX_ROOM_USERS and user_id not in users:
+                return False
+
+            if not users:
+                self._media[room_id] = media or Config.MEDIA_MODE
+
+            # Rejoin (e.g. after a reconnect) replaces the old socket id
+            previous = users.get(user_id)
+            if previous and previous['sid'] != sid:
+                self._sid_index.pop(previous['sid'], None)
+
+            users[user_id] = {
+                'sid': sid,
+                'name': name,
+                'stream_active': False,
+                'screen_share_active': False,
+                'language': language
+            }
+            self._sid_index[sid] = (room_id, user_id)
+            self._user_index[user_id] = room_id
         return True
 
     def leave_room(self, room_id: str, user_id: str):
         """Remove user from room"""
-        if room_id in self.rooms and user_id in self.rooms[room_id]:
-            del self.rooms[room_id][user_id]
-
-            # Clean up empty rooms
-            if not self.rooms[room_id]:
-                del self.rooms[room_id]
+        with self._lock:
+            if room_id in self.rooms and user_id in self.rooms[room_id]:
+                user_data = self.rooms[room_id].pop(user_id)
+                if self._sid_index.get(user_data['sid']) == (room_id, user_id):
+                    del self._sid_index[user_data['sid']]
+                if self._user_index.get(user_id) == room_id:
+                    del self._user_index[user_id]
+
+                # Clean up empty rooms
+                if not self.rooms[room_id]:
+                    del self.rooms[room_id]
+                    self._media.pop(room_id, None)
 
     def get_room_users(self, room_id: str) -> Dict:
-        """Get all users in a room"""
-        return self.rooms.get(room_id, {})
+        """Get all users in a room (a snapshot, safe to iterate)"""
+        with self._lock:
+            return dict(self.rooms.get(room_id, {}))
+
+    def get_peer_sids(self, room_id: str, exclude_sid: str = None) -> List[str]:
+        """Get socket ids of everyone in a room except exclude_sid"""
+        with self._lock:
+            return [user_data['sid'] for user_data in self.rooms.get(room_id, {}).values()
+                    if user_data['sid'] != exclude_sid]
+
+    def get_user_sid(self, room_id: str, user_id: str) -> Optional[str]:
+        """Socket id of a user in a room (None if they aren't in it)"""
+        with self._lock:
+            user_data = self.rooms.get(room_id, {}).get(user_id)
+            return user_data['sid'] if user_data else None
+
+    def get_media_mode(self, room_id: str) -> str:
+        """'p2p' or 'relay'"""
+        with self._lock:
+            return self._media.get(room_id, Config.MEDIA_MODE)
+
+    def get_room_languages(self, room_id: str) -> List[str]:
+        """Get the distinct languages of everyone in a room"""
+        with self._lock:
+            languages = [user_data['language'] for user_data in self.rooms.get(room_id, {}).values()]
+        return list(dict.fromkeys(lang for lang in languages if lang))
 
     def update_user_language(self, room_id: str, user_id: str, language: str):
         """Update user's preferred language"""
-        if room_id in self.rooms and user_id in self.rooms[room_id]:
-            self.rooms[room_id][user_id]['language'] = language
+        with self._lock:
+            if room_id in self.rooms and user_id in self.rooms[room_id]:
+                self.rooms[room_id][user_id]['language'] = language
 
     def set_stream_status(self, room_id: str, user_id: str, active: bool):
         """Update user's stream status"""
-        if room_id in self.rooms and user_id in self.rooms[room_id]:
-            self.rooms[room_id][user_id]['stream_active'] = active
+        with self._lock:
+            if room_id in self.rooms and user_id in self.rooms[room_id]:
+                self.rooms[room_id][user_id]['stream_active'] = active
 
     def set_screen_share_status(self, room_id: str, user_id: str, active: bool):
         """Update user's screen share status"""
-        if room_id in self.rooms and user_id in self.rooms[room_id]:
-            self.rooms[room_id][user_id]['screen_share_active'] = active
+        with self._lock:
+            if room_id in self.rooms and user_id in self.rooms[room_id]:
+                self.rooms[room_id][user_id]['screen_share_active'] = active
 
     def get_user_by_sid(self, sid: str) -> tuple:
         """Find user by socket id - returns (room_id, user_id)"""
-        for room_id, users in self.rooms.items():
-            for user_id, user_data in users.items():
-                if user_data['sid'] == sid:
-                    return (room_id, user_id)
-        return (None, None)
-
-room_service = RoomService()
+        with self._lock:
+            return self._sid_index.get(sid, (None, None))
+
+    def get_room_by_user(self, user_id: str) -> Optional[str]:
+        """Find the room a user is currently in"""
+        with self._lock:
+            return self._user_index.get(user_id)
+
+    def get_stats(self) -> Dict:
+        """Number of rooms and connected users"""
+        with self._lock:
+            return {'rooms': len(self.rooms), 'users': len(self._sid_index)}
+
+def create_room_service():
+    """Build the room state store selected in Config.ROOM_STORE"""
+    if Config.ROOM_STORE == 'redis':
+        from .redis_room_service import RedisRoomService
+        return RedisRoomService(Config.REDIS_URL)
+    return RoomService()
+
+room_service = create_room_service()
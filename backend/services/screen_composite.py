@@ -0,0 +1,96 @@
+from typing import Dict, List, Optional, Tuple
+from config import Config
+import threading
+
+
+class _Composite:
+    """Latest keyframe of one screen share plus every tile changed since"""
+
+    def __init__(self, keyframe: Dict):
+        self.keyframe = keyframe
+        # (x, y) -> newest tile at that position
+        self.tiles: Dict[Tuple[int, int], Dict] = {}
+        self.tile_bytes = 0
+
+
+class ScreenCompositeCache:
+    """
+    Current picture of every active screen share, for late joiners.
+
+    Sharers in tile mode send a full JPEG keyframe (screen-frame) now and then
+    and, in between, only the tiles whose content changed (screen-tiles). The
+    server never decodes images: it keeps the last keyframe and the newest
+    tile at each position, which together are the current screen. A new
+    joiner gets that as one screen-snapshot and composites it client side.
+
+    When the tiles held for a sharer exceed SCREEN_COMPOSITE_MAX_BYTES, or
+    tiles arrive before any keyframe, the caller should ask the sharer for a
+    fresh keyframe (apply_tiles returns False).
+    """
+
+    def __init__(self, max_bytes: int = Config.SCREEN_COMPOSITE_MAX_BYTES,
+                 max_tiles: int = Config.SCREEN_MAX_TILES_PER_FRAME):
+        self.max_bytes = max_bytes
+        self.max_tiles = max_tiles
+        self._composites: Dict[str, _Composite] = {}
+        self._lock = threading.Lock()
+
+    def valid_tiles(self, tiles) -> Optional[List[Dict]]:
+        """Check a screen-tiles payload - returns the tiles, or None if malformed"""
+        if not isinstance(tiles, list) or len(tiles) > self.max_tiles:
+            return None
+        for tile in tiles:
+            if not isinstance(tile, dict) or not isinstance(tile.get('frame'), (bytes, bytearray)) \
+                    or not isinstance(tile.get('x'), int) or not isinstance(tile.get('y'), int):
+                return None
+        return tiles
+
+    def set_keyframe(self, user_id: str, payload: Dict):
+        """A full frame replaces everything cached for this sharer"""
+        with self._lock:
+            self._composites[user_id] = _Composite(payload)
+
+    def apply_tiles(self, user_id: str, tiles: List[Dict]) -> bool:
+        """Overlay changed tiles - returns False if the sharer should send a keyframe"""
+        with self._lock:
+            composite = self._composites.get(user_id)
+            if composite is None:
+                return False
+
+            for tile in tiles:
+                key = (tile['x'], tile['y'])
+                previous = composite.tiles.get(key)
+                if previous is not None:
+                    composite.tile_bytes -= len(previous['frame'])
+                composite.tiles[key] = tile
+                composite.tile_bytes += len(tile['frame'])
+
+            return composite.tile_bytes <= self.max_bytes
+
+    def snapshot(self, user_id: str) -> Optional[Dict]:
+        """Keyframe plus current tiles for a sharer, or None if nothing is cached"""
+        with self._lock:
+            composite = self._composites.get(user_id)
+            if composite is None:
+                return None
+            return {
+                'userId': user_id,
+                'keyframe': composite.keyframe,
+                'tiles': list(composite.tiles.values())
+            }
+
+    def remove(self, user_id: str):
+        with self._lock:
+            self._composites.pop(user_id, None)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'sharers': len(self._composites),
+                'tiles': sum(len(c.tiles) for c in self._composites.values()),
+                'bytes': sum(c.tile_bytes + len(c.keyframe.get('frame') or b'')
+                             for c in self._composites.values())
+            }
+
+
+screen_composites = ScreenCompositeCache()
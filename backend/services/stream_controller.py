@@ -0,0 +1,149 @@
+from typing import Dict, List, Optional, Tuple
+from config import Config
+from .frame_relay import frame_relay
+import threading
+import time
+
+
+class _Stream:
+    """Inbound measurements and current settings for one sender's stream"""
+
+    def __init__(self, sid: str):
+        self.sid = sid
+        self.window_start = time.monotonic()
+        self.window_bytes = 0
+        self.window_frames = 0
+        self.last_seen = self.window_start
+        # 1.0 = the configured maximum settings, 0.0 = the minimum
+        self.scale = 1.0
+        self.settings: Optional[Dict] = None
+        self.kbps = 0.0
+        self.fps = 0.0
+
+
+class StreamController:
+    """
+    Adapts senders' frame rate, resolution and JPEG quality to the load on this node.
+
+    Every STREAM_CONTROL_INTERVAL seconds each stream's inbound bitrate is
+    measured and multiplied by its receiver count to get the bandwidth it
+    costs the node. The node budget (STREAM_NODE_BUDGET_KBPS) is split evenly
+    between active streams. A stream over its share, or one whose receivers
+    ack frames slower than STREAM_LAG_TARGET_MS, is scaled down
+    multiplicatively; one well under its share with low lag is scaled back
+    up in small steps. When the rounded settings change, the sender gets a
+    stream-control message with the new fps, width and quality, always within
+    Config.STREAM_LIMITS.
+    """
+
+    def __init__(self, budget_kbps: float = Config.STREAM_NODE_BUDGET_KBPS,
+                 interval: float = Config.STREAM_CONTROL_INTERVAL,
+                 lag_target_ms: float = Config.STREAM_LAG_TARGET_MS,
+                 limits: Dict = Config.STREAM_LIMITS):
+        self.budget_kbps = budget_kbps
+        self.interval = interval
+        self.lag_target = lag_target_ms / 1000.0
+        self.limits = limits
+        # (event, user_id) -> stream state
+        self._streams: Dict[Tuple[str, str], _Stream] = {}
+        self._lock = threading.Lock()
+        self.adjustments = 0
+
+    @staticmethod
+    def frame_size(frame) -> int:
+        """Size on the wire of a binary frame, a base64 data URL or a list of screen tiles"""
+        if isinstance(frame, list):
+            return sum(len(tile.get('frame') or b'') for tile in frame)
+        return len(frame) if frame is not None else 0
+
+    def observe(self, socketio, event: str, user_id: str, sender_sid: str,
+                frame, receiver_sids: List[str]):
+        """Record one inbound frame and re-evaluate the stream once per interval"""
+        now = time.monotonic()
+        with self._lock:
+            stream = self._streams.get((event, user_id))
+            if stream is None or stream.sid != sender_sid:
+                stream = self._streams[(event, user_id)] = _Stream(sender_sid)
+
+            stream.window_bytes += self.frame_size(frame)
+            stream.window_frames += 1
+            stream.last_seen = now
+
+            elapsed = now - stream.window_start
+            if elapsed < self.interval:
+                return
+
+            settings = self._evaluate(event, stream, elapsed, len(receiver_sids),
+                                      frame_relay.get_delivery_lag(receiver_sids), now)
+
+        if settings is not None:
+            socketio.emit('stream-control', settings, to=sender_sid)
+
+    def _evaluate(self, event: str, stream: _Stream, elapsed: float, receivers: int,
+                  lag: float, now: float) -> Optional[Dict]:
+        """Adjust a stream's scale - returns new settings if the sender should change"""
+        stream.kbps = stream.window_bytes * 8 / 1000.0 / elapsed
+        stream.fps = stream.window_frames / elapsed
+        stream.window_start, stream.window_bytes, stream.window_frames = now, 0, 0
+
+        active = sum(1 for s in self._streams.values() if now - s.last_seen < 2 * self.interval)
+        share = self.budget_kbps / max(1, active)
+        outbound = stream.kbps * max(1, receivers)
+
+        if outbound > share or lag > self.lag_target:
+            stream.scale = max(0.0, stream.scale * 0.7)
+        elif outbound < 0.7 * share and lag < self.lag_target / 2:
+            stream.scale = min(1.0, stream.scale + 0.1)
+
+        settings = self._settings(event, stream.scale)
+        if settings == stream.settings:
+            return None
+        # No message until the stream first drops below the client defaults
+        if stream.settings is None and stream.scale == 1.0:
+            stream.settings = settings
+            return None
+
+        stream.settings = settings
+        self.adjustments += 1
+        return dict(settings, event=event)
+
+    def _settings(self, event: str, scale: float) -> Dict:
+        limits = self.limits[event]
+
+        def lerp(key):
+            low, high = limits[key]
+            return low + (high - low) * scale
+
+        return {
+            'fps': max(1, round(lerp('fps'))),
+            # Multiples of 16 keep JPEG blocks aligned
+            'width': int(lerp('width')) // 16 * 16,
+            'quality': round(lerp('quality'), 2)
+        }
+
+    def forget(self, user_id: str, event: Optional[str] = None):
+        """Drop a sender's stream state (stopped sharing or left)"""
+        with self._lock:
+            for key in list(self._streams):
+                if key[1] == user_id and (event is None or key[0] == event):
+                    del self._streams[key]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            streams = {
+                f"{event}:{user_id}": {
+                    'kbps': round(stream.kbps, 1),
+                    'fps': round(stream.fps, 1),
+                    'scale': round(stream.scale, 2),
+                    'settings': stream.settings
+                } for (event, user_id), stream in self._streams.items()
+            }
+
+        return {
+            'budgetKbps': self.budget_kbps,
+            'adjustments': self.adjustments,
+            'streams': streams
+        }
+
+
+stream_controller = StreamController()
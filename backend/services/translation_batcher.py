@@ -0,0 +1,119 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from config import Config
+from monitoring.metrics import Histogram
+from monitoring.log import get_logger
+import queue
+import threading
+import time
+
+log = get_logger(__name__)
+
+
+class TranslationBatcher:
+    """
+    Collects translation requests from every room for a short window and sends
+    them to the backend as one multi-item request.
+
+    A batch is flushed after TRANSLATION_BATCH_WINDOW_MS or once
+    TRANSLATION_BATCH_MAX_ITEMS requests are waiting, whichever comes first.
+    Each caller gets a Future resolved with its own translation.
+
+    The batcher thread only collects: flushed batches go to a pool of
+    TRANSLATION_WORKERS threads, so a slow backend call doesn't hold back the
+    next window. The pool is its own rather than the pipeline's, whose
+    workers block on these Futures.
+    """
+
+    def __init__(self, translation_service,
+                 window_ms: float = Config.TRANSLATION_BATCH_WINDOW_MS,
+                 max_items: int = Config.TRANSLATION_BATCH_MAX_ITEMS,
+                 queue_limit: int = Config.TRANSLATION_QUEUE_LIMIT,
+                 max_workers: int = Config.TRANSLATION_WORKERS):
+        self.translation_service = translation_service
+        self.window = window_ms / 1000.0
+        self.max_items = max_items
+        # (text, target_language, future, enqueued_at)
+        self._queue: "queue.Queue[Tuple[str, str, Future, float]]" = queue.Queue(maxsize=queue_limit)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='translation-batch')
+
+        self.latency = Histogram([0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0])
+        self.batch_size = Histogram([1, 2, 4, 8, 16, 32, 64])
+
+    def submit(self, text: str, target_language: str) -> Future:
+        """Queue one translation and return a Future for its result"""
+        self._ensure_started()
+        future: Future = Future()
+        try:
+            self._queue.put_nowait((text, target_language, future, time.monotonic()))
+        except queue.Full:
+            log.warning("translation_batch_queue_full")
+            future.set_result(None)
+        return future
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='translation-batcher', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+
+            while len(batch) < self.max_items:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[str, str, Future, float]]):
+        try:
+            self._executor.submit(self._flush, batch)
+        except RuntimeError:
+            # Shut down: nobody will run the batch, don't leave the callers waiting
+            for _, _, future, _ in batch:
+                if future.set_running_or_notify_cancel():
+                    future.set_result(None)
+
+    def _flush(self, batch: List[Tuple[str, str, Future, float]]):
+        # Requests cancelled while queued (superseded speculation) never reach the backend
+        batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        self.batch_size.observe(len(batch))
+        items = [(text, language) for text, language, _, _ in batch]
+
+        try:
+            if len(items) == 1:
+                results = [self.translation_service.generate(*items[0])]
+            else:
+                results = self.translation_service.generate_batch(items)
+        except Exception as e:
+            log.error("batch_translation_failed", error=e, items=len(items))
+            results = [None] * len(items)
+
+        now = time.monotonic()
+        for (_, _, future, enqueued_at), translated_text in zip(batch, results):
+            self.latency.observe(now - enqueued_at)
+            future.set_result(translated_text)
+
+    def get_stats(self) -> Dict:
+        return {
+            'queued': self._queue.qsize(),
+            'windowMs': self.window * 1000,
+            'maxItems': self.max_items,
+            'latencySeconds': self.latency.snapshot(),
+            'batchSize': self.batch_size.snapshot()
+        }
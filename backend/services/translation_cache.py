@@ -0,0 +1,190 @@
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from config import Config
+from runtime import blocking
+import sqlite3
+import threading
+import time
+
+
+class TranslationCache:
+    """
+    In-process LRU/TTL cache for translations, keyed by normalized text and target language.
+
+    Generation runs at temperature 0.0, so the same input always yields the
+    same output and results are safe to reuse. Entries are evicted least
+    recently used first once either the entry count or the memory cap is hit,
+    and expire after the TTL. If a SQLite path is given, entries are also
+    written through to disk so the cache survives restarts.
+
+    The disk tier is read and written outside the in-memory lock, so hits
+    never wait behind a miss's SQLite I/O. Expired rows are swept, and the
+    oldest rows trimmed to db_max_rows, on open and every SWEEP_EVERY writes.
+    """
+
+    SWEEP_EVERY = 1000
+
+    def __init__(self, max_entries: int = Config.TRANSLATION_CACHE_SIZE,
+                 max_bytes: int = Config.TRANSLATION_CACHE_MAX_BYTES,
+                 ttl: float = Config.TRANSLATION_CACHE_TTL,
+                 db_path: Optional[str] = Config.TRANSLATION_CACHE_DB,
+                 db_max_rows: int = Config.TRANSLATION_CACHE_DB_MAX_ROWS):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> (translated_text, stored_at, size_in_bytes)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[str, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db = None
+        # The disk tier's connection is shared by every thread
+        self._db_lock = threading.Lock()
+        self.db_max_rows = db_max_rows
+        self._writes_since_sweep = 0
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute('''
+                CREATE TABLE IF NOT EXISTS translation_cache (
+                    text TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    PRIMARY KEY (text, language)
+                )
+            ''')
+            self._db.execute('CREATE INDEX IF NOT EXISTS idx_translation_cache_stored_at '
+                             'ON translation_cache(stored_at)')
+            self._db.commit()
+            self._sweep(time.time())
+
+    @staticmethod
+    def normalize(text: str, target_language: str) -> Tuple[str, str]:
+        """Build the cache key - case and whitespace differences share an entry"""
+        return ' '.join(text.split()).casefold(), target_language.strip().casefold()
+
+    def get(self, text: str, target_language: str) -> Optional[str]:
+        """Return a cached translation or None"""
+        key = self.normalize(text, target_language)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[1] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry:
+                self._remove(key)
+
+        stored = self._load(key, now) if self._db is not None else None
+
+        with self._lock:
+            if stored is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            # A set() may have landed while we were reading the disk - keep the newer one
+            entry = self._entries.get(key)
+            if entry and entry[1] >= stored[1]:
+                self._entries.move_to_end(key)
+                return entry[0]
+            if entry:
+                self._remove(key)
+            self._insert(key, stored[0], stored[1])
+            return stored[0]
+
+    def set(self, text: str, target_language: str, translated_text: str):
+        """Store a successful translation"""
+        if not translated_text:
+            return
+
+        key = self.normalize(text, target_language)
+        now = time.time()
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._insert(key, translated_text, now)
+
+        if self._db is not None:
+            self._store(key, translated_text, now)
+
+    def _insert(self, key: Tuple[str, str], translated_text: str, stored_at: float):
+        size = len(key[0].encode()) + len(key[1]) + len(translated_text.encode())
+        self._entries[key] = (translated_text, stored_at, size)
+        self._bytes += size
+
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: Tuple[str, str]):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    @blocking
+    def _store(self, key: Tuple[str, str], translated_text: str, stored_at: float):
+        with self._db_lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO translation_cache VALUES (?, ?, ?, ?)',
+                (key[0], key[1], translated_text, stored_at)
+            )
+            self._db.commit()
+            self._writes_since_sweep += 1
+            if self._writes_since_sweep < self.SWEEP_EVERY:
+                return
+        self._sweep(stored_at)
+
+    @blocking
+    def _sweep(self, now: float):
+        """Delete expired rows, then the oldest ones past db_max_rows"""
+        with self._db_lock:
+            self._writes_since_sweep = 0
+            self._db.execute('DELETE FROM translation_cache WHERE stored_at < ?', (now - self.ttl,))
+            excess = self._db.execute('SELECT COUNT(*) FROM translation_cache').fetchone()[0] - self.db_max_rows
+            if excess > 0:
+                self._db.execute('''
+                    DELETE FROM translation_cache WHERE rowid IN (
+                        SELECT rowid FROM translation_cache ORDER BY stored_at LIMIT ?
+                    )
+                ''', (excess,))
+            self._db.commit()
+
+    @blocking
+    def _load(self, key: Tuple[str, str], now: float) -> Optional[Tuple[str, float]]:
+        """Read-through from the on-disk cache, if enabled"""
+        with self._db_lock:
+            row = self._db.execute(
+                'SELECT translated_text, stored_at FROM translation_cache WHERE text = ? AND language = ?',
+                key
+            ).fetchone()
+        if not row or now - row[1] > self.ttl:
+            return None
+        return row[0], row[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hitRate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'persistent': self._db is not None
+            }
+
+
+translation_cache = TranslationCache()
@@ -0,0 +1,171 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict, Iterable, Optional
+from config import Config
+from monitoring.log import get_logger
+import threading
+
+log = get_logger(__name__)
+
+
+class TranslationPipeline:
+    """
+    Runs translations on a bounded worker pool instead of the Socket.IO worker.
+
+    At most TRANSLATION_WORKERS Gemini calls run at once and at most
+    TRANSLATION_QUEUE_LIMIT may be waiting or running; beyond that new work is
+    rejected right away so an overloaded node degrades instead of piling up.
+    """
+
+    def __init__(self, translation_service, max_workers: int = Config.TRANSLATION_WORKERS,
+                 queue_limit: int = Config.TRANSLATION_QUEUE_LIMIT):
+        self.translation_service = translation_service
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='translation')
+        self._slots = threading.BoundedSemaphore(queue_limit)
+
+    def submit(self, text: str, target_language: str) -> Optional[Future]:
+        """Queue a translation - returns None if the pipeline is full"""
+        if self.translation_service.batcher is not None:
+            # Batched requests wait in the batcher, not on a pool thread
+            return self.translation_service.translate_async(text, target_language)
+        return self._submit(self.translation_service.translate, text, target_language)
+
+    def submit_many(self, text: str, target_languages: Iterable[str]) -> Optional[Future]:
+        """Queue one batched translation into several languages (result is a dict)"""
+        return self._submit(self.translation_service.translate_many, text, list(target_languages))
+
+    def _submit(self, fn: Callable, *args) -> Optional[Future]:
+        if not self._slots.acquire(blocking=False):
+            log.warning("translation_queue_full")
+            return None
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except RuntimeError:
+            self._slots.release()
+            return None
+
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def translate_bidirectional(self, text: str, target_language: str,
+                                reverse_language: Optional[str],
+                                on_result: Callable[[Optional[str], Optional[str]], None],
+                                forward: Optional[Future] = None):
+        """
+        Run the forward and (optional) reverse translation concurrently.
+
+        on_result(translated, reverse) is called as soon as the forward
+        translation is ready, and once more if the reverse translation
+        finishes after that. A forward future already under way (a
+        speculative translation of the same text) is used instead of a new one.
+        """
+        forward = forward or self.submit(text, target_language)
+        if forward is None:
+            on_result(None, None)
+            return
+
+        reverse = self.submit(text, reverse_language) if reverse_language else None
+        lock = threading.Lock()
+        state = {'forward_sent': False, 'reverse': None}
+
+        def forward_done(future: Future):
+            translated = _result_or_none(future)
+            with lock:
+                state['forward_sent'] = True
+                reverse_text = state['reverse']
+            on_result(translated, reverse_text if translated else None)
+
+        def reverse_done(future: Future):
+            reverse_text = _result_or_none(future)
+            with lock:
+                state['reverse'] = reverse_text
+                forward_sent = state['forward_sent']
+
+            # Forward result already went out without it - send an update
+            if forward_sent and reverse_text:
+                translated = _result_or_none(forward)
+                if translated:
+                    on_result(translated, reverse_text)
+
+        if reverse is not None:
+            reverse.add_done_callback(reverse_done)
+        forward.add_done_callback(forward_done)
+
+    def translate_fan_out(self, text: str, target_languages: Iterable[str],
+                          on_result: Callable[[Dict[str, Optional[str]]], None],
+                          reuse: Optional[Dict[str, Future]] = None):
+        """
+        Translate into every language in one batched request and call
+        on_result with the language -> translation dict once it is ready.
+        Languages in reuse (speculative translations of the same text) are
+        taken from those futures instead of the request.
+        """
+        languages = list(dict.fromkeys(target_languages))
+        reuse = {language: future for language, future in (reuse or {}).items() if language in languages}
+        remaining = [language for language in languages if language not in reuse]
+
+        future = self.submit_many(text, remaining) if remaining else None
+        if future is None and not reuse:
+            on_result({})
+            return
+
+        # None stands for the batched request (its result is already a dict)
+        parts = list(reuse.items()) + ([(None, future)] if future is not None else [])
+        lock = threading.Lock()
+        state = {'left': len(parts), 'results': {}}
+
+        def part_done(language: Optional[str], done: Future):
+            result = _result_or_none(done)
+            with lock:
+                if language is None:
+                    state['results'].update(result or {})
+                elif result:
+                    state['results'][language] = result
+                state['left'] -= 1
+                finished = state['left'] == 0
+            if finished:
+                on_result(state['results'])
+
+        for language, part in parts:
+            part.add_done_callback(lambda f, language=language: part_done(language, f))
+
+    def translate_stream(self, text: str, target_language: str,
+                         on_partial: Callable[[str], None],
+                         on_done: Callable[[Optional[str]], None],
+                         speculation: Optional[Future] = None):
+        """
+        Stream a translation on the worker pool, calling on_partial for each
+        growing partial and on_done with the final text (None on failure).
+        With a speculative translation of the same text there is nothing
+        left to stream - on_done gets its result.
+        """
+        if speculation is not None:
+            speculation.add_done_callback(lambda f: on_done(_result_or_none(f)))
+            return
+
+        def run():
+            translated_text = None
+            try:
+                for partial in self.translation_service.translate_stream(text, target_language):
+                    translated_text = partial
+                    on_partial(partial)
+            except Exception:
+                # Failed mid-stream: the partials so far are not the final caption
+                translated_text = None
+            finally:
+                on_done(translated_text)
+
+        if self._submit(run) is None:
+            on_done(None)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+def _result_or_none(future: Future):
+    try:
+        return future.result()
+    except Exception as e:
+        log.error("translation_worker_failed", error=e)
+        return None
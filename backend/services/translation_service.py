@@ -1,18 +1,28 @@
-import google.generativeai as genai
-from typing import Optional
+from concurrent.futures import Future
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from config import Config
+from monitoring.log import get_logger
+from monitoring.metrics import translation_requests_total, translation_seconds
+from .backends import TranslationBackend, create_backend
+from .translation_cache import TranslationCache, translation_cache
+from .translation_batcher import TranslationBatcher
+import time
+
+log = get_logger(__name__)
 
 class TranslationService:
-    def __init__(self):
-        genai.configure(api_key=Config.GOOGLE_API_KEY)
-        self.model = genai.GenerativeModel(
-            model_name=Config.GEMINI_MODEL_NAME,
-            generation_config=Config.GENERATION_CONFIG
-        )
+    def __init__(self, cache: Optional[TranslationCache] = None,
+                 backend: Optional[TranslationBackend] = None):
+        self.cache = cache or translation_cache
+        # Gemini by default; mock/phrasebook engines are selected via Config.TRANSLATION_BACKEND
+        self.backend = backend or create_backend(Config.TRANSLATION_BACKEND)
+        # Cross-room micro-batching of backend calls (optional)
+        self.batcher = TranslationBatcher(self) if Config.TRANSLATION_BATCHING else None
 
     def translate(self, text: str, target_language: str) -> Optional[str]:
         """
-        Translate text to target language using Gemini API
+        Translate text to target language using the configured backend.
+        Repeated phrases are served from the translation cache.
 
         Args:
             text: The text to translate
@@ -24,35 +34,156 @@ class TranslationService:
         if not text:
             return None
 
-        prompt = self._build_translation_prompt(text, target_language)
+        if self.batcher is not None:
+            return self.translate_async(text, target_language).result()
+
+        cached = self.cache.get(text, target_language)
+        if cached is not None:
+            return cached
+
+        translated_text = self.generate(text, target_language)
+        self.cache.set(text, target_language, translated_text)
+        return translated_text
+
+    def translate_async(self, text: str, target_language: str) -> Future:
+        """
+        Like translate, but returns a Future. With batching enabled the request
+        joins the next batch instead of occupying the calling thread.
+        """
+        cached = self.cache.get(text, target_language) if text else None
+        if not text or cached is not None:
+            future: Future = Future()
+            future.set_result(cached)
+            return future
+
+        if self.batcher is None:
+            future = Future()
+            translated_text = self.generate(text, target_language)
+            self.cache.set(text, target_language, translated_text)
+            future.set_result(translated_text)
+            return future
+
+        future = self.batcher.submit(text, target_language)
+        future.add_done_callback(
+            lambda f: None if f.cancelled() else self.cache.set(text, target_language, f.result()))
+        return future
+
+    def _call_backend(self, call: str, fn, *args):
+        """Run a backend call, recording its latency and outcome"""
+        start = time.perf_counter()
+        outcome = 'error'
+        try:
+            result = fn(*args)
+            outcome = 'ok'
+            return result
+        finally:
+            translation_seconds.observe(time.perf_counter() - start, self.backend.name, call)
+            translation_requests_total.inc(self.backend.name, call, outcome)
 
+    def generate(self, text: str, target_language: str) -> Optional[str]:
+        """Single uncached backend call"""
         try:
-            response = self.model.generate_content(prompt)
-            translated_text = response.text.strip()
-            return translated_text
+            return self._call_backend('translate', self.backend.translate, text, target_language).strip()
         except Exception as e:
-            print(f"❌ Translation Error: {e}")
+            log.error("translation_failed", backend=self.backend.name, error=e)
             return None
 
-    def _build_translation_prompt(self, text: str, target_language: str) -> str:
+    def translate_stream(self, text: str, target_language: str) -> Iterator[str]:
         """
-        Build an optimized few-shot prompt for translation
+        Stream a translation as the model produces it
+
+        Yields:
+            The translation so far, growing with every chunk. The last value
+            yielded is the full translation.
 
-        The prompt uses examples to guide the model to:
-        - Return ONLY the translation
-        - Avoid explanations or notes
-        - Be concise and fast
+        Raises:
+            The backend's error if the stream fails, possibly after some
+            partials were yielded - those are not a complete translation
+            (and nothing is cached).
         """
-        return f"""Task: Translate to {target_language}.
-Rule: Return ONLY the translated text. No notes, no explanations.
+        if not text:
+            return
+
+        cached = self.cache.get(text, target_language)
+        if cached is not None:
+            yield cached
+            return
+
+        translated_text = ''
+        start = time.perf_counter()
+        try:
+            for chunk in self.backend.translate_stream(text, target_language):
+                if chunk:
+                    translated_text += chunk
+                    yield translated_text.strip()
+        except Exception as e:
+            translation_requests_total.inc(self.backend.name, 'stream', 'error')
+            log.error("streaming_translation_failed", backend=self.backend.name, error=e)
+            raise
+        finally:
+            translation_seconds.observe(time.perf_counter() - start, self.backend.name, 'stream')
+
+        translation_requests_total.inc(self.backend.name, 'stream', 'ok')
+
+        self.cache.set(text, target_language, translated_text.strip())
+
+    def generate_batch(self, items: List[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Translate several (text, target_language) items with one backend call
+
+        Returns:
+            Translations in the same order as items (None where missing)
+        """
+        return self._call_backend('batch', self.backend.translate_batch, items)
+
+    def translate_many(self, text: str, target_languages: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Translate text into several languages with a single backend call
+
+        Args:
+            text: The text to translate
+            target_languages: Language names to translate into
+
+        Returns:
+            Dict of language name -> translated text (None for failed languages)
+        """
+        languages = list(dict.fromkeys(lang for lang in target_languages if lang))
+        results: Dict[str, Optional[str]] = {}
+        if not text or not languages:
+            return {lang: None for lang in languages}
+
+        missing = []
+        for lang in languages:
+            cached = self.cache.get(text, lang)
+            if cached is not None:
+                results[lang] = cached
+            else:
+                missing.append(lang)
+
+        # The cross-room batcher will combine these with other pending requests
+        if missing and self.batcher is not None:
+            futures = {lang: self.translate_async(text, lang) for lang in missing}
+            for lang, future in futures.items():
+                results[lang] = future.result()
+            missing = []
+
+        # Nothing to batch - the plain prompt is shorter and just as fast
+        if len(missing) == 1:
+            results[missing[0]] = self.generate(text, missing[0])
+            self.cache.set(text, missing[0], results[missing[0]])
+            missing = []
+
+        if missing:
+            try:
+                translations = self._call_backend('many', self.backend.translate_many, text, missing)
+            except Exception as e:
+                log.error("batch_translation_failed", backend=self.backend.name, error=e)
+                translations = {}
 
-Examples:
-Input: Hello there
-Output: Hola
-Input: How are you doing?
-Output: ¿Cómo estás?
-Input: Good morning
-Output: Buenos días
+            for lang in missing:
+                translated_text = translations.get(lang)
+                if translated_text:
+                    self.cache.set(text, lang, translated_text)
+                results[lang] = translated_text or None
 
-Input: {text}
-Output:"""
+        return results
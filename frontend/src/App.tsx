@@ -2,6 +2,7 @@ import { useState, useEffect, useMemo } from 'react';
 import { RoomLobby } from './components/RoomLobby';
 import { VideoCard } from './components/VideoCard';
 import { RemoteVideo } from './components/RemoteVideo';
+import { StreamVideo } from './components/StreamVideo';
 import { CaptionDisplay } from './components/CaptionDisplay';
 import { RecordingPanel } from './components/RecordingPanel';
 import { Select } from './components/ui/select';
@@ -9,6 +10,7 @@ import { Button } from './components/ui/button';
 import { useRoom } from './hooks/useRoom';
 import { useServerVideo } from './hooks/useServerVideo';
 import { useScreenShare } from './hooks/useScreenShare';
+import { usePeerMedia } from './hooks/usePeerMedia';
 import { useVoiceRecording } from './hooks/useVoiceRecording';
 import { useSpeechRecognition } from './hooks/useSpeechRecognition';
 import { SUPPORTED_LANGUAGES, type TranslationResult } from './types';
@@ -23,9 +25,11 @@ function App() {
   const [translation, setTranslation] = useState<TranslationResult | null>(null);
   const [isListening, setIsListening] = useState(true);
   const [showCopied, setShowCopied] = useState(false);
+  // Whether our frames still go through the server (see usePeerMedia)
+  const [relay, setRelay] = useState(true);
 
   // Only initialize room hooks if roomId exists
-  const { socket, users, isConnected, videoFrames, screenFrames } = useRoom(
+  const { socket, users, isConnected, videoFrames, screenFrames, media } = useRoom(
     roomId || '',
     userId,
     userName,
@@ -36,15 +40,35 @@ function App() {
     socket,
     roomId: roomId || '',
     userId,
-    enabled: isConnected && roomId !== null
+    enabled: isConnected && roomId !== null,
+    relay
   });
 
-  const { isSharing, startScreenShare, stopScreenShare } = useScreenShare({
+  const { isSharing, screenStream, startScreenShare, stopScreenShare } = useScreenShare({
     socket,
     roomId: roomId || '',
-    userId
+    userId,
+    relay
   });
 
+  const peerIds = useMemo(
+    () => Array.from(users.keys()).filter(id => id !== userId).sort(),
+    [users, userId]
+  );
+
+  const { remoteStreams, directPeers, relayNeeded } = usePeerMedia({
+    socket,
+    userId,
+    peerIds,
+    media,
+    cameraStream: myStream,
+    screenStream
+  });
+
+  useEffect(() => {
+    setRelay(relayNeeded);
+  }, [relayNeeded]);
+
   const { interimTranscript } = useSpeechRecognition({
     socket,
     targetLanguage,
@@ -99,8 +123,14 @@ function App() {
       setTranslation(data);
     });
 
+    // Long utterances stream in as growing partial captions before the final result
+    socket.on('translation-partial', (data: TranslationResult) => {
+      setTranslation(data);
+    });
+
     return () => {
       socket.off('translation-result');
+      socket.off('translation-partial');
     };
   }, [socket]);
 
@@ -108,15 +138,25 @@ function App() {
     return Array.from(users.values()).filter(u => u.id !== userId);
   }, [users, userId]);
 
+  // Direct peers' camera/screen as live streams; everyone else's as relayed frames
+  const directStream = (peerId: string, kind: 'camera' | 'screen') =>
+    directPeers.has(peerId) ? remoteStreams.get(peerId)?.[kind] ?? null : null;
+
   const activeScreenShare = useMemo(() => {
+    for (const [uid, streams] of remoteStreams.entries()) {
+      if (streams.screen && directPeers.has(uid)) {
+        const user = users.get(uid);
+        return { userId: uid, stream: streams.screen, frame: undefined, userName: user?.name || 'Unknown' };
+      }
+    }
     for (const [uid, frame] of screenFrames.entries()) {
       if (frame) {
         const user = users.get(uid);
-        return { userId: uid, frame, userName: user?.name || 'Unknown' };
+        return { userId: uid, stream: null, frame, userName: user?.name || 'Unknown' };
       }
     }
     return null;
-  }, [screenFrames, users]);
+  }, [screenFrames, remoteStreams, directPeers, users]);
 
   // Show lobby if no room selected
   if (!roomId) {
@@ -210,11 +250,15 @@ function App() {
               {activeScreenShare.userName} is sharing their screen
             </div>
             <div className="relative aspect-video bg-zinc-900 rounded-2xl overflow-hidden border border-zinc-800">
-              <img
-                src={activeScreenShare.frame}
-                alt="Screen share"
-                className="w-full h-full object-contain"
-              />
+              {activeScreenShare.stream ? (
+                <StreamVideo stream={activeScreenShare.stream} className="w-full h-full object-contain" />
+              ) : (
+                <img
+                  src={activeScreenShare.frame}
+                  alt="Screen share"
+                  className="w-full h-full object-contain"
+                />
+              )}
             </div>
 
             <div className="flex gap-4 mt-4 justify-center">
@@ -224,6 +268,14 @@ function App() {
                 </div>
               )}
               {otherUsers.map(user => {
+                const stream = directStream(user.id, 'camera');
+                if (stream) {
+                  return (
+                    <div key={user.id} className="w-32 h-24 rounded-lg overflow-hidden border border-zinc-800">
+                      <StreamVideo stream={stream} className="w-full h-full object-cover" />
+                    </div>
+                  );
+                }
                 const frame = videoFrames.get(user.id);
                 if (!frame) return null;
                 return (
@@ -245,15 +297,26 @@ function App() {
               />
             )}
 
-            {otherUsers.map(user => (
-              <RemoteVideo
-                key={user.id}
-                userId={user.id}
-                userName={user.name}
-                frameData={videoFrames.get(user.id)}
-                language={user.language}
-              />
-            ))}
+            {otherUsers.map(user => {
+              const stream = directStream(user.id, 'camera');
+              return stream ? (
+                <VideoCard
+                  key={user.id}
+                  stream={stream}
+                  label={user.name}
+                  language={user.language}
+                  muted
+                />
+              ) : (
+                <RemoteVideo
+                  key={user.id}
+                  userId={user.id}
+                  userName={user.name}
+                  frameData={videoFrames.get(user.id)}
+                  language={user.language}
+                />
+              );
+            })}
 
             {otherUsers.length === 0 && myStream && (
               <div className="text-center text-zinc-500 max-w-md">
@@ -284,6 +347,7 @@ function App() {
         <RecordingPanel
           socket={socket}
           roomId={roomId}
+          userId={userId}
           isRecording={isRecording}
           recordedText={recordedText}
           onStartRecording={startRecording}
@@ -300,7 +364,7 @@ function App() {
       {/* Footer */}
       <div className="absolute bottom-0 left-0 right-0 p-4 text-center">
         <p className="text-xs text-zinc-600">
-          Powered by Gemini AI • Server-routed video • {SUPPORTED_LANGUAGES.length} languages
+          Powered by Gemini AI • {media?.mode === 'p2p' ? 'Peer-to-peer' : 'Server-routed'} video • {SUPPORTED_LANGUAGES.length} languages
         </p>
       </div>
     </div>
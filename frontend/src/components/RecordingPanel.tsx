@@ -1,21 +1,41 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { Button } from './ui/button';
 import { Mic, Square, Loader2 } from 'lucide-react';
 import type { Socket } from 'socket.io-client';
 import type { Recording } from '../types';
+import { config } from '../config';
 
 interface RecordingPanelProps {
   socket: Socket | null;
   roomId: string;
+  userId: string;
   isRecording: boolean;
   recordedText: string;
   onStartRecording: () => void;
   onStopRecording: () => void;
 }
 
+// get-recordings returns database rows (snake_case)
+const toRecording = (row: any): Recording => ({
+  id: row.id,
+  roomId: row.room_id,
+  userId: row.user_id,
+  originalText: row.original_text,
+  translatedText: row.translated_text,
+  targetLanguage: row.target_language,
+  duration: row.duration,
+  createdAt: row.created_at
+});
+
+const mergeRecordings = (current: Recording[], incoming: Recording[]) => {
+  const seen = new Set(current.map(rec => rec.id));
+  return incoming.filter(rec => !seen.has(rec.id));
+};
+
 export const RecordingPanel = ({
   socket,
   roomId,
+  userId,
   isRecording,
   recordedText,
   onStartRecording,
@@ -23,28 +43,58 @@ export const RecordingPanel = ({
 }: RecordingPanelProps) => {
   const [recordings, setRecordings] = useState<Recording[]>([]);
   const [isSaving, setIsSaving] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const newestIdRef = useRef<number | null>(null);
+
+  useEffect(() => {
+    newestIdRef.current = recordings.length ? Math.max(...recordings.map(rec => rec.id)) : null;
+  }, [recordings]);
 
   useEffect(() => {
     if (!socket) return;
 
+    // Saves are pushed to the whole room, so the list never needs re-polling
     socket.on('recording-saved', (data) => {
-      setIsSaving(false);
-      setRecordings(prev => [{
+      // Everyone's saves arrive here - only our own ends our spinner
+      if (data.userId === userId) setIsSaving(false);
+      const saved: Recording = {
         id: data.recordingId,
         roomId,
-        userId: '',
+        userId: data.userId ?? '',
         originalText: data.original,
         translatedText: data.translated,
         targetLanguage: data.targetLanguage,
-        duration: 0,
+        duration: data.duration ?? 0,
         createdAt: new Date().toISOString()
-      }, ...prev]);
+      };
+      setRecordings(prev => [...mergeRecordings(prev, [saved]), ...prev]);
     });
 
     socket.on('recordings-list', (data) => {
-      setRecordings(data.recordings);
+      const page: Recording[] = data.recordings.map(toRecording);
+      if (data.sinceId != null) {
+        // Oldest first - newest goes on top
+        setRecordings(prev => [...mergeRecordings(prev, page).reverse(), ...prev]);
+        if (data.hasMore && page.length) {
+          socket.emit('get-recordings', { roomId, sinceId: page[page.length - 1].id });
+        }
+      } else if (data.cursor) {
+        setRecordings(prev => [...prev, ...mergeRecordings(prev, page)]);
+        setNextCursor(data.nextCursor);
+      } else {
+        setRecordings(page);
+        setNextCursor(data.nextCursor);
+      }
     });
 
+    // After a reconnect only fetch what was saved while we were away
+    const handleReconnect = () => {
+      if (newestIdRef.current != null) {
+        socket.emit('get-recordings', { roomId, sinceId: newestIdRef.current });
+      }
+    };
+    socket.io.on('reconnect', handleReconnect);
+
     socket.on('recording-error', (data) => {
       setIsSaving(false);
       alert(data.message);
@@ -57,8 +107,9 @@ export const RecordingPanel = ({
       socket.off('recording-saved');
       socket.off('recordings-list');
       socket.off('recording-error');
+      socket.io.off('reconnect', handleReconnect);
     };
-  }, [socket, roomId]);
+  }, [socket, roomId, userId]);
 
   const handleStopRecording = async () => {
     setIsSaving(true);
@@ -121,11 +172,28 @@ export const RecordingPanel = ({
           >
             <div className="text-zinc-400">{rec.originalText}</div>
             <div className="text-primary font-medium">{rec.translatedText}</div>
+            {/* Streamed with Range requests, so seeking doesn't download the whole file */}
+            <audio
+              controls
+              preload="none"
+              src={`${config.BACKEND_URL}/recordings/${rec.id}/audio`}
+              className="w-full h-8"
+            />
             <div className="text-zinc-600 text-[10px]">
               {rec.targetLanguage} • {new Date(rec.createdAt).toLocaleTimeString()}
             </div>
           </div>
         ))}
+        {nextCursor && (
+          <Button
+            onClick={() => socket?.emit('get-recordings', { roomId, cursor: nextCursor })}
+            variant="secondary"
+            className="w-full"
+            size="sm"
+          >
+            Load older
+          </Button>
+        )}
       </div>
     </div>
   );
@@ -0,0 +1,19 @@
+import { useEffect, useRef } from 'react';
+
+interface StreamVideoProps {
+  stream: MediaStream;
+  className?: string;
+}
+
+// A live MediaStream from a direct peer connection (relayed media arrives as frames instead)
+export const StreamVideo = ({ stream, className }: StreamVideoProps) => {
+  const videoRef = useRef<HTMLVideoElement>(null);
+
+  useEffect(() => {
+    if (videoRef.current) {
+      videoRef.current.srcObject = stream;
+    }
+  }, [stream]);
+
+  return <video ref={videoRef} autoPlay playsInline muted className={className} />;
+};
@@ -1,3 +1,11 @@
 export const config = {
   BACKEND_URL: import.meta.env.VITE_BACKEND_URL || 'http://localhost:5000',
+  // Send video/screen frames as raw JPEG binary attachments instead of base64 data URLs
+  BINARY_FRAMES: import.meta.env.VITE_BINARY_FRAMES !== 'false',
+  // Screen share sends only changed tiles between periodic keyframes (needs binary frames)
+  SCREEN_TILES: import.meta.env.VITE_BINARY_FRAMES !== 'false' && import.meta.env.VITE_SCREEN_TILES !== 'false',
+  // Send interim transcripts so the server can start translating before the speaker pauses
+  INTERIM_TRANSLATION: import.meta.env.VITE_INTERIM_TRANSLATION !== 'false',
+  // Media mode asked for when creating a room: 'p2p', 'relay' or empty for the server's default
+  MEDIA_MODE: import.meta.env.VITE_MEDIA_MODE || '',
 };
@@ -0,0 +1,56 @@
+import { useEffect, useRef, useState } from 'react';
+import type { Socket } from 'socket.io-client';
+import { PeerMesh, type PeerStreams, type RoomMedia, type Signal } from '../lib/peerMesh';
+
+interface UsePeerMediaProps {
+  socket: Socket | null;
+  userId: string;
+  peerIds: string[];
+  media: RoomMedia | null;
+  cameraStream: MediaStream | null;
+  screenStream: MediaStream | null;
+}
+
+export const usePeerMedia = ({ socket, userId, peerIds, media, cameraStream, screenStream }: UsePeerMediaProps) => {
+  const [remoteStreams, setRemoteStreams] = useState<Map<string, PeerStreams>>(new Map());
+  const [directPeers, setDirectPeers] = useState<Set<string>>(new Set());
+  const meshRef = useRef<PeerMesh | null>(null);
+  const peerKey = peerIds.join(',');
+
+  useEffect(() => {
+    if (!socket || media?.mode !== 'p2p') return;
+
+    const mesh = new PeerMesh(socket, userId, media.iceServers, () => {
+      setRemoteStreams(mesh.remoteStreams);
+      setDirectPeers(mesh.directPeers);
+    });
+    meshRef.current = mesh;
+
+    const handleSignal = (data: { fromUser: string; signal: Signal }) => mesh.handleSignal(data.fromUser, data.signal);
+    const handleScreenStopped = (data: { userId: string }) => mesh.screenStopped(data.userId);
+    socket.on('signal', handleSignal);
+    socket.on('screen-share-stopped', handleScreenStopped);
+
+    return () => {
+      socket.off('signal', handleSignal);
+      socket.off('screen-share-stopped', handleScreenStopped);
+      mesh.close();
+      meshRef.current = null;
+      setRemoteStreams(new Map());
+      setDirectPeers(new Set());
+    };
+  }, [socket, userId, media]);
+
+  useEffect(() => {
+    meshRef.current?.setLocalStreams(cameraStream, screenStream);
+  }, [cameraStream, screenStream, media, socket]);
+
+  useEffect(() => {
+    meshRef.current?.setPeers(peerKey ? peerKey.split(',') : []);
+  }, [peerKey, media, socket]);
+
+  // Frames still have to go through the server while any peer lacks a direct connection
+  const relayNeeded = media?.mode !== 'p2p' || peerIds.some(peerId => !directPeers.has(peerId));
+
+  return { remoteStreams, directPeers, relayNeeded };
+};
@@ -2,15 +2,25 @@ import { useEffect, useState } from 'react';
 import { io, Socket } from 'socket.io-client';
 import type { User } from '../types';
 import { config } from '../config';
+import { frameToUrl, releaseFrameUrl, type FramePayload } from '../lib/frames';
+import { TileCompositor, type ScreenTile } from '../lib/screenTiles';
+import type { RoomMedia } from '../lib/peerMesh';
 
 const SOCKET_URL = config.BACKEND_URL;
 
+interface ScreenSnapshot {
+  userId: string;
+  keyframe: { frame: FramePayload };
+  tiles: ScreenTile[];
+}
+
 export const useRoom = (roomId: string, userId: string, userName: string, userLanguage: string) => {
   const [socket, setSocket] = useState<Socket | null>(null);
   const [users, setUsers] = useState<Map<string, User>>(new Map());
   const [isConnected, setIsConnected] = useState(false);
   const [videoFrames, setVideoFrames] = useState<Map<string, string>>(new Map());
   const [screenFrames, setScreenFrames] = useState<Map<string, string>>(new Map());
+  const [media, setMedia] = useState<RoomMedia | null>(null);
 
   useEffect(() => {
     // Don't connect if roomId is empty
@@ -18,6 +28,34 @@ export const useRoom = (roomId: string, userId: string, userName: string, userLa
       return;
     }
 
+    // Per-sharer screen rebuilt from keyframes and changed tiles
+    const compositors = new Map<string, TileCompositor>();
+    const compositorFor = (sharerId: string) => {
+      let compositor = compositors.get(sharerId);
+      if (!compositor) {
+        compositor = new TileCompositor();
+        compositors.set(sharerId, compositor);
+      }
+      return compositor;
+    };
+    const showComposite = async (sharerId: string) => {
+      const frame = await compositorFor(sharerId).toFrame();
+      if (!frame || !compositors.has(sharerId)) return;
+      setScreenFrames(prev => {
+        const next = new Map(prev);
+        next.set(sharerId, frameToUrl(frame, prev.get(sharerId)));
+        return next;
+      });
+    };
+
+    // Current screen of a share that was already running when we joined
+    const showSnapshot = (snapshot: ScreenSnapshot) => {
+      const compositor = compositorFor(snapshot.userId);
+      compositor.applyKeyframe(snapshot.keyframe.frame);
+      compositor.applyTiles(snapshot.tiles);
+      showComposite(snapshot.userId);
+    };
+
     const newSocket = io(SOCKET_URL, {
       transports: ['websocket'],
       upgrade: false
@@ -32,16 +70,39 @@ export const useRoom = (roomId: string, userId: string, userName: string, userLa
         roomId,
         userId,
         name: userName,
-        language: userLanguage
+        language: userLanguage,
+        // Only used if we're the first in the room; otherwise the room's mode applies
+        media: config.MEDIA_MODE || undefined
       });
     });
 
-    newSocket.on('joined-room', (data: { roomId: string; userId: string; users: User[] }) => {
+    newSocket.on('joined-room', (data: {
+      roomId: string;
+      userId: string;
+      users: User[];
+      frames?: { userId: string; frame: FramePayload }[];
+      screens?: ScreenSnapshot[];
+      media?: RoomMedia;
+    }) => {
       const usersMap = new Map<string, User>();
       data.users.forEach(user => {
         usersMap.set(user.id, user);
       });
       setUsers(usersMap);
+
+      // Peers' latest frames, so their tiles aren't black until the next one arrives
+      if (data.frames?.length) {
+        setVideoFrames(prev => {
+          const next = new Map(prev);
+          data.frames!.forEach(({ userId: peerId, frame }) => {
+            next.set(peerId, frameToUrl(frame, prev.get(peerId)));
+          });
+          return next;
+        });
+      }
+      data.screens?.forEach(showSnapshot);
+      // Servers without peer-to-peer support relay everything
+      setMedia(data.media ?? { mode: 'relay', iceServers: [] });
     });
 
     newSocket.on('user-joined', (data: { userId: string; name: string; language: string }) => {
@@ -66,30 +127,46 @@ export const useRoom = (roomId: string, userId: string, userName: string, userLa
       });
       setVideoFrames(prev => {
         const next = new Map(prev);
+        releaseFrameUrl(next.get(data.userId));
         next.delete(data.userId);
         return next;
       });
     });
 
-    newSocket.on('video-frame', (data: { userId: string; frame: string }) => {
+    newSocket.on('video-frame', (data: { userId: string; frame: FramePayload }, ack?: () => void) => {
       setVideoFrames(prev => {
         const next = new Map(prev);
-        next.set(data.userId, data.frame);
+        next.set(data.userId, frameToUrl(data.frame, prev.get(data.userId)));
         return next;
       });
+      // Let the server know we're keeping up so it sends the next frame
+      ack?.();
     });
 
-    newSocket.on('screen-frame', (data: { userId: string; frame: string }) => {
+    newSocket.on('screen-frame', (data: { userId: string; frame: FramePayload }, ack?: () => void) => {
       setScreenFrames(prev => {
         const next = new Map(prev);
-        next.set(data.userId, data.frame);
+        next.set(data.userId, frameToUrl(data.frame, prev.get(data.userId)));
         return next;
       });
+      // Full frames are also the base that later tiles are drawn onto
+      compositorFor(data.userId).applyKeyframe(data.frame);
+      // Let the server know we're keeping up so it sends the next frame
+      ack?.();
     });
 
+    newSocket.on('screen-tiles', (data: { userId: string; tiles: ScreenTile[] }, ack?: () => void) => {
+      compositorFor(data.userId).applyTiles(data.tiles);
+      showComposite(data.userId);
+      ack?.();
+    });
+
+
     newSocket.on('screen-share-stopped', (data: { userId: string }) => {
+      compositors.delete(data.userId);
       setScreenFrames(prev => {
         const next = new Map(prev);
+        releaseFrameUrl(next.get(data.userId));
         next.delete(data.userId);
         return next;
       });
@@ -108,6 +185,7 @@ export const useRoom = (roomId: string, userId: string, userName: string, userLa
 
     newSocket.on('disconnect', () => {
       setIsConnected(false);
+      setMedia(null);
     });
 
     setSocket(newSocket);
@@ -123,6 +201,7 @@ export const useRoom = (roomId: string, userId: string, userName: string, userLa
     users,
     isConnected,
     videoFrames,
-    screenFrames
+    screenFrames,
+    media
   };
 };
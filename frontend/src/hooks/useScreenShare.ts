@@ -1,16 +1,47 @@
 import { useState, useRef, useEffect } from 'react';
 import type { Socket } from 'socket.io-client';
+import { applyStreamControl, encodeFrame, type StreamSettings } from '../lib/frames';
+import { TileEncoder } from '../lib/screenTiles';
+import { config } from '../config';
 
 interface UseScreenShareProps {
   socket: Socket | null;
   roomId: string;
   userId: string;
+  // False while every peer gets our screen over a direct connection
+  relay: boolean;
 }
 
-export const useScreenShare = ({ socket, roomId, userId }: UseScreenShareProps) => {
+export const useScreenShare = ({ socket, roomId, userId, relay }: UseScreenShareProps) => {
   const [isSharing, setIsSharing] = useState(false);
   const [screenStream, setScreenStream] = useState<MediaStream | null>(null);
   const screenSenderRef = useRef<number | null>(null);
+  const seqRef = useRef(0);
+  // Defaults match the server's upper bounds for screen-frame
+  const settingsRef = useRef<StreamSettings>({ fps: 10, width: 640, quality: 0.7 });
+  const tileEncoderRef = useRef(new TileEncoder());
+  const relayRef = useRef(relay);
+
+  useEffect(() => {
+    // Tiles are relative to the last frame the server got - restart from a full one
+    if (relay && !relayRef.current) tileEncoderRef.current.requestKeyframe();
+    relayRef.current = relay;
+  }, [relay]);
+
+  useEffect(() => {
+    if (!socket) return;
+    const handleStreamControl = (data: any) => {
+      settingsRef.current = applyStreamControl(settingsRef.current, 'screen-frame', data);
+    };
+    // Server has no usable base for our tiles (e.g. it restarted) - send a full frame next
+    const handleKeyframeRequest = () => tileEncoderRef.current.requestKeyframe();
+    socket.on('stream-control', handleStreamControl);
+    socket.on('screen-keyframe-request', handleKeyframeRequest);
+    return () => {
+      socket.off('stream-control', handleStreamControl);
+      socket.off('screen-keyframe-request', handleKeyframeRequest);
+    };
+  }, [socket]);
 
   const startScreenShare = async () => {
     try {
@@ -21,35 +52,69 @@ export const useScreenShare = ({ socket, roomId, userId }: UseScreenShareProps)
 
       setScreenStream(stream);
       setIsSharing(true);
+      tileEncoderRef.current.requestKeyframe();
 
       // Send screen frames
       const videoTrack = stream.getVideoTracks()[0];
       const imageCapture = new (window as any).ImageCapture(videoTrack);
 
       const sendFrame = async () => {
-        if (!socket?.connected) return;
+        if (!socket?.connected || !relayRef.current) return;
 
         try {
           const bitmap = await imageCapture.grabFrame();
+          const { width, quality } = settingsRef.current;
+          const height = Math.round(width * 3 / 4);
           const canvas = document.createElement('canvas');
-          canvas.width = 640;
-          canvas.height = 480;
+          canvas.width = width;
+          canvas.height = height;
           const ctx = canvas.getContext('2d');
-          ctx?.drawImage(bitmap, 0, 0, 640, 480);
-
-          const dataUrl = canvas.toDataURL('image/jpeg', 0.7);
+          ctx?.drawImage(bitmap, 0, 0, width, height);
+
+          if (config.SCREEN_TILES) {
+            const encoded = await tileEncoderRef.current.encode(canvas, quality);
+            if (!encoded) return;
+            if (encoded.keyframe) {
+              socket.emit('screen-frame', { roomId, userId, seq: seqRef.current++, ts: Date.now(), frame: encoded.frame });
+            } else if (encoded.tiles.length) {
+              // No changed tiles means an unchanged screen - nothing is sent
+              socket.emit('screen-tiles', {
+                roomId,
+                userId,
+                seq: seqRef.current++,
+                ts: Date.now(),
+                width,
+                height,
+                tileSize: tileEncoderRef.current.tileSize,
+                tiles: encoded.tiles
+              });
+            }
+            return;
+          }
+
+          const frame = await encodeFrame(canvas, quality);
+          if (!frame) return;
 
           socket.emit('screen-frame', {
             roomId,
             userId,
-            frame: dataUrl
+            seq: seqRef.current++,
+            ts: Date.now(),
+            frame
           });
         } catch (err) {
           // Skip frame on error
         }
       };
 
-      screenSenderRef.current = window.setInterval(sendFrame, 100);
+      // Frame rate follows the server's stream-control messages (10 fps by default)
+      const loop = async () => {
+        await sendFrame();
+        if (screenSenderRef.current !== null) {
+          screenSenderRef.current = window.setTimeout(loop, 1000 / settingsRef.current.fps);
+        }
+      };
+      screenSenderRef.current = window.setTimeout(loop, 0);
 
       // Handle user stopping via browser UI
       videoTrack.addEventListener('ended', () => {
@@ -63,7 +128,7 @@ export const useScreenShare = ({ socket, roomId, userId }: UseScreenShareProps)
 
   const stopScreenShare = () => {
     if (screenSenderRef.current) {
-      clearInterval(screenSenderRef.current);
+      clearTimeout(screenSenderRef.current);
       screenSenderRef.current = null;
     }
 
@@ -77,11 +142,11 @@ export const useScreenShare = ({ socket, roomId, userId }: UseScreenShareProps)
   useEffect(() => {
     return () => {
       if (screenSenderRef.current) {
-        clearInterval(screenSenderRef.current);
+        clearTimeout(screenSenderRef.current);
       }
       screenStream?.getTracks().forEach(track => track.stop());
     };
   }, [screenStream]);
 
-  return { isSharing, startScreenShare, stopScreenShare };
+  return { isSharing, screenStream, startScreenShare, stopScreenShare };
 };
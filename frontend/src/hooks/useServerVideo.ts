@@ -1,20 +1,37 @@
 import { useEffect, useRef, useState } from 'react';
 import type { Socket } from 'socket.io-client';
+import { applyStreamControl, encodeFrame, type StreamSettings } from '../lib/frames';
 
 interface UseServerVideoProps {
   socket: Socket | null;
   roomId: string;
   userId: string;
   enabled: boolean;
+  // False while every peer gets our camera over a direct connection
+  relay: boolean;
 }
 
-export const useServerVideo = ({ socket, roomId, userId, enabled }: UseServerVideoProps) => {
+export const useServerVideo = ({ socket, roomId, userId, enabled, relay }: UseServerVideoProps) => {
   const [myStream, setMyStream] = useState<MediaStream | null>(null);
+  const relayRef = useRef(relay);
+
+  useEffect(() => {
+    relayRef.current = relay;
+  }, [relay]);
   const videoSenderRef = useRef<number | null>(null);
+  const seqRef = useRef(0);
+  // Defaults match the server's upper bounds for video-frame
+  const settingsRef = useRef<StreamSettings>({ fps: 10, width: 320, quality: 0.6 });
 
   useEffect(() => {
     if (!enabled || !socket) return;
 
+    let stopped = false;
+    const handleStreamControl = (data: any) => {
+      settingsRef.current = applyStreamControl(settingsRef.current, 'video-frame', data);
+    };
+    socket.on('stream-control', handleStreamControl);
+
     const initVideo = async () => {
       try {
         const stream = await navigator.mediaDevices.getUserMedia({
@@ -28,30 +45,41 @@ export const useServerVideo = ({ socket, roomId, userId, enabled }: UseServerVid
         const imageCapture = new (window as any).ImageCapture(videoTrack);
 
         const sendFrame = async () => {
-          if (!socket.connected) return;
+          if (!socket.connected || !relayRef.current) return;
 
           try {
             const bitmap = await imageCapture.grabFrame();
+            const { width, quality } = settingsRef.current;
+            const height = Math.round(width * 3 / 4);
             const canvas = document.createElement('canvas');
-            canvas.width = 320; // Reduced for performance
-            canvas.height = 240;
+            canvas.width = width;
+            canvas.height = height;
             const ctx = canvas.getContext('2d');
-            ctx?.drawImage(bitmap, 0, 0, 320, 240);
+            ctx?.drawImage(bitmap, 0, 0, width, height);
 
-            const dataUrl = canvas.toDataURL('image/jpeg', 0.6);
+            const frame = await encodeFrame(canvas, quality);
+            if (!frame) return;
 
             socket.emit('video-frame', {
               roomId,
               userId,
-              frame: dataUrl
+              seq: seqRef.current++,
+              ts: Date.now(),
+              frame
             });
           } catch (err) {
             // Frame grab failed, skip
           }
         };
 
-        // Send frames at ~10 fps for performance
-        videoSenderRef.current = window.setInterval(sendFrame, 100);
+        // Frame rate follows the server's stream-control messages (10 fps by default)
+        const loop = async () => {
+          await sendFrame();
+          if (!stopped) {
+            videoSenderRef.current = window.setTimeout(loop, 1000 / settingsRef.current.fps);
+          }
+        };
+        loop();
 
       } catch (error) {
         console.error('Error accessing camera:', error);
@@ -61,8 +89,10 @@ export const useServerVideo = ({ socket, roomId, userId, enabled }: UseServerVid
     initVideo();
 
     return () => {
+      stopped = true;
+      socket.off('stream-control', handleStreamControl);
       if (videoSenderRef.current) {
-        clearInterval(videoSenderRef.current);
+        clearTimeout(videoSenderRef.current);
       }
       myStream?.getTracks().forEach(track => track.stop());
     };
@@ -1,5 +1,6 @@
 import { useEffect, useRef, useState } from 'react';
 import type { Socket } from 'socket.io-client';
+import { config } from '../config';
 
 interface UseSpeechRecognitionProps {
   socket: Socket | null;
@@ -37,16 +38,28 @@ export const useSpeechRecognition = ({
       const current = event.resultIndex;
       const transcript = event.results[current][0].transcript;
 
+      // Get room and user info from URL or generate defaults
+      const params = new URLSearchParams(window.location.search);
+      const roomId = params.get('room') || 'demo-room';
+      const userId = sessionStorage.getItem('userId') || 'default-user';
+
       if (!event.results[current].isFinal) {
         setInterimTranscript(transcript);
+
+        // The server debounces these and translates speculatively; the final
+        // audio-chunk reuses that translation when the text didn't change
+        if (config.INTERIM_TRANSLATION) {
+          socket.emit('audio-interim', {
+            roomId,
+            userId,
+            text: transcript,
+            sourceLang: 'en',
+            targetLang: targetLanguage,
+          });
+        }
       } else {
         setInterimTranscript('');
 
-        // Get room and user info from URL or generate defaults
-        const params = new URLSearchParams(window.location.search);
-        const roomId = params.get('room') || 'demo-room';
-        const userId = sessionStorage.getItem('userId') || 'default-user';
-
         socket.emit('audio-chunk', {
           roomId,
           userId,
@@ -1,5 +1,6 @@
 import { useState, useRef } from 'react';
 import type { Socket } from 'socket.io-client';
+import { uploadRecording } from '../lib/uploads';
 
 interface UseVoiceRecordingProps {
   socket: Socket | null;
@@ -62,7 +63,7 @@ export const useVoiceRecording = ({ socket, roomId, userId, targetLanguage }: Us
   };
 
   const stopRecording = () => {
-    return new Promise<void>((resolve) => {
+    return new Promise<void>((resolve, reject) => {
       if (!mediaRecorderRef.current) {
         resolve();
         return;
@@ -85,40 +86,31 @@ export const useVoiceRecording = ({ socket, roomId, userId, targetLanguage }: Us
           return;
         }
 
-        // Convert to base64
-        const reader = new FileReader();
-        reader.readAsDataURL(audioBlob);
-        reader.onloadend = () => {
-          const base64Audio = (reader.result as string).split(',')[1];
-
-          if (!socket) {
-            console.error('No socket connection');
-            resolve();
-            return;
-          }
-
-          console.log('Saving recording:', {
-            text: currentText,
-            targetLanguage,
-            duration
-          });
-
-          socket.emit('save-recording', {
-            roomId,
-            userId,
-            audioBlob: base64Audio,
-            originalText: currentText.trim(),
-            targetLanguage,
-            duration
-          });
-
+        if (!socket) {
+          console.error('No socket connection');
           resolve();
-        };
+          return;
+        }
 
-        reader.onerror = () => {
-          console.error('Failed to read audio blob');
-          resolve();
-        };
+        console.log('Saving recording:', {
+          text: currentText,
+          targetLanguage,
+          duration,
+          bytes: audioBlob.size
+        });
+
+        // Sent as binary chunks; the server translates and saves on commit
+        uploadRecording(socket, audioBlob, {
+          roomId,
+          userId,
+          originalText: currentText.trim(),
+          targetLanguage,
+          duration
+        })
+          .then(() => resolve(), (error) => {
+            console.error('Failed to upload recording:', error);
+            reject(error);
+          });
       };
 
       recognitionRef.current?.stop();
@@ -0,0 +1,55 @@
+import { config } from '../config';
+
+export type FramePayload = string | ArrayBuffer;
+
+/**
+ * Encode a canvas as a JPEG frame. In binary mode the raw JPEG bytes are
+ * returned so Socket.IO sends them as a binary attachment (no base64).
+ */
+export const encodeFrame = async (canvas: HTMLCanvasElement, quality: number): Promise<FramePayload | null> => {
+  if (!config.BINARY_FRAMES) {
+    return canvas.toDataURL('image/jpeg', quality);
+  }
+
+  const blob = await new Promise<Blob | null>(resolve => canvas.toBlob(resolve, 'image/jpeg', quality));
+  return blob ? blob.arrayBuffer() : null;
+};
+
+/**
+ * Turn a received frame into something an <img> can display, releasing the
+ * previous object URL for the same tile so blobs don't pile up in memory.
+ */
+export const frameToUrl = (frame: FramePayload, previousUrl?: string): string => {
+  if (previousUrl?.startsWith('blob:')) {
+    URL.revokeObjectURL(previousUrl);
+  }
+
+  if (typeof frame === 'string') {
+    return frame;
+  }
+
+  return URL.createObjectURL(new Blob([frame], { type: 'image/jpeg' }));
+};
+
+export const releaseFrameUrl = (url?: string) => {
+  if (url?.startsWith('blob:')) {
+    URL.revokeObjectURL(url);
+  }
+};
+
+/** Capture settings a sender uses; the server adjusts them with stream-control */
+export interface StreamSettings {
+  fps: number;
+  width: number;
+  quality: number;
+}
+
+/** Apply a stream-control message if it is meant for this stream type */
+export const applyStreamControl = (current: StreamSettings, event: string, data: any): StreamSettings => {
+  if (data?.event !== event) return current;
+  return {
+    fps: data.fps ?? current.fps,
+    width: data.width ?? current.width,
+    quality: data.quality ?? current.quality
+  };
+};
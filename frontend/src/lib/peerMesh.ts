@@ -0,0 +1,209 @@
+import type { Socket } from 'socket.io-client';
+
+export interface RoomMedia {
+  mode: 'p2p' | 'relay';
+  iceServers: RTCIceServer[];
+}
+
+export interface PeerStreams {
+  camera?: MediaStream;
+  screen?: MediaStream;
+}
+
+// Relayed by the server's signal event to the one peer it is for. Descriptions
+// carry the id of the stream holding our screen share, so the other side can
+// tell it apart from the camera.
+export interface Signal {
+  description?: RTCSessionDescriptionInit;
+  screen?: string | null;
+  candidate?: RTCIceCandidateInit;
+}
+
+interface Peer {
+  pc: RTCPeerConnection;
+  // Perfect negotiation: on an offer collision the polite side gives way
+  polite: boolean;
+  makingOffer: boolean;
+  ignoreOffer: boolean;
+  senders: Map<MediaStreamTrack, RTCRtpSender>;
+  remoteScreenId: string | null;
+  streams: PeerStreams;
+  connected: boolean;
+}
+
+/**
+ * One RTCPeerConnection to every other user in a 'p2p' room, carrying our
+ * camera and screen share. Each connection reports itself up or down to the
+ * server (p2p-status), which stops or resumes relaying our frames to that
+ * peer, so the frame relay only serves peers we can't reach directly.
+ */
+export class PeerMesh {
+  private peers = new Map<string, Peer>();
+  private camera: MediaStream | null = null;
+  private screen: MediaStream | null = null;
+
+  constructor(
+    private socket: Socket,
+    private userId: string,
+    private iceServers: RTCIceServer[],
+    private onChange: () => void
+  ) {}
+
+  get remoteStreams(): Map<string, PeerStreams> {
+    return new Map(Array.from(this.peers, ([peerId, peer]): [string, PeerStreams] => [peerId, peer.streams]));
+  }
+
+  get directPeers(): Set<string> {
+    return new Set(Array.from(this.peers).filter(([, peer]) => peer.connected).map(([peerId]) => peerId));
+  }
+
+  setPeers(peerIds: string[]) {
+    peerIds.forEach(peerId => this.peer(peerId));
+    for (const peerId of this.peers.keys()) {
+      if (!peerIds.includes(peerId)) this.closePeer(peerId);
+    }
+  }
+
+  setLocalStreams(camera: MediaStream | null, screen: MediaStream | null) {
+    this.camera = camera;
+    this.screen = screen;
+    this.peers.forEach(peer => this.syncTracks(peer));
+  }
+
+  async handleSignal(fromUser: string, signal: Signal) {
+    const peer = this.peer(fromUser);
+    const { pc } = peer;
+    try {
+      if (signal.description) {
+        const collision = signal.description.type === 'offer' &&
+          (peer.makingOffer || pc.signalingState !== 'stable');
+        peer.ignoreOffer = !peer.polite && collision;
+        if (peer.ignoreOffer) return;
+
+        // Before setRemoteDescription, which fires ontrack for new tracks
+        if (signal.screen !== undefined) peer.remoteScreenId = signal.screen;
+        await pc.setRemoteDescription(signal.description);
+        if (signal.description.type === 'offer') {
+          await pc.setLocalDescription();
+          this.send(fromUser, { description: pc.localDescription!, screen: this.screen?.id ?? null });
+        }
+      } else if (signal.candidate) {
+        try {
+          await pc.addIceCandidate(signal.candidate);
+        } catch (err) {
+          // Candidates for an offer we ignored are expected to fail
+          if (!peer.ignoreOffer) throw err;
+        }
+      }
+    } catch (err) {
+      console.error('WebRTC signaling failed:', err);
+    }
+  }
+
+  // The sharer stopped (screen-share-stopped) - don't wait for renegotiation to drop it
+  screenStopped(peerId: string) {
+    const peer = this.peers.get(peerId);
+    if (!peer?.streams.screen) return;
+    peer.streams = { ...peer.streams, screen: undefined };
+    this.onChange();
+  }
+
+  close() {
+    for (const peerId of Array.from(this.peers.keys())) this.closePeer(peerId);
+  }
+
+  private peer(peerId: string): Peer {
+    const existing = this.peers.get(peerId);
+    if (existing) return existing;
+
+    const pc = new RTCPeerConnection({ iceServers: this.iceServers });
+    const peer: Peer = {
+      pc,
+      polite: this.userId > peerId,
+      makingOffer: false,
+      ignoreOffer: false,
+      senders: new Map(),
+      remoteScreenId: null,
+      streams: {},
+      connected: false
+    };
+    this.peers.set(peerId, peer);
+
+    pc.onnegotiationneeded = async () => {
+      try {
+        peer.makingOffer = true;
+        await pc.setLocalDescription();
+        this.send(peerId, { description: pc.localDescription!, screen: this.screen?.id ?? null });
+      } catch (err) {
+        console.error('WebRTC offer failed:', err);
+      } finally {
+        peer.makingOffer = false;
+      }
+    };
+
+    pc.onicecandidate = ({ candidate }) => {
+      if (candidate) this.send(peerId, { candidate: candidate.toJSON() });
+    };
+
+    pc.ontrack = ({ track, streams }) => {
+      const stream = streams[0] ?? new MediaStream([track]);
+      const kind = stream.id === peer.remoteScreenId ? 'screen' : 'camera';
+      peer.streams = { ...peer.streams, [kind]: stream };
+      stream.onremovetrack = () => {
+        if (stream.getTracks().length || peer.streams[kind] !== stream) return;
+        peer.streams = { ...peer.streams, [kind]: undefined };
+        this.onChange();
+      };
+      this.onChange();
+    };
+
+    pc.onconnectionstatechange = () => {
+      // Network change or NAT timeout: try new candidates before giving up on the link
+      if (pc.connectionState === 'failed') pc.restartIce();
+      this.setConnected(peerId, peer, pc.connectionState === 'connected');
+    };
+
+    this.syncTracks(peer);
+    return peer;
+  }
+
+  private closePeer(peerId: string) {
+    const peer = this.peers.get(peerId);
+    if (!peer) return;
+    this.peers.delete(peerId);
+    peer.pc.close();
+    this.onChange();
+  }
+
+  private setConnected(peerId: string, peer: Peer, connected: boolean) {
+    if (peer.connected === connected) return;
+    peer.connected = connected;
+    this.socket.emit('p2p-status', { peerId, connected });
+    this.onChange();
+  }
+
+  // Add our current camera and screen tracks to a connection and remove stopped ones
+  // (either way the connection renegotiates through onnegotiationneeded)
+  private syncTracks(peer: Peer) {
+    const wanted = new Map<MediaStreamTrack, MediaStream>();
+    for (const stream of [this.camera, this.screen]) {
+      stream?.getVideoTracks().forEach(track => wanted.set(track, stream));
+    }
+
+    for (const [track, sender] of peer.senders) {
+      if (!wanted.has(track)) {
+        peer.pc.removeTrack(sender);
+        peer.senders.delete(track);
+      }
+    }
+    for (const [track, stream] of wanted) {
+      if (!peer.senders.has(track)) {
+        peer.senders.set(track, peer.pc.addTrack(track, stream));
+      }
+    }
+  }
+
+  private send(targetUser: string, signal: Signal) {
+    this.socket.emit('signal', { targetUser, signal });
+  }
+}
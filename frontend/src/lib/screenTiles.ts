@@ -0,0 +1,154 @@
+import type { FramePayload } from './frames';
+
+export interface ScreenTile {
+  x: number;
+  y: number;
+  frame: ArrayBuffer;
+}
+
+export type TileFrame =
+  | { keyframe: true; frame: FramePayload }
+  | { keyframe: false; tiles: ScreenTile[] };
+
+const canvasToJpeg = (canvas: HTMLCanvasElement, quality: number) =>
+  new Promise<Blob | null>(resolve => canvas.toBlob(resolve, 'image/jpeg', quality));
+
+// FNV-1a over the tile's pixels; cheap enough to run on every frame
+const hashTile = (pixels: Uint32Array, stride: number, x: number, y: number, w: number, h: number) => {
+  let hash = 0x811c9dc5;
+  for (let row = y; row < y + h; row++) {
+    const start = row * stride + x;
+    for (let i = start; i < start + w; i++) {
+      hash = Math.imul(hash ^ pixels[i], 0x01000193);
+    }
+  }
+  return hash >>> 0;
+};
+
+/**
+ * Splits screen frames into tiles and only emits the tiles whose pixels
+ * changed since the previous frame. A full keyframe is sent every
+ * keyframeInterval frames, whenever the size changes, or when forced
+ * (e.g. the server asked for one with screen-keyframe-request).
+ */
+export class TileEncoder {
+  private hashes: number[] = [];
+  private width = 0;
+  private height = 0;
+  private framesSinceKey = Infinity;
+  private forceKey = true;
+
+  constructor(readonly tileSize = 80, private keyframeInterval = 50) {}
+
+  requestKeyframe() {
+    this.forceKey = true;
+  }
+
+  async encode(canvas: HTMLCanvasElement, quality: number): Promise<TileFrame | null> {
+    const ctx = canvas.getContext('2d');
+    if (!ctx) return null;
+
+    const { width, height } = canvas;
+    const pixels = new Uint32Array(ctx.getImageData(0, 0, width, height).data.buffer);
+    const cols = Math.ceil(width / this.tileSize);
+    const rows = Math.ceil(height / this.tileSize);
+
+    const hashes: number[] = [];
+    for (let row = 0; row < rows; row++) {
+      for (let col = 0; col < cols; col++) {
+        const x = col * this.tileSize;
+        const y = row * this.tileSize;
+        hashes.push(hashTile(pixels, width, x, y,
+          Math.min(this.tileSize, width - x), Math.min(this.tileSize, height - y)));
+      }
+    }
+
+    const sizeChanged = width !== this.width || height !== this.height;
+    const previous = this.hashes;
+    this.hashes = hashes;
+    this.width = width;
+    this.height = height;
+
+    if (this.forceKey || sizeChanged || ++this.framesSinceKey >= this.keyframeInterval) {
+      this.forceKey = false;
+      this.framesSinceKey = 0;
+      const blob = await canvasToJpeg(canvas, quality);
+      return blob ? { keyframe: true, frame: await blob.arrayBuffer() } : null;
+    }
+
+    const tiles: ScreenTile[] = [];
+    const tileCanvas = document.createElement('canvas');
+    const tileCtx = tileCanvas.getContext('2d');
+    for (let i = 0; i < hashes.length; i++) {
+      if (hashes[i] === previous[i]) continue;
+
+      const x = (i % cols) * this.tileSize;
+      const y = Math.floor(i / cols) * this.tileSize;
+      tileCanvas.width = Math.min(this.tileSize, width - x);
+      tileCanvas.height = Math.min(this.tileSize, height - y);
+      tileCtx?.drawImage(canvas, x, y, tileCanvas.width, tileCanvas.height,
+        0, 0, tileCanvas.width, tileCanvas.height);
+
+      const blob = await canvasToJpeg(tileCanvas, quality);
+      if (blob) tiles.push({ x, y, frame: await blob.arrayBuffer() });
+    }
+
+    return { keyframe: false, tiles };
+  }
+}
+
+const dataUrlToBlob = (dataUrl: string) => {
+  const [header, data] = dataUrl.split(',');
+  const bytes = Uint8Array.from(atob(data), c => c.charCodeAt(0));
+  return new Blob([bytes], { type: header.slice(5).split(';')[0] });
+};
+
+const loadImage = (frame: FramePayload) =>
+  createImageBitmap(typeof frame === 'string' ? dataUrlToBlob(frame) : new Blob([frame], { type: 'image/jpeg' }));
+
+/** Rebuilds a sharer's screen from keyframes and changed tiles on the receiving side */
+export class TileCompositor {
+  private canvas = document.createElement('canvas');
+  private ctx = this.canvas.getContext('2d');
+  // Keyframe/tile draws are async; chain them so they land in arrival order
+  private queue: Promise<void> = Promise.resolve();
+  // Decoded only once tiles need it - full-frame shares never pay for it
+  private pendingKeyframe: FramePayload | null = null;
+
+  applyKeyframe(frame: FramePayload) {
+    this.pendingKeyframe = frame;
+  }
+
+  applyTiles(tiles: ScreenTile[]) {
+    this.flushKeyframe();
+    return this.enqueue(async () => {
+      const images = await Promise.all(tiles.map(tile => loadImage(tile.frame)));
+      images.forEach((image, i) => this.ctx?.drawImage(image, tiles[i].x, tiles[i].y));
+    });
+  }
+
+  /** Current composite as a JPEG, for the same <img> rendering as full frames */
+  async toFrame(): Promise<ArrayBuffer | null> {
+    this.flushKeyframe();
+    await this.queue;
+    const blob = await canvasToJpeg(this.canvas, 0.9);
+    return blob ? blob.arrayBuffer() : null;
+  }
+
+  private flushKeyframe() {
+    const frame = this.pendingKeyframe;
+    if (frame === null) return;
+    this.pendingKeyframe = null;
+    this.enqueue(async () => {
+      const image = await loadImage(frame);
+      this.canvas.width = image.width;
+      this.canvas.height = image.height;
+      this.ctx?.drawImage(image, 0, 0);
+    });
+  }
+
+  private enqueue(step: () => Promise<void>) {
+    this.queue = this.queue.then(step).catch(() => undefined);
+    return this.queue;
+  }
+}
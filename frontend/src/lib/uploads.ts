@@ -0,0 +1,61 @@
+import type { Socket } from 'socket.io-client';
+
+const CHUNK_BYTES = 64 * 1024;
+const ACK_TIMEOUT_MS = 10000;
+const MAX_RETRIES = 5;
+// Admission control turned the chunk away - back off and send it again
+const RETRY_ERRORS = ['rate_limited', 'overload'];
+
+interface ChunkAck {
+  uploadId: string;
+  received?: number;
+  error?: string;
+}
+
+export interface RecordingMetadata {
+  roomId: string;
+  userId: string;
+  originalText: string;
+  targetLanguage: string;
+  duration: number;
+}
+
+/**
+ * Upload a recording as binary `recording-chunk` messages, then send
+ * `recording-commit`. Every ack reports how many bytes the server holds, so
+ * after a timeout or reconnect the upload resumes from that offset instead
+ * of starting over.
+ */
+export const uploadRecording = async (socket: Socket, audio: Blob, metadata: RecordingMetadata) => {
+  const uploadId = crypto.randomUUID();
+  let offset = 0;
+  let retries = 0;
+
+  while (offset < audio.size) {
+    const chunk = await audio.slice(offset, offset + CHUNK_BYTES).arrayBuffer();
+    let ack: ChunkAck;
+    try {
+      ack = await socket.timeout(ACK_TIMEOUT_MS).emitWithAck('recording-chunk', {
+        uploadId,
+        userId: metadata.userId,
+        roomId: metadata.roomId,
+        offset,
+        chunk
+      });
+    } catch {
+      if (++retries > MAX_RETRIES) throw new Error('Upload timed out');
+      // Resend at the same offset - the server ignores bytes it already has
+      continue;
+    }
+
+    if (ack.error && RETRY_ERRORS.includes(ack.error) && ++retries <= MAX_RETRIES) {
+      await new Promise(resolve => setTimeout(resolve, 250 * retries));
+      continue;
+    }
+    if (ack.error) throw new Error(ack.error);
+    offset = ack.received ?? offset;
+    retries = 0;
+  }
+
+  socket.emit('recording-commit', { ...metadata, uploadId, size: audio.size });
+};
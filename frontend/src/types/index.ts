@@ -11,6 +11,8 @@ export interface TranslationResult {
   sourceLang: string;
   targetLang: string;
   reverseTranslation?: string;
+  // Speculative caption from an interim transcript; the final result replaces it
+  interim?: boolean;
 }
 
 export interface User {
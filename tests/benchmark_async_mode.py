@@ -0,0 +1,118 @@
+"""
+Benchmark: ASYNC_MODE=threading (Werkzeug) vs ASYNC_MODE=gevent.
+
+1. Connections: opens idle Socket.IO connections in steps against each
+   mode and records server threads, memory and /health latency at every
+   step, stopping a mode at the first failed connect.
+2. Relay per core: runs the benchmark_load workload against each mode and
+   compares frames relayed per server CPU-second and end-to-end latency.
+
+Run from the repo root (needs gevent and websocket-client installed):
+    python tests/benchmark_async_mode.py
+    python tests/benchmark_async_mode.py --max-connections 2000 --step 250
+"""
+import argparse
+import base64
+import os
+import statistics
+import time
+
+import requests
+import socketio
+
+import benchmark_load as load
+
+MODES = ['threading', 'gevent']
+
+
+def health_latency_ms(port: int, samples: int = 20) -> float:
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        requests.get(f'http://127.0.0.1:{port}/health', timeout=30)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def connection_steps(mode: str, max_connections: int, step: int):
+    """Open idle connections in steps; yields one row of measurements per step"""
+    port = load.free_port()
+    server = load.start_server(port, mode)
+    clients = []
+    try:
+        base_rss = load.server_rss_kb(server.pid)
+        while len(clients) < max_connections:
+            start = time.perf_counter()
+            try:
+                for _ in range(step):
+                    client = socketio.Client(reconnection=False)
+                    client.connect(f'http://127.0.0.1:{port}', transports=['websocket'], wait_timeout=10)
+                    clients.append(client)
+                    index = len(clients)
+                    client.call('join-room', {'roomId': f'idle-room-{index // load.ROOM_SIZE}',
+                                              'userId': f'idle-user-{index}', 'language': 'English'}, timeout=10)
+            except (socketio.exceptions.SocketIOError, OSError) as e:
+                yield {'connections': len(clients), 'failed': type(e).__name__}
+                return
+            connect_ms = (time.perf_counter() - start) * 1000 / step
+            rss = load.server_rss_kb(server.pid)
+            yield {
+                'connections': len(clients),
+                'connect_ms': round(connect_ms, 1),
+                'threads': load.server_threads(server.pid),
+                'kb_per_connection': round((rss - base_rss) / len(clients), 1),
+                'health_ms': round(health_latency_ms(port), 1),
+            }
+    finally:
+        # Server first: a graceful disconnect per client takes far too long at these counts
+        server.terminate()
+        server.wait(timeout=10)
+        for client in clients:
+            try:
+                client.eio.disconnect(abort=True)
+            except Exception:
+                pass
+
+
+def relay_args(args):
+    """benchmark_load settings for the relay comparison"""
+    return argparse.Namespace(
+        clients=args.relay_clients, fps=5, screen_fps=2, speak_every=5, record_every=30,
+        duration=args.duration, warmup=3, port=0, async_mode=None, flood_fps=0,
+        frame=os.urandom(8 * 1024), audio_blob=base64.b64encode(os.urandom(32 * 1024)).decode())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--max-connections', type=int, default=600)
+    parser.add_argument('--step', type=int, default=100)
+    parser.add_argument('--relay-clients', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=15)
+    args = parser.parse_args()
+
+    print("Idle connections")
+    print(f"{'mode':>10} | {'conns':>6} | {'connect ms':>10} | {'threads':>7} | {'KB/conn':>8} | {'/health ms':>10}")
+    print("-" * 68)
+    for mode in MODES:
+        for row in connection_steps(mode, args.max_connections, args.step):
+            if 'failed' in row:
+                print(f"{mode:>10} | {row['connections']:>6} | connect failed ({row['failed']})")
+                break
+            print(f"{mode:>10} | {row['connections']:>6} | {row['connect_ms']:>10} | {row['threads']:>7} | "
+                  f"{row['kb_per_connection']:>8} | {row['health_ms']:>10}")
+
+    print(f"\nRelay, {args.relay_clients} clients at 5 fps")
+    print(f"{'mode':>10} | {'relayed/s':>9} | {'per CPU-s':>9} | {'CPU %':>6} | {'threads':>7} | "
+          f"{'p50 ms':>7} | {'p99 ms':>7}")
+    print("-" * 72)
+    for mode in MODES:
+        run_args = relay_args(args)
+        run_args.async_mode = mode
+        results = load.run(run_args)
+        print(f"{mode:>10} | {results['frames_relayed_per_s']:>9} | {results['frames_relayed_per_cpu_s']:>9} | "
+              f"{results['server_cpu_percent']:>6} | {results['server_threads']:>7} | "
+              f"{results['frame_latency_p50_ms']:>7} | {results['frame_latency_p99_ms']:>7}")
+
+
+if __name__ == '__main__':
+    main()
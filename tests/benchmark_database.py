@@ -0,0 +1,133 @@
+"""
+Benchmark: recordings saved and listed per second under concurrent load.
+
+Runs the same mixed workload against the old access pattern (new connection
+per call, rollback journal) and the pooled WAL layer with group commit.
+Run from the repo root:  python tests/benchmark_database.py
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+DB_DIR = tempfile.mkdtemp(prefix='livetranslate-bench-')
+os.environ['DATABASE_PATH'] = os.path.join(DB_DIR, 'pooled.db')
+os.environ['BLOB_STORE_PATH'] = os.path.join(DB_DIR, 'blobs')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from database import Recording, blob_store
+
+WRITERS = 8
+READERS = 8
+DURATION = 3.0
+AUDIO = os.urandom(32 * 1024)
+
+
+def audio_for(writer: int, n: int) -> bytes:
+    """Distinct audio per save, so the blob store can't dedupe every write after the first"""
+    return writer.to_bytes(4, 'big') + n.to_bytes(4, 'big') + AUDIO[8:]
+ROOMS = [f"room-{i}" for i in range(20)]
+
+
+class PooledRecording:
+    """What save-recording does now: audio to the blob store, metadata through the write queue"""
+
+    @staticmethod
+    def save(room_id, user_id, audio_data, original_text, translated_text, target_language, duration=0.0):
+        return Recording.save_blob(room_id, user_id, blob_store.put(audio_data), len(audio_data),
+                                   original_text, translated_text, target_language, duration)
+
+    get_by_room = staticmethod(Recording.get_by_room)
+
+
+class LegacyRecording:
+    """The previous models.py pattern, kept here for comparison"""
+    db_path = os.path.join(DB_DIR, 'legacy.db')
+
+    @classmethod
+    def init(cls):
+        conn = sqlite3.connect(cls.db_path)
+        conn.execute('''
+            CREATE TABLE recordings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, room_id TEXT NOT NULL, user_id TEXT NOT NULL,
+                audio_data BLOB NOT NULL, original_text TEXT, translated_text TEXT,
+                source_language TEXT DEFAULT 'en', target_language TEXT NOT NULL, duration REAL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)
+        ''')
+        conn.execute('CREATE INDEX idx_room_recordings ON recordings(room_id, created_at DESC)')
+        conn.commit()
+        conn.close()
+
+    @classmethod
+    def save(cls, room_id, user_id, audio_data, original_text, translated_text, target_language, duration=0.0):
+        conn = sqlite3.connect(cls.db_path, timeout=30)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO recordings
+            (room_id, user_id, audio_data, original_text, translated_text, target_language, duration)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (room_id, user_id, audio_data, original_text, translated_text, target_language, duration))
+        recording_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return recording_id
+
+    @classmethod
+    def get_by_room(cls, room_id, limit=50):
+        conn = sqlite3.connect(cls.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute('''
+            SELECT id, room_id, user_id, original_text, translated_text,
+                   target_language, duration, created_at
+            FROM recordings WHERE room_id = ? ORDER BY created_at DESC LIMIT ?
+        ''', (room_id, limit)).fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
+
+
+def run(model) -> tuple:
+    counts = {'saved': 0, 'listed': 0}
+    lock = threading.Lock()
+    stop = time.monotonic() + DURATION
+
+    def writer(n):
+        done = 0
+        while time.monotonic() < stop:
+            model.save(ROOMS[(n + done) % len(ROOMS)], f"user-{n}", audio_for(n, done),
+                       "hello there", "hola", "Spanish", 1.5)
+            done += 1
+        with lock:
+            counts['saved'] += done
+
+    def reader(n):
+        done = 0
+        while time.monotonic() < stop:
+            model.get_by_room(ROOMS[(n + done) % len(ROOMS)])
+            done += 1
+        with lock:
+            counts['listed'] += done
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(WRITERS)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(READERS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    return counts['saved'] / DURATION, counts['listed'] / DURATION
+
+
+def main():
+    LegacyRecording.init()
+    print(f"⏱️  {WRITERS} writers + {READERS} readers for {DURATION:.0f}s each, {len(AUDIO) // 1024} KiB audio\n")
+    print(f"{'mode':>8} | {'saves/s':>9} | {'lists/s':>9}")
+    print("-" * 32)
+    for name, model in (('legacy', LegacyRecording), ('pooled', PooledRecording)):
+        saves, lists = run(model)
+        print(f"{name:>8} | {saves:>9.0f} | {lists:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,438 @@
+"""
+Load test: hundreds of simulated Socket.IO clients against a real server.
+
+Starts the backend from create_app() in a child process (temp database and
+blob store, mock translation backend), connects --clients clients in rooms
+of four and drives a mixed workload: every client sends video frames, one
+client per room shares its screen, and clients speak (audio-chunk) and save
+recordings at random intervals. Like the real client, senders follow the
+server's stream-control fps. Reports relay throughput, p50/p99
+end-to-end latencies, server memory per connection and DB ops/sec, and
+compares them with the recorded baseline for the same profile.
+
+Run from the repo root:
+    python tests/benchmark_load.py                  # compare with baseline
+    python tests/benchmark_load.py --record         # store a new baseline
+    python tests/benchmark_load.py --clients 400 --fps 10 --duration 30
+
+Clients use the websocket transport when websocket-client is installed and
+fall back to long-polling otherwise; baselines are kept per transport and
+profile. Baselines are machine-specific - record one on the machine you
+compare on. The simulated clients share the machine with the server, so on
+small machines gate on a profile below saturation (the committed baseline
+is `--clients 20`, recorded on a single core where ~40 clients saturates).
+Exits 1 when any metric is worse than the baseline by more than --tolerance.
+
+--flood-fps N turns the first client into a misbehaving tab: it sends video
+frames at N fps and speaks ten times a second, ignoring stream-control, to
+show what admission control (RATE_LIMITING) keeps from the other clients.
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+import socketio
+
+BACKEND = os.path.join(os.path.dirname(__file__), '..', 'backend')
+BASELINES = os.path.join(os.path.dirname(__file__), 'baselines', 'load.json')
+ROOM_SIZE = 4
+
+SERVER = '''
+import sys
+from app import create_app, serve
+import logging
+logging.getLogger('werkzeug').setLevel(logging.CRITICAL)
+app, socketio = create_app()
+serve(app, socketio, '127.0.0.1', int(sys.argv[1]))
+'''
+
+# Metric -> (which direction is better, tolerance multiplier) for baseline comparison;
+# tail latencies swing more between runs than medians and throughput
+METRICS = {
+    'frames_relayed_per_s': ('higher', 1),
+    'frames_received_per_s': ('higher', 1),
+    'frame_latency_p50_ms': ('lower', 1),
+    'frame_latency_p99_ms': ('lower', 2),
+    'translation_latency_p50_ms': ('lower', 1),
+    'translation_latency_p99_ms': ('lower', 2),
+    'recording_latency_p50_ms': ('lower', 1),
+    'recording_latency_p99_ms': ('lower', 2),
+    'memory_per_connection_kb': ('lower', 1),
+    'frames_relayed_per_cpu_s': ('higher', 1),
+    'db_ops_per_s': ('higher', 2),
+}
+
+
+def now_ms() -> float:
+    return time.time() * 1000
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+class Stats:
+    """Latencies and counters collected by all clients"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.latencies = {'frame': [], 'translation': [], 'recording': []}
+            self.frames_sent = 0
+            self.frames_received = 0
+            self.errors = 0
+
+    def add(self, kind: str, latency_ms: float):
+        with self.lock:
+            self.latencies[kind].append(latency_ms)
+            if kind == 'frame':
+                self.frames_received += 1
+
+
+class SimClient:
+    """One participant: joins a room, streams, speaks and saves recordings"""
+
+    def __init__(self, index: int, url: str, args, stats: Stats):
+        self.user_id = f"load-user-{index}"
+        self.room_id = f"load-room-{index // ROOM_SIZE}"
+        self.sharer = index % ROOM_SIZE == 0
+        self.flooder = index == 0 and args.flood_fps > 0
+        self.url = url
+        self.args = args
+        self.stats = stats
+        self.pending = {}  # utterance/recording text -> send time (ms)
+        self.seq = 0
+        self.running = True
+        # Frames per second, lowered/raised by the server's stream-control like the real client
+        self.fps = {'video-frame': args.flood_fps if self.flooder else args.fps, 'screen-frame': args.screen_fps}
+        self.speak_every = 0.1 if self.flooder else args.speak_every
+        self.sio = socketio.Client(reconnection=False)
+        self.sio.on('video-frame', self.on_frame)
+        self.sio.on('screen-frame', self.on_frame)
+        self.sio.on('translation-result', self.on_translation)
+        self.sio.on('recording-saved', self.on_recording)
+        self.sio.on('recording-error', self.on_error)
+        self.sio.on('stream-control', self.on_stream_control)
+
+    def on_frame(self, data):
+        if data.get('ts'):
+            self.stats.add('frame', now_ms() - data['ts'])
+        return True  # ack, so the relay keeps sending
+
+    def on_translation(self, data):
+        sent = self.pending.pop(data.get('original'), None) if data.get('userId') == self.user_id else None
+        if sent is not None:
+            self.stats.add('translation', now_ms() - sent)
+
+    def on_recording(self, data):
+        sent = self.pending.pop(data.get('original'), None) if data.get('userId') == self.user_id else None
+        if sent is not None:
+            self.stats.add('recording', now_ms() - sent)
+
+    def on_stream_control(self, data):
+        if not self.flooder and data.get('event') in self.fps and data.get('fps'):
+            self.fps[data['event']] = data['fps']
+
+    def on_error(self, data):
+        with self.stats.lock:
+            self.stats.errors += 1
+
+    def connect(self, transports):
+        self.sio.connect(self.url, transports=transports, wait_timeout=30)
+        # call() waits for the server's ack, so every client is in its room before traffic starts
+        self.sio.call('join-room', {'roomId': self.room_id, 'userId': self.user_id,
+                                    'name': self.user_id, 'language': 'English'}, timeout=30)
+
+    def send_frame(self, event: str):
+        self.seq += 1
+        self.sio.emit(event, {'roomId': self.room_id, 'userId': self.user_id, 'frame': self.args.frame,
+                              'seq': self.seq, 'ts': now_ms()})
+        with self.stats.lock:
+            self.stats.frames_sent += 1
+
+    def speak(self):
+        text = f"{self.user_id} utterance {self.seq} how is the project going today"
+        self.pending[text] = now_ms()
+        self.sio.emit('audio-chunk', {'roomId': self.room_id, 'userId': self.user_id, 'text': text,
+                                      'sourceLang': 'en', 'targetLang': 'Spanish'})
+
+    def save_recording(self):
+        text = f"{self.user_id} recording {self.seq} please review the notes"
+        self.pending[text] = now_ms()
+        self.sio.emit('save-recording', {'roomId': self.room_id, 'userId': self.user_id, 'originalText': text,
+                                         'targetLanguage': 'Spanish', 'audioBlob': self.args.audio_blob,
+                                         'duration': 2.0})
+
+    def run(self):
+        """Send on a fixed schedule until stopped (jittered so clients don't fire in lockstep)"""
+        args = self.args
+        start = time.monotonic() + random.random() / args.fps
+        due = {
+            'video': start,
+            'screen': start if self.sharer else float('inf'),
+            'speak': start + random.expovariate(1 / self.speak_every),
+            'record': start + random.expovariate(1 / args.record_every),
+        }
+        while self.running:
+            task, at = min(due.items(), key=lambda item: item[1])
+            delay = at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            if not self.running:
+                break
+            try:
+                if task == 'video':
+                    self.send_frame('video-frame')
+                    due[task] = at + 1 / self.fps['video-frame']
+                elif task == 'screen':
+                    self.send_frame('screen-frame')
+                    due[task] = at + 1 / self.fps['screen-frame']
+                elif task == 'speak':
+                    self.speak()
+                    due[task] = at + random.expovariate(1 / self.speak_every)
+                else:
+                    self.save_recording()
+                    due[task] = at + random.expovariate(1 / args.record_every)
+            except socketio.exceptions.SocketIOError:
+                with self.stats.lock:
+                    self.stats.errors += 1
+                due[task] = time.monotonic() + 1
+
+    def close(self):
+        self.running = False
+        self.sio.disconnect()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, async_mode: str = 'threading') -> subprocess.Popen:
+    data_dir = tempfile.mkdtemp(prefix='livetranslate-load-')
+    env = dict(os.environ,
+               DATABASE_PATH=os.path.join(data_dir, 'recordings.db'),
+               BLOB_STORE_PATH=os.path.join(data_dir, 'blobs'),
+               TRANSLATION_BACKEND='mock',
+               ASYNC_MODE=async_mode,
+               LOG_LEVEL='WARNING')
+    server = subprocess.Popen([sys.executable, '-c', SERVER, str(port)], cwd=BACKEND, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f'http://127.0.0.1:{port}/health', timeout=1).ok:
+                return server
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError('server did not start')
+
+
+def server_cpu_seconds(pid: int) -> float:
+    """User + system CPU time of the server process (Linux); 0 where /proc isn't available"""
+    try:
+        with open(f'/proc/{pid}/stat') as stat:
+            # Fields after the parenthesised command name; utime and stime are 14 and 15
+            fields = stat.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def server_threads(pid: int) -> int:
+    """OS threads of the server process (Linux)"""
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('Threads:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def server_rss_kb(pid: int) -> float:
+    """Resident memory of the server process (Linux); 0 where /proc isn't available"""
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return float(line.split()[1])
+    except OSError:
+        pass
+    return 0.0
+
+
+def scrape(port: int) -> dict:
+    """Sum /metrics samples per metric name (over all label sets)"""
+    totals = {}
+    for line in requests.get(f'http://127.0.0.1:{port}/metrics', timeout=60).text.splitlines():
+        match = re.match(r'^([a-zA-Z_:]+)(?:\{[^}]*\})? (\S+)$', line)
+        if match:
+            totals[match.group(1)] = totals.get(match.group(1), 0.0) + float(match.group(2))
+    return totals
+
+
+def run(args) -> dict:
+    try:
+        import websocket  # noqa: F401  (websocket-client)
+        transports = ['websocket']
+    except ImportError:
+        transports = ['polling']
+
+    port = args.port or free_port()
+    server = start_server(port, args.async_mode)
+    stats = Stats()
+    clients = [SimClient(i, f'http://127.0.0.1:{port}', args, stats) for i in range(args.clients)]
+    try:
+        rss_before = server_rss_kb(server.pid)
+        for client in clients:
+            client.connect(transports)
+        time.sleep(1)
+        rss_after = server_rss_kb(server.pid)
+
+        for client in clients:
+            threading.Thread(target=client.run, daemon=True).start()
+
+        time.sleep(args.warmup)
+        stats.reset()
+        before = scrape(port)
+        cpu_before = server_cpu_seconds(server.pid)
+        started = time.monotonic()
+        time.sleep(args.duration)
+        cpu_used = server_cpu_seconds(server.pid) - cpu_before
+        threads = server_threads(server.pid)
+        after = scrape(port)
+        elapsed = time.monotonic() - started
+
+        with stats.lock:
+            latencies = {kind: list(values) for kind, values in stats.latencies.items()}
+            frames_sent, frames_received, errors = stats.frames_sent, stats.frames_received, stats.errors
+    finally:
+        for client in clients:
+            client.running = False
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                pass
+        server.terminate()
+        server.wait(timeout=10)
+
+    def delta(name):
+        return after.get(name, 0.0) - before.get(name, 0.0)
+
+    results = {
+        'async_mode': args.async_mode,
+        'transport': transports[0],
+        'frames_sent_per_s': round(frames_sent / elapsed, 1),
+        'frames_relayed_per_s': round(delta('frames_relayed_total') / elapsed, 1),
+        'frames_dropped_per_s': round(delta('frames_dropped_total') / elapsed, 1),
+        'frames_received_per_s': round(frames_received / elapsed, 1),
+        'memory_per_connection_kb': round((rss_after - rss_before) / args.clients, 1),
+        'server_threads': threads,
+        'server_cpu_percent': round(cpu_used / elapsed * 100, 1),
+        'frames_relayed_per_cpu_s': round(delta('frames_relayed_total') / cpu_used, 1) if cpu_used else 0.0,
+        'db_ops_per_s': round(delta('db_query_seconds_count') / elapsed, 1),
+        'handler_errors': int(delta('socketio_handler_errors_total')),
+        'events_throttled': int(delta('socketio_events_throttled_total')),
+        'client_errors': errors,
+    }
+    for kind, values in latencies.items():
+        results[f'{kind}_latency_p50_ms'] = round(percentile(values, 0.50), 1)
+        results[f'{kind}_latency_p99_ms'] = round(percentile(values, 0.99), 1)
+        results[f'{kind}_samples'] = len(values)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Metrics worse than the baseline by more than tolerance"""
+    regressions = []
+    for name, (better, factor) in METRICS.items():
+        old, new = baseline.get(name), results.get(name)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        allowed = tolerance * factor
+        if (better == 'higher' and change < -allowed) or (better == 'lower' and change > allowed):
+            regressions.append(f"{name}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--fps', type=float, default=5, help='video frames per second per client')
+    parser.add_argument('--screen-fps', type=float, default=2, help='screen frames per second per sharer')
+    parser.add_argument('--frame-kb', type=int, default=8, help='frame size')
+    parser.add_argument('--speak-every', type=float, default=5, help='mean seconds between utterances')
+    parser.add_argument('--record-every', type=float, default=30, help='mean seconds between saved recordings')
+    parser.add_argument('--recording-kb', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=20, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=3)
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--flood-fps', type=float, default=0, help='first client floods video frames at this rate')
+    parser.add_argument('--async-mode', choices=['threading', 'gevent'], default='threading',
+                        help='server ASYNC_MODE')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative regression')
+    parser.add_argument('--record', action='store_true', help='store the results as the new baseline')
+    args = parser.parse_args()
+
+    random.seed(0)
+    args.frame = os.urandom(args.frame_kb * 1024)
+    args.audio_blob = base64.b64encode(os.urandom(args.recording_kb * 1024)).decode()
+
+    results = run(args)
+    profile = (f"{args.async_mode}-{results['transport']}-c{args.clients}-fps{args.fps:g}-screen{args.screen_fps:g}"
+               f"-{args.frame_kb}kb" + (f"-flood{args.flood_fps:g}" if args.flood_fps else ""))
+
+    print(f"profile: {profile}")
+    for name, value in results.items():
+        print(f"  {name:<28} {value}")
+
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES) as f:
+            baselines = json.load(f)
+
+    if args.record:
+        baselines[profile] = {name: results[name] for name in METRICS}
+        os.makedirs(os.path.dirname(BASELINES), exist_ok=True)
+        with open(BASELINES, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"baseline recorded in {BASELINES}")
+        return
+
+    if profile not in baselines:
+        print("no baseline for this profile (run with --record to store one)")
+        return
+
+    regressions = compare(results, baselines[profile], args.tolerance)
+    if regressions:
+        print(f"REGRESSIONS (tolerance {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"within {args.tolerance:.0%} of baseline")
+
+
+if __name__ == '__main__':
+    main()
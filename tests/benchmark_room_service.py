@@ -0,0 +1,66 @@
+"""
+Micro-benchmark: cost of handling a disconnect as the number of connected users grows.
+
+Compares RoomService's sid index against the old full scan over every room.
+Run from the repo root:  python tests/benchmark_room_service.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from services.room_service import RoomService
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+DISCONNECTS = 1_000
+
+
+def populate(service: RoomService, users: int):
+    for i in range(users):
+        service.join_room(f"room-{i // 4}", f"user-{i}", f"sid-{i}", f"User {i}")
+
+
+def legacy_scan(rooms, sid):
+    """The previous get_user_by_sid: walk every user of every room"""
+    for room_id, users in rooms.items():
+        for user_id, user_data in users.items():
+            if user_data['sid'] == sid:
+                return (room_id, user_id)
+    return (None, None)
+
+
+def time_disconnects(service: RoomService, sids, lookup) -> float:
+    start = time.perf_counter()
+    for sid in sids:
+        room_id, user_id = lookup(sid)
+        if room_id and user_id:
+            service.leave_room(room_id, user_id)
+    return (time.perf_counter() - start) / len(sids) * 1e6
+
+
+def main():
+    random.seed(0)
+    print(f"{'users':>8} | {'indexed µs/disconnect':>22} | {'scan µs/disconnect':>19}")
+    print("-" * 57)
+
+    for users in SIZES:
+        sample = random.sample(range(users), min(DISCONNECTS, users))
+        sids = [f"sid-{i}" for i in sample]
+
+        indexed = RoomService()
+        populate(indexed, users)
+        indexed_us = time_disconnects(indexed, sids, indexed.get_user_by_sid)
+
+        # The scan is O(users) per call - keep the sample small at large sizes
+        scanned = RoomService()
+        populate(scanned, users)
+        scan_sids = sids[:max(10, DISCONNECTS * 1_000 // users)]
+        scan_us = time_disconnects(scanned, scan_sids, lambda sid: legacy_scan(scanned.rooms, sid))
+
+        print(f"{users:>8} | {indexed_us:>22.2f} | {scan_us:>19.2f}")
+
+
+if __name__ == '__main__':
+    main()
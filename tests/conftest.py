@@ -0,0 +1,19 @@
+"""
+Shared pytest setup: import the backend from backend/ and keep every
+database, blob and cache file the services open in a temp directory.
+"""
+import os
+import sys
+import tempfile
+
+# Before anything imports config (settings are read at import time)
+_DATA_DIR = tempfile.mkdtemp(prefix='livetranslate-tests-')
+os.environ.setdefault('DATABASE_PATH', os.path.join(_DATA_DIR, 'recordings.db'))
+os.environ.setdefault('BLOB_STORE_PATH', os.path.join(_DATA_DIR, 'blobs'))
+os.environ.setdefault('TRANSLATION_BACKEND', 'mock')
+os.environ.setdefault('LOG_LEVEL', 'CRITICAL')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+# Scripts that call the live Gemini API when imported, not tests
+collect_ignore = ['test_key.py', 'list_models.py']
@@ -0,0 +1,141 @@
+"""
+Admission control: per-socket rate limits, payload limits, load shedding and connection limits.
+
+Run from the repo root:  python -m pytest tests/test_admission.py
+"""
+import pytest
+
+from services import admission as admission_module
+from services.admission import Admission, payload_size
+
+OVERLOAD_MS = 100
+
+
+def make_admission(**overrides):
+    settings = dict(rate_limits={'*': (100, 100), 'video-frame': (10, 2)},
+                    payload_limits={'*': 1000, 'audio-chunk': 50},
+                    overload_lag_ms=OVERLOAD_MS, probe_interval=60, max_connections=2, enabled=True)
+    settings.update(overrides)
+    admission = Admission(**settings)
+    # No probe thread - the tests set the lag themselves
+    admission._probe = object()
+    return admission
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [500.0]
+    monkeypatch.setattr('services.admission.time.monotonic', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def always_shed(monkeypatch):
+    """Make every probabilistic shedding decision drop the event"""
+    monkeypatch.setattr(admission_module.random, 'random', lambda: 0.0)
+
+
+def test_bucket_allows_a_burst_then_refills_at_the_rate(clock):
+    admission = make_admission()
+    assert [admission.check('a', 'video-frame', {}) for _ in range(3)] == [None, None, 'rate_limited']
+
+    clock[0] += 0.1
+    assert admission.check('a', 'video-frame', {}) is None
+    assert admission.check('a', 'video-frame', {}) == 'rate_limited'
+
+
+def test_buckets_are_per_socket_and_per_event(clock):
+    admission = make_admission()
+    admission.check('a', 'video-frame', {})
+    admission.check('a', 'video-frame', {})
+
+    assert admission.check('a', 'video-frame', {}) == 'rate_limited'
+    assert admission.check('b', 'video-frame', {}) is None
+    # Falls back to the '*' limit
+    assert admission.check('a', 'chat-message', {}) is None
+
+
+def test_oversized_payloads_are_rejected():
+    admission = make_admission()
+    assert admission.check('a', 'audio-chunk', {'audio': 'x' * 40}) is None
+    assert admission.check('a', 'audio-chunk', {'audio': 'x' * 60}) == 'too_large'
+    assert admission.check('a', 'chat-message', {'text': 'x' * 1001}) == 'too_large'
+
+
+def test_payload_size_counts_nested_text_and_bytes():
+    assert payload_size({'a': [b'1234', {'bc': 'de'}], 'n': 1}) == 1 + 4 + 2 + 2 + 1 + 8
+
+
+def test_frames_are_shed_first_as_lag_grows(always_shed):
+    admission = make_admission()
+    admission.lag = 0.9 * OVERLOAD_MS / 1000
+    assert admission.check('a', 'screen-tiles', {}) is None
+
+    admission.lag = 1.5 * OVERLOAD_MS / 1000
+    assert admission.load_level() == 1
+    assert admission.check('a', 'screen-tiles', {}) == 'overload'
+    assert admission.check('a', 'audio-chunk', {}) is None
+    assert admission.check('a', 'join-room', {}) is None
+
+
+def test_shedding_share_grows_with_the_lag(monkeypatch):
+    admission = make_admission(rate_limits={'*': (1e9, 1e9)})
+    monkeypatch.setattr(admission_module.random, 'random', lambda: 0.5)
+
+    # 0% at OVERLOAD_LAG_MS, 100% at four times that - 0.5 is dropped past 2.5x
+    admission.lag = 2 * OVERLOAD_MS / 1000
+    assert admission.check('a', 'video-frame', {}) is None
+    admission.lag = 3 * OVERLOAD_MS / 1000
+    assert admission.check('a', 'video-frame', {}) == 'overload'
+
+
+def test_level_two_sheds_translations_and_new_connections():
+    admission = make_admission()
+    admission.lag = 4 * OVERLOAD_MS / 1000
+
+    assert admission.load_level() == 2
+    assert admission.check('a', 'audio-chunk', {}) == 'overload'
+    assert admission.check('a', 'video-frame', {}) == 'overload'
+    assert admission.check('a', 'join-room', {}) is None
+    assert admission.check('a', 'disconnect', None) is None
+    assert admission.connect('new') == 'overload'
+
+
+def test_connection_limit_frees_up_on_forget():
+    admission = make_admission()
+    assert admission.connect('a') is None
+    assert admission.connect('b') is None
+    assert admission.connect('c') == 'too_many_connections'
+
+    admission.forget('a')
+    assert admission.connect('c') is None
+    assert admission.get_stats()['connections'] == 2
+
+
+def test_disabled_admits_everything(always_shed):
+    admission = make_admission(enabled=False)
+    admission.lag = 10 * OVERLOAD_MS / 1000
+
+    assert admission.check('a', 'audio-chunk', {'audio': 'x' * 1000}) is None
+    assert [admission.connect(sid) for sid in 'abc'] == [None, None, None]
+
+
+@pytest.fixture(scope='module')
+def app():
+    from app import create_app
+    return create_app()
+
+
+def test_shed_screen_tiles_ask_the_sharer_for_a_keyframe(app, monkeypatch, always_shed):
+    flask_app, socketio = app
+    overloaded = make_admission(max_connections=0)
+    monkeypatch.setattr('routes.socketio_handlers.admission', overloaded)
+    sharer = socketio.test_client(flask_app)
+    sharer.emit('join-room', {'roomId': 'shed', 'userId': 'alice', 'name': 'Alice'})
+    sharer.get_received()
+
+    overloaded.lag = 2 * OVERLOAD_MS / 1000
+    sharer.emit('screen-tiles', {'roomId': 'shed', 'userId': 'alice', 'seq': 1, 'tiles': []})
+
+    assert sharer.get_received() == [{'name': 'screen-keyframe-request', 'args': [{'userId': 'alice'}],
+                                      'namespace': '/'}]
@@ -0,0 +1,111 @@
+"""
+FrameRelay backpressure: in-flight limit, newest-frame-wins, tile folding and ack timeouts.
+
+Run from the repo root:  python -m pytest tests/test_frame_relay.py
+"""
+import pytest
+
+from services.frame_relay import FrameRelay
+
+
+class FakeSocketIO:
+    """Records emits and keeps their ack callbacks so a test can ack them"""
+
+    def __init__(self):
+        self.sent = []
+        self.callbacks = []
+
+    def emit(self, event, payload, to=None, callback=None):
+        self.sent.append((event, to, payload))
+        self.callbacks.append(callback)
+
+    def ack_next(self):
+        self.callbacks.pop(0)()
+
+
+@pytest.fixture
+def socketio():
+    return FakeSocketIO()
+
+
+def frame(seq):
+    return {'frame': b'jpeg', 'seq': seq, 'ts': seq}
+
+
+def tiles(seq, *positions):
+    return {'frame': None, 'seq': seq, 'ts': seq, 'tileSize': 64, 'width': 128, 'height': 128,
+            'tiles': [{'x': x, 'y': y, 'frame': f"{seq}".encode()} for x, y in positions]}
+
+
+def test_only_the_newest_frame_waits_once_the_receiver_is_full(socketio):
+    relay = FrameRelay(max_in_flight=1, ack_timeout=60)
+    for seq in range(1, 5):
+        relay.relay(socketio, 'video-frame', 'alice', frame(seq), ['bob'])
+
+    assert [payload['seq'] for _, _, payload in socketio.sent] == [1]
+    socketio.ack_next()
+    assert [payload['seq'] for _, _, payload in socketio.sent] == [1, 4]
+
+    stats = relay.get_stats()
+    assert stats['totalDropped'] == 2
+    assert stats['receivers']['bob']['inFlight'] == 1
+
+
+def test_receivers_are_throttled_independently(socketio):
+    relay = FrameRelay(max_in_flight=1, ack_timeout=60)
+    relay.relay(socketio, 'video-frame', 'alice', frame(1), ['slow', 'fast'])
+    socketio.callbacks[1]()
+    relay.relay(socketio, 'video-frame', 'alice', frame(2), ['slow', 'fast'])
+
+    assert [(to, payload['seq']) for _, to, payload in socketio.sent] == [('slow', 1), ('fast', 1), ('fast', 2)]
+
+
+def test_queued_tiles_are_folded_not_dropped(socketio):
+    relay = FrameRelay(max_in_flight=1, ack_timeout=60)
+    relay.relay(socketio, 'screen-frame', 'alice', {'frame': b'key'}, ['bob'])
+    relay.relay(socketio, 'screen-tiles', 'alice', tiles(2, (0, 0), (1, 0)), ['bob'])
+    relay.relay(socketio, 'screen-tiles', 'alice', tiles(3, (1, 0), (1, 1)), ['bob'])
+
+    socketio.ack_next()
+    event, _, payload = socketio.sent[-1]
+    assert event == 'screen-tiles'
+    assert payload['seq'] == 3
+    assert {(tile['x'], tile['y']): tile['frame'] for tile in payload['tiles']} == {
+        (0, 0): b'2', (1, 0): b'3', (1, 1): b'3'}
+
+
+def test_keyframe_replaces_waiting_tiles(socketio):
+    relay = FrameRelay(max_in_flight=1, ack_timeout=60)
+    relay.relay(socketio, 'video-frame', 'alice', frame(1), ['bob'])
+    relay.relay(socketio, 'screen-tiles', 'alice', tiles(2, (0, 0)), ['bob'])
+    relay.relay(socketio, 'screen-frame', 'alice', {'frame': b'key'}, ['bob'])
+
+    socketio.ack_next()
+    socketio.ack_next()
+    assert [event for event, _, _ in socketio.sent] == ['video-frame', 'screen-frame']
+
+
+def test_ack_timeout_frees_the_receiver_without_sending_stale_frames(socketio, monkeypatch):
+    relay = FrameRelay(max_in_flight=1, ack_timeout=0.5)
+    clock = [100.0]
+    monkeypatch.setattr('services.frame_relay.time.monotonic', lambda: clock[0])
+
+    relay.relay(socketio, 'video-frame', 'alice', frame(1), ['bob'])
+    relay.relay(socketio, 'video-frame', 'alice', frame(2), ['bob'])
+    clock[0] += 1
+    relay.relay(socketio, 'video-frame', 'alice', frame(3), ['bob'])
+
+    # Frame 2 was queued behind the lost ack - frame 3 supersedes it
+    assert [payload['seq'] for _, _, payload in socketio.sent] == [1, 3]
+    assert relay.get_stats()['receivers']['bob']['pending'] == 0
+
+
+def test_removed_subscriber_ignores_late_acks(socketio):
+    relay = FrameRelay(max_in_flight=1, ack_timeout=60)
+    relay.relay(socketio, 'video-frame', 'alice', frame(1), ['bob'])
+    relay.relay(socketio, 'video-frame', 'alice', frame(2), ['bob'])
+    relay.remove_subscriber('bob')
+
+    socketio.ack_next()
+    assert len(socketio.sent) == 1
+    assert relay.get_stats()['receivers'] == {}
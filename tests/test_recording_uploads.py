@@ -0,0 +1,133 @@
+"""
+Chunked recording uploads: resume, limits, commit into the blob store, expiry and ownership.
+
+Run from the repo root:  python -m pytest tests/test_recording_uploads.py
+"""
+import os
+
+import pytest
+
+from database import blob_store
+from services.recording_uploads import RecordingUploads, UploadError
+
+
+@pytest.fixture
+def uploads():
+    return RecordingUploads(max_bytes=32, max_chunk_bytes=8, max_per_user=2, ttl=60)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('services.recording_uploads.time.monotonic', lambda: now[0])
+    return now
+
+
+def staging_path(uploads, user_id, upload_id):
+    return uploads._uploads[(user_id, upload_id)].path
+
+
+def test_resent_and_out_of_order_chunks_report_the_current_offset(uploads):
+    assert uploads.append('alice', 'up', 0, b'abcd') == 4
+    # Resent after a lost ack
+    assert uploads.append('alice', 'up', 0, b'abcd') == 4
+    # Ahead of what the server has - the client rewinds to 4
+    assert uploads.append('alice', 'up', 8, b'ijkl') == 4
+    assert uploads.append('alice', 'up', 4, b'efgh') == 8
+    assert uploads.status('alice', 'up') == 8
+
+
+def test_commit_moves_the_upload_into_the_blob_store(uploads):
+    uploads.append('alice', 'up', 0, b'abcd')
+    uploads.append('alice', 'up', 4, b'efgh')
+    path = staging_path(uploads, 'alice', 'up')
+
+    audio_hash, size = uploads.commit('alice', 'up', 8)
+    blob_store.release(audio_hash)
+
+    assert size == 8
+    assert blob_store.read(audio_hash) == b'abcdefgh'
+    assert not os.path.exists(path)
+    assert uploads.status('alice', 'up') == 0
+
+
+def test_incomplete_or_unknown_uploads_are_not_committed(uploads):
+    uploads.append('alice', 'up', 0, b'abcd')
+
+    with pytest.raises(UploadError, match='incomplete'):
+        uploads.commit('alice', 'up', 8)
+    # Still there to be resumed
+    assert uploads.status('alice', 'up') == 4
+    with pytest.raises(UploadError, match='Unknown'):
+        uploads.commit('bob', 'up')
+
+
+def test_size_limits(uploads):
+    with pytest.raises(UploadError, match='Chunk too large'):
+        uploads.append('alice', 'up', 0, b'x' * 9)
+
+    for offset in range(0, 32, 8):
+        uploads.append('alice', 'up', offset, b'x' * 8)
+    path = staging_path(uploads, 'alice', 'up')
+    with pytest.raises(UploadError, match='Recording too large'):
+        uploads.append('alice', 'up', 32, b'x')
+    assert not os.path.exists(path)
+    assert uploads.status('alice', 'up') == 0
+
+
+def test_uploads_in_progress_are_limited_per_user(uploads):
+    uploads.append('alice', 'one', 0, b'a')
+    uploads.append('alice', 'two', 0, b'b')
+    with pytest.raises(UploadError, match='Too many'):
+        uploads.append('alice', 'three', 0, b'c')
+    # Other users aren't affected
+    assert uploads.append('bob', 'three', 0, b'c') == 1
+
+
+def test_idle_uploads_are_swept_with_their_staging_files(uploads, clock):
+    uploads.append('alice', 'idle', 0, b'abcd')
+    idle_path = staging_path(uploads, 'alice', 'idle')
+    clock[0] += 30
+    uploads.append('bob', 'active', 0, b'abcd')
+
+    clock[0] += 31
+    # A commit sweeps too, not only append
+    with pytest.raises(UploadError):
+        uploads.commit('carol', 'missing')
+
+    assert not os.path.exists(idle_path)
+    assert uploads.status('alice', 'idle') == 0
+    assert uploads.status('bob', 'active') == 4
+
+
+@pytest.fixture(scope='module')
+def app():
+    from app import create_app
+    return create_app()
+
+
+def test_only_the_uploads_owner_can_append_or_commit(app):
+    flask_app, socketio = app
+    alice = socketio.test_client(flask_app)
+    mallory = socketio.test_client(flask_app)
+    alice.emit('join-room', {'roomId': 'uploads', 'userId': 'alice', 'name': 'Alice'})
+    mallory.emit('join-room', {'roomId': 'uploads', 'userId': 'mallory', 'name': 'Mallory'})
+
+    ack = alice.emit('recording-chunk', {'uploadId': 'up', 'userId': 'alice', 'offset': 0, 'chunk': b'abc'},
+                     callback=True)
+    assert ack == {'uploadId': 'up', 'received': 3}
+
+    ack = mallory.emit('recording-chunk', {'uploadId': 'up', 'userId': 'alice', 'offset': 3, 'chunk': b'xyz'},
+                       callback=True)
+    assert ack['error'] == 'Not your upload'
+
+    mallory.get_received()
+    mallory.emit('recording-commit', {'roomId': 'uploads', 'userId': 'alice', 'uploadId': 'up',
+                                      'size': 3, 'originalText': 'hello'})
+    errors = [message['args'][0] for message in mallory.get_received() if message['name'] == 'recording-error']
+    assert errors == [{'message': 'Not your upload', 'uploadId': 'up'}]
+
+    alice.get_received()
+    alice.emit('recording-commit', {'roomId': 'uploads', 'userId': 'alice', 'uploadId': 'up',
+                                    'size': 3, 'originalText': 'hello', 'targetLanguage': 'Spanish'})
+    assert 'recording-saved' in [message['name'] for message in alice.get_received()]
@@ -0,0 +1,109 @@
+"""
+Recording history paging: keyset cursors, sinceId catch-up and malformed requests.
+
+Run from the repo root:  python -m pytest tests/test_recordings_pagination.py
+"""
+import uuid
+
+import pytest
+
+from database import Recording, blob_store
+
+
+def save(room_id, text):
+    audio_hash = blob_store.put(text.encode())
+    return Recording.save_blob(room_id, 'alice', audio_hash, len(text), text, text, 'Spanish')
+
+
+@pytest.fixture
+def room():
+    """A fresh room with five recordings, saved within the same second (created_at ties)"""
+    room_id = f"room-{uuid.uuid4().hex}"
+    ids = [save(room_id, f"recording {i}") for i in range(5)]
+    return room_id, ids
+
+
+def test_pages_walk_newest_to_oldest_without_gaps(room):
+    room_id, ids = room
+    seen, cursor = [], None
+    while True:
+        page = Recording.get_by_room(room_id, 2, cursor)
+        seen += [recording['id'] for recording in page]
+        cursor = Recording.next_cursor(page, 2)
+        if cursor is None:
+            break
+
+    assert seen == ids[::-1]
+
+
+def test_recordings_saved_meanwhile_dont_shift_older_pages(room):
+    room_id, ids = room
+    first = Recording.get_by_room(room_id, 2)
+    save(room_id, 'newer')
+
+    second = Recording.get_by_room(room_id, 2, Recording.next_cursor(first, 2))
+    assert [recording['id'] for recording in second] == [ids[2], ids[1]]
+
+
+def test_last_page_has_no_cursor(room):
+    room_id, _ = room
+    assert Recording.next_cursor(Recording.get_by_room(room_id, 5), 5) is not None
+    assert Recording.next_cursor(Recording.get_by_room(room_id, 6), 6) is None
+
+
+def test_since_returns_only_newer_recordings_oldest_first(room):
+    room_id, ids = room
+    assert [recording['id'] for recording in Recording.get_since(room_id, ids[1], 50)] == ids[2:]
+    assert [recording['id'] for recording in Recording.get_since(room_id, ids[1], 2)] == ids[2:4]
+    assert Recording.get_since(room_id, ids[-1], 50) == []
+
+
+def test_since_id_must_be_a_recording_in_the_room(room):
+    room_id, ids = room
+    other_room = room_id + '-other'
+    save(other_room, 'elsewhere')
+
+    with pytest.raises(ValueError):
+        Recording.get_since(other_room, ids[0], 50)
+    with pytest.raises(ValueError):
+        Recording.get_since(room_id, max(ids) + 1000, 50)
+
+
+@pytest.mark.parametrize('cursor', ['garbage', '2024-01-01 00:00:00|x', 42])
+def test_malformed_cursors_are_rejected(room, cursor):
+    room_id, _ = room
+    with pytest.raises(ValueError):
+        Recording.get_by_room(room_id, 2, cursor)
+
+
+@pytest.fixture(scope='module')
+def client():
+    from app import create_app
+    flask_app, socketio = create_app()
+    return socketio.test_client(flask_app)
+
+
+def request(client, data):
+    client.get_received()
+    client.emit('get-recordings', data)
+    return [(message['name'], message['args'][0]) for message in client.get_received()]
+
+
+def test_handler_pages_with_next_cursor(client, room):
+    room_id, ids = room
+    [(event, first)] = request(client, {'roomId': room_id, 'limit': 3})
+    assert event == 'recordings-list'
+    assert [recording['id'] for recording in first['recordings']] == ids[:1:-1]
+
+    [(_, second)] = request(client, {'roomId': room_id, 'limit': 3, 'cursor': first['nextCursor']})
+    assert [recording['id'] for recording in second['recordings']] == ids[1::-1]
+    assert second['nextCursor'] is None
+
+
+def test_handler_reports_bad_requests(client, room):
+    room_id, ids = room
+    for data in ({'roomId': room_id, 'cursor': 'garbage'},
+                 {'roomId': room_id, 'sinceId': 'abc'},
+                 {'roomId': room_id + '-other', 'sinceId': ids[0]},
+                 {'roomId': room_id, 'sinceId': 2 ** 70}):
+        assert request(client, data) == [('recording-error', {'message': 'Invalid recordings request'})]
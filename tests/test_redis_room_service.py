@@ -0,0 +1,93 @@
+"""
+RedisRoomService against an in-memory fake Redis: join limits, rejoin and leave.
+
+Run from the repo root:  python -m pytest tests/test_redis_room_service.py
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+fakeredis = pytest.importorskip('fakeredis')
+
+from config import Config
+from services.redis_room_service import RedisRoomService
+
+
+@pytest.fixture
+def client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def service(client):
+    return RedisRoomService(client=client)
+
+
+def test_join_is_limited_to_max_room_users(service):
+    for i in range(Config.MAX_ROOM_USERS):
+        assert service.join_room('room', f"user-{i}", f"sid-{i}", f"User {i}")
+
+    assert not service.join_room('room', 'late', 'sid-late', 'Late')
+    assert 'late' not in service.get_room_users('room')
+    assert service.get_user_by_sid('sid-late') == (None, None)
+    assert service.get_stats() == {'rooms': 1, 'users': Config.MAX_ROOM_USERS}
+
+
+def test_rejoin_replaces_the_socket_id_even_when_full(service):
+    for i in range(Config.MAX_ROOM_USERS):
+        service.join_room('room', f"user-{i}", f"sid-{i}", f"User {i}")
+
+    assert service.join_room('room', 'user-0', 'sid-new', 'User 0')
+
+    assert service.get_user_sid('room', 'user-0') == 'sid-new'
+    assert service.get_user_by_sid('sid-new') == ('room', 'user-0')
+    assert service.get_user_by_sid('sid-0') == (None, None)
+    assert 'sid-0' not in service.get_peer_sids('room')
+    assert service.get_stats() == {'rooms': 1, 'users': Config.MAX_ROOM_USERS}
+
+
+def test_leave_frees_the_slot_and_the_room(service, client):
+    service.join_room('room', 'alice', 'sid-a', 'Alice', media='relay')
+    service.join_room('room', 'bob', 'sid-b', 'Bob')
+
+    service.leave_room('room', 'alice')
+    assert service.get_peer_sids('room') == ['sid-b']
+    assert service.get_user_by_sid('sid-a') == (None, None)
+    assert service.get_room_by_user('alice') is None
+    assert service.get_stats() == {'rooms': 1, 'users': 1}
+
+    # Leaving twice is a no-op
+    service.leave_room('room', 'alice')
+    service.leave_room('room', 'bob')
+    assert service.get_room_users('room') == {}
+    assert not client.exists(service._media_key('room'))
+    assert service.get_stats() == {'rooms': 0, 'users': 0}
+
+
+def test_leave_keeps_a_newer_room(service):
+    service.join_room('first', 'alice', 'sid-a', 'Alice')
+    service.join_room('second', 'alice', 'sid-b', 'Alice')
+
+    service.leave_room('first', 'alice')
+
+    assert service.get_room_by_user('alice') == 'second'
+    assert service.get_user_by_sid('sid-b') == ('second', 'alice')
+
+
+def test_users_of_a_dead_node_are_removed(client):
+    dead = RedisRoomService(client=client)
+    alive = RedisRoomService(client=client)
+    dead.join_room('room', 'alice', 'sid-a', 'Alice')
+    dead.join_room('room', 'bob', 'sid-b', 'Bob')
+    # Bob reconnected through the other node before the first one died
+    alive.join_room('room', 'bob', 'sid-b2', 'Bob')
+
+    client.delete(dead._node_key(dead.node_id))
+    alive.beat()
+
+    assert list(alive.get_room_users('room')) == ['bob']
+    assert alive.get_user_by_sid('sid-a') == (None, None)
+    assert alive.get_stats() == {'rooms': 1, 'users': 1}
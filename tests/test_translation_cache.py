@@ -0,0 +1,99 @@
+"""
+TranslationCache: key normalization, TTL, LRU eviction and the SQLite disk tier.
+
+Run from the repo root:  python -m pytest tests/test_translation_cache.py
+"""
+import pytest
+
+from services.translation_cache import TranslationCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr('services.translation_cache.time.time', lambda: now[0])
+    return now
+
+
+def disk_rows(cache):
+    return cache._db.execute('SELECT text FROM translation_cache ORDER BY stored_at').fetchall()
+
+
+def test_case_and_whitespace_share_an_entry():
+    cache = TranslationCache(db_path=None)
+    cache.set('Hello   World', 'Spanish ', 'Hola mundo')
+
+    assert cache.get(' hello world', 'spanish') == 'Hola mundo'
+    assert cache.get('hello world', 'French') is None
+    assert cache.get_stats()['hits'] == 1
+    assert cache.get_stats()['misses'] == 1
+
+
+def test_empty_translations_are_not_cached():
+    cache = TranslationCache(db_path=None)
+    cache.set('hello', 'Spanish', '')
+    assert cache.get('hello', 'Spanish') is None
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = TranslationCache(ttl=60, db_path=None)
+    cache.set('hello', 'Spanish', 'hola')
+
+    clock[0] += 60
+    assert cache.get('hello', 'Spanish') == 'hola'
+    clock[0] += 1
+    assert cache.get('hello', 'Spanish') is None
+    assert cache.get_stats()['entries'] == 0
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = TranslationCache(max_entries=2, db_path=None)
+    cache.set('one', 'Spanish', 'uno')
+    cache.set('two', 'Spanish', 'dos')
+    cache.get('one', 'Spanish')
+    cache.set('three', 'Spanish', 'tres')
+
+    assert cache.get('two', 'Spanish') is None
+    assert cache.get('one', 'Spanish') == 'uno'
+    assert cache.get('three', 'Spanish') == 'tres'
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_memory_cap_evicts_by_bytes():
+    cache = TranslationCache(max_entries=100, max_bytes=40, db_path=None)
+    cache.set('first', 'es', 'x' * 20)
+    cache.set('second', 'es', 'y' * 20)
+
+    assert cache.get('first', 'es') is None
+    assert cache.get_stats()['bytes'] <= 40
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    TranslationCache(db_path=path).set('hello', 'Spanish', 'hola')
+
+    restarted = TranslationCache(db_path=path)
+    assert restarted.get_stats()['entries'] == 0
+    assert restarted.get('hello', 'Spanish') == 'hola'
+    # Read through into memory
+    assert restarted.get_stats()['entries'] == 1
+
+
+def test_disk_tier_ignores_and_sweeps_expired_rows(tmp_path, clock):
+    path = str(tmp_path / 'cache.db')
+    TranslationCache(ttl=60, db_path=path).set('old', 'Spanish', 'viejo')
+
+    clock[0] += 61
+    assert TranslationCache(ttl=60, db_path=path).get('old', 'Spanish') is None
+    # Opening the cache swept the expired row
+    assert disk_rows(TranslationCache(ttl=60, db_path=path)) == []
+
+
+def test_disk_tier_is_capped_to_the_newest_rows(tmp_path, clock):
+    cache = TranslationCache(db_path=str(tmp_path / 'cache.db'), db_max_rows=3)
+    cache.SWEEP_EVERY = 5
+    for i in range(5):
+        clock[0] += 1
+        cache.set(f"text {i}", 'Spanish', f"texto {i}")
+
+    assert disk_rows(cache) == [('text 2',), ('text 3',), ('text 4',)]
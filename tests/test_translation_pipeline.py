@@ -0,0 +1,138 @@
+"""
+TranslationPipeline: bounded queue, bidirectional and fan-out callbacks, streaming failures.
+
+Run from the repo root:  python -m pytest tests/test_translation_pipeline.py
+"""
+from concurrent.futures import Future
+import threading
+
+import pytest
+
+from services.translation_pipeline import TranslationPipeline
+
+
+class FakeTranslationService:
+    """Translates to '<language>:<text>'; a gate makes chosen languages wait"""
+
+    batcher = None
+
+    def __init__(self):
+        self.gates = {}
+        self.many_calls = []
+
+    def translate(self, text, target_language):
+        gate = self.gates.get(target_language)
+        if gate is not None:
+            gate.wait(5)
+        if target_language == 'Broken':
+            raise RuntimeError('backend down')
+        return f"{target_language}:{text}"
+
+    def translate_many(self, text, target_languages):
+        self.many_calls.append(list(target_languages))
+        return {language: f"{language}:{text}" for language in target_languages}
+
+    def translate_stream(self, text, target_language):
+        yield 'par'
+        yield 'partial'
+        if target_language == 'Broken':
+            raise RuntimeError('stream cut')
+        yield 'partial done'
+
+
+class Collector:
+    """Callback target that records calls and lets the test wait for them"""
+
+    def __init__(self, expected=1):
+        self.calls = []
+        self.expected = expected
+        self._done = threading.Event()
+
+    def __call__(self, *args):
+        self.calls.append(args if len(args) > 1 else args[0])
+        if len(self.calls) >= self.expected:
+            self._done.set()
+
+    def wait(self):
+        assert self._done.wait(5), f"only got {self.calls}"
+        return self.calls
+
+
+@pytest.fixture
+def service():
+    return FakeTranslationService()
+
+
+def test_full_queue_rejects_new_work_right_away(service):
+    gate = service.gates['Slow'] = threading.Event()
+    pipeline = TranslationPipeline(service, max_workers=1, queue_limit=2)
+    try:
+        assert pipeline.submit('a', 'Slow') is not None
+        assert pipeline.submit('b', 'Slow') is not None
+        assert pipeline.submit('c', 'Slow') is None
+
+        on_result = Collector()
+        pipeline.translate_bidirectional('d', 'Spanish', None, on_result)
+        assert on_result.wait() == [(None, None)]
+    finally:
+        gate.set()
+        pipeline.shutdown()
+
+
+def test_slow_reverse_translation_is_sent_as_an_update(service):
+    gate = service.gates['English'] = threading.Event()
+    pipeline = TranslationPipeline(service, max_workers=2, queue_limit=4)
+    try:
+        on_result = Collector(expected=2)
+        pipeline.translate_bidirectional('hola', 'French', 'English', on_result)
+        gate.set()
+        assert on_result.wait() == [('French:hola', None), ('French:hola', 'English:hola')]
+    finally:
+        pipeline.shutdown()
+
+
+def test_worker_failure_reports_none(service):
+    pipeline = TranslationPipeline(service, max_workers=1, queue_limit=2)
+    try:
+        on_result = Collector()
+        pipeline.translate_bidirectional('hello', 'Broken', None, on_result)
+        assert on_result.wait() == [(None, None)]
+    finally:
+        pipeline.shutdown()
+
+
+def test_fan_out_batches_the_rest_and_reuses_speculation(service):
+    pipeline = TranslationPipeline(service, max_workers=2, queue_limit=4)
+    speculated = Future()
+    speculated.set_result('German:early')
+    try:
+        on_result = Collector()
+        pipeline.translate_fan_out('hello', ['German', 'Spanish', 'Spanish', 'French'], on_result,
+                                   reuse={'German': speculated, 'Italian': Future()})
+        assert on_result.wait() == [{'German': 'German:early', 'Spanish': 'Spanish:hello',
+                                     'French': 'French:hello'}]
+        assert service.many_calls == [['Spanish', 'French']]
+    finally:
+        pipeline.shutdown()
+
+
+def test_stream_sends_partials_then_the_final_text(service):
+    pipeline = TranslationPipeline(service, max_workers=1, queue_limit=2)
+    try:
+        partials, on_done = [], Collector()
+        pipeline.translate_stream('hello', 'Spanish', partials.append, on_done)
+        assert on_done.wait() == ['partial done']
+        assert partials == ['par', 'partial', 'partial done']
+    finally:
+        pipeline.shutdown()
+
+
+def test_stream_failing_midway_finishes_with_none(service):
+    pipeline = TranslationPipeline(service, max_workers=1, queue_limit=2)
+    try:
+        partials, on_done = [], Collector()
+        pipeline.translate_stream('hello', 'Broken', partials.append, on_done)
+        assert on_done.wait() == [None]
+        assert partials == ['par', 'partial']
+    finally:
+        pipeline.shutdown()
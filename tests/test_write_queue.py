@@ -0,0 +1,107 @@
+"""
+WriteQueue group commit: batching, per-row errors and failures to open the writer connection.
+
+Run from the repo root:  python -m pytest tests/test_write_queue.py
+"""
+from concurrent.futures import Future
+import sqlite3
+import threading
+
+import pytest
+
+from database.connection import ConnectionPool, WriteQueue
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'writes.db'), size=2)
+    with pool.connection() as conn:
+        conn.execute('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)')
+    yield pool
+    pool.close_all()
+
+
+def names(pool):
+    with pool.connection() as conn:
+        return sorted(row['name'] for row in conn.execute('SELECT name FROM items'))
+
+
+def queue_put(queue, name):
+    """Queue an insert without taking the writer lock, so a test can lead the batch itself"""
+    future = Future()
+    queue._queue.put(('INSERT INTO items (name) VALUES (?)', (name,), future))
+    return future
+
+
+def run_concurrently(queue, rows):
+    """Insert each name from its own thread - returns name -> row id or exception"""
+    results = {}
+
+    def write(name):
+        try:
+            results[name] = queue.execute('INSERT INTO items (name) VALUES (?)', (name,))
+        except Exception as e:
+            results[name] = e
+
+    threads = [threading.Thread(target=write, args=(name,)) for name in rows]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert not any(thread.is_alive() for thread in threads), 'a writer never returned'
+    return results
+
+
+def test_each_caller_gets_its_own_row_id(pool):
+    queue = WriteQueue(pool, max_batch=8)
+    results = run_concurrently(queue, [f"item-{i}" for i in range(20)])
+
+    assert len(set(results.values())) == 20
+    assert names(pool) == sorted(results)
+    assert queue.writes == 20
+    assert queue.batches <= 20
+
+
+def test_a_bad_row_fails_alone(pool):
+    queue = WriteQueue(pool, max_batch=8)
+    queue.execute('INSERT INTO items (name) VALUES (?)', ('taken',))
+
+    # Queued together, so the leader commits them in one batch
+    batch = [queue_put(queue, name) for name in ('a', 'taken', 'b')]
+    queue._lead(queue._drain())
+
+    assert isinstance(batch[0].result(), int)
+    with pytest.raises(sqlite3.IntegrityError):
+        batch[1].result()
+    assert isinstance(batch[2].result(), int)
+    assert names(pool) == ['a', 'b', 'taken']
+
+
+def test_writer_connection_failure_fails_every_waiting_caller(pool, monkeypatch):
+    queue = WriteQueue(pool, max_batch=8)
+    futures = [queue_put(queue, name) for name in ('a', 'b', 'c')]
+
+    def refuse():
+        raise sqlite3.OperationalError('unable to open database file')
+    monkeypatch.setattr(pool, 'open', refuse)
+
+    queue._lead(queue._drain())
+    for future in futures:
+        with pytest.raises(sqlite3.OperationalError):
+            future.result(timeout=0)
+
+    # The writer lock was released and the next leader opens a fresh connection
+    monkeypatch.undo()
+    assert queue.execute('INSERT INTO items (name) VALUES (?)', ('later',))
+    assert names(pool) == ['later']
+
+
+def test_callers_never_hang_when_the_writer_cannot_open(pool, monkeypatch):
+    queue = WriteQueue(pool, max_batch=8)
+
+    def refuse():
+        raise sqlite3.OperationalError('disk gone')
+    monkeypatch.setattr(pool, 'open', refuse)
+
+    results = run_concurrently(queue, [f"item-{i}" for i in range(10)])
+    assert all(isinstance(result, sqlite3.OperationalError) for result in results.values())